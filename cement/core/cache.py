@@ -1,13 +1,202 @@
 """Cement core cache module."""
 
-from ..core import interface, handler
-from ..utils.misc import minimal_logger
+import json
+import zlib
+import pickle
+import marshal
+import time
+import hashlib
+import threading
+from functools import partial, wraps
+from ..core import exc, interface, handler
+from ..utils.misc import minimal_logger, is_true
 
 LOG = minimal_logger(__name__)
 
+# sentinel used to tell a cache miss apart from a cached falsy value
+_MISSING = object()
+
+
+def _json_dumps(value):
+    return json.dumps(value).encode('utf-8')
+
+
+def _json_loads(data):
+    return json.loads(data.decode('utf-8'))
+
+
+def _pickle_dumps(value):
+    return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _msgpack_dumps(value):
+    import msgpack
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _msgpack_loads(data):
+    import msgpack
+    return msgpack.unpackb(data, raw=False)
+
+
+def _lz4_compress(data):
+    import lz4.frame
+    return lz4.frame.compress(data)
+
+
+def _lz4_decompress(data):
+    import lz4.frame
+    return lz4.frame.decompress(data)
+
+
+CODECS = {
+    'pickle': (1, _pickle_dumps, pickle.loads),
+    'json': (2, _json_dumps, _json_loads),
+    'msgpack': (3, _msgpack_dumps, _msgpack_loads),
+    'marshal': (4, marshal.dumps, marshal.loads),
+}
+"""
+Value codecs available to cache handlers, in the form of
+``label: (id, dumps, loads)``.  The ``id`` (1-15) is stored in the header
+of every encoded value.
+"""
+
+COMPRESSORS = {
+    'zlib': (1, zlib.compress, zlib.decompress),
+    'lz4': (2, _lz4_compress, _lz4_decompress),
+}
+"""
+Compression algorithms available to cache handlers, in the form of
+``label: (id, compress, decompress)``.  The ``id`` (1-7) is stored in the
+header of every encoded value.
+"""
+
+# header: magic prefix, format version byte, and a flags byte of
+# 0ccc iiii (c = compressor id, i = codec id).  The prefix starts with a NUL
+# byte so that it never matches text, nor values stored without a codec.
+_HEADER_MAGIC = b'\x00CMT'
+_HEADER_VERSION = 1
+_HEADER_LENGTH = len(_HEADER_MAGIC) + 2
+
+# time.perf_counter() is not available on Python < 3.3
+_timer = getattr(time, 'perf_counter', time.time)
+
+LATENCY_BUCKETS = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000]
+"""Upper bounds (in milliseconds) of the cache latency histogram buckets."""
+
+
+class CacheStats(object):
+
+    """
+    Thread safe counters and per-operation latency histograms collected by
+    a cache handler when ``track_stats`` is enabled.
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = dict(
+            hits=0,
+            misses=0,
+            sets=0,
+            deletes=0,
+            purges=0,
+            bytes_read=0,
+            bytes_written=0,
+        )
+        self.latency = dict()
+
+    def incr(self, counter, amount=1):
+        with self._lock:
+            self.counters[counter] += amount
+
+    def record(self, operation, seconds):
+        """
+        Record the latency of a single cache operation.
+
+        :param operation: The operation name (i.e. ``get``).
+        :param seconds: The duration of the operation (in seconds).
+
+        """
+        ms = seconds * 1000
+        with self._lock:
+            op = self.latency.get(operation)
+            if op is None:
+                op = self.latency[operation] = dict(
+                    count=0,
+                    total=0.0,
+                    min=None,
+                    max=None,
+                    buckets=[0] * (len(LATENCY_BUCKETS) + 1),
+                )
+            op['count'] += 1
+            op['total'] += ms
+            if op['min'] is None or ms < op['min']:
+                op['min'] = ms
+            if op['max'] is None or ms > op['max']:
+                op['max'] = ms
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if ms <= bound:
+                    op['buckets'][i] += 1
+                    break
+            else:
+                op['buckets'][-1] += 1
+
+    def as_dict(self):
+        """
+        Return a snapshot of the collected stats.
+
+        :returns: ``dict``
+
+        """
+        with self._lock:
+            res = dict(self.counters)
+            lookups = res['hits'] + res['misses']
+            if lookups:
+                res['hit_ratio'] = float(res['hits']) / lookups
+            else:
+                res['hit_ratio'] = None
+            res['latency'] = dict()
+            for operation, op in self.latency.items():
+                bounds = LATENCY_BUCKETS + [None]
+                res['latency'][operation] = dict(
+                    count=op['count'],
+                    total_ms=op['total'],
+                    avg_ms=op['total'] / op['count'],
+                    min_ms=op['min'],
+                    max_ms=op['max'],
+                    histogram=list(zip(bounds, op['buckets'])),
+                )
+        return res
+
 
 def cache_validator(klass, obj):
-    """Validates a handler implementation against the ICache interface."""
+    """
+    Validates a handler implementation against the ICache interface (and
+    the IAsyncCache interface for handlers based on
+    ``CementAsyncCacheHandler``).
+    """
+
+    members = [
+        '_setup',
+        'get',
+        'set',
+        'delete',
+        'purge',
+    ]
+    interface.validate(ICache, obj, members)
+    if isinstance(obj, CementAsyncCacheHandler):
+        async_cache_validator(klass, obj)
+
+
+def async_cache_validator(klass, obj):
+    """
+    Validates a handler implementation against the IAsyncCache interface.
+    Async cache handlers are drop-in replacements for synchronous ones, and
+    are therefore registered as (and validated against) ``ICache`` with the
+    additional async members.  Run by ``cache_validator()`` when handlers
+    based on ``CementAsyncCacheHandler`` are registered.
+    """
 
     members = [
         '_setup',
@@ -15,6 +204,10 @@ def cache_validator(klass, obj):
         'set',
         'delete',
         'purge',
+        'aget',
+        'aset',
+        'adelete',
+        'apurge',
     ]
     interface.validate(ICache, obj, members)
 
@@ -110,6 +303,82 @@ class ICache(interface.Interface):
         """
 
 
+class IAsyncCache(ICache):
+
+    """
+    This class defines the Async Cache Handler Interface.  It extends
+    ``ICache`` with awaitable variants of each operation, so that
+    applications running on an ``asyncio`` event loop do not block it while
+    talking to the cache backend.
+
+    Handlers implementing this interface must still set ``Meta.interface``
+    to ``ICache`` (they are registered as, and selected via
+    ``CementApp.Meta.cache_handler`` like, any other cache handler), and are
+    validated against this interface when registered if they are based on
+    ``CementAsyncCacheHandler``.
+
+    Usage:
+
+    .. code-block:: python
+
+        async def do_something(app):
+            await app.cache.aset('my_key', 'my value')
+            value = await app.cache.aget('my_key')
+
+    """
+    # pylint: disable=W0232, C0111, R0903
+    class IMeta:
+
+        """Interface meta-data."""
+
+        label = 'cache'
+        """The label (or type identifier) of the interface."""
+
+        validator = async_cache_validator
+        """Interface validator function."""
+
+    def aget(key, fallback=None):
+        """
+        Awaitable version of ``get()``.
+
+        :param key: The key of the value stored in cache
+        :param fallback: Optional value that is returned if the cache is
+         expired or the key does not exist.  Default: None
+        :returns: An awaitable resolving to the cached value (or
+         ``fallback``).
+
+        """
+
+    def aset(key, value, time=None):
+        """
+        Awaitable version of ``set()``.
+
+        :param key: The key of the value to store in cache.
+        :param value: The value of that key to store in cache.
+        :param time: A one-off expire time.
+        :returns: An awaitable resolving to ``None``.
+
+        """
+
+    def adelete(key):
+        """
+        Awaitable version of ``delete()``.
+
+        :param key: The key in the cache to delete.
+        :returns: An awaitable.
+
+        """
+
+    # pylint: disable=E0211
+    def apurge():
+        """
+        Awaitable version of ``purge()``.
+
+        :returns: An awaitable.
+
+        """
+
+
 class CementCacheHandler(handler.CementBaseHandler):
 
     """
@@ -129,5 +398,622 @@ class CementCacheHandler(handler.CementBaseHandler):
         interface = ICache
         """The interface that this handler class implements."""
 
+        codec = None
+        """
+        The codec used to serialize values before they are sent to the
+        cache backend (one of the labels in ``cache.CODECS``, i.e.
+        ``pickle``, ``json``, ``msgpack``, or ``marshal``).  If ``None``
+        values are passed to the backend library as is.  Overridden by the
+        ``codec`` setting of the handler's config section.
+        """
+
+        compression = None
+        """
+        Compression applied to encoded values larger than
+        ``compress_threshold`` (one of the labels in ``cache.COMPRESSORS``,
+        i.e. ``zlib`` or ``lz4``).  Only used if a ``codec`` is set.
+        Overridden by the ``compression`` setting of the handler's config
+        section.
+        """
+
+        compress_threshold = 1024
+        """
+        Size (in bytes) of an encoded value above which it is compressed.
+        Overridden by the ``compress_threshold`` setting of the handler's
+        config section.
+        """
+
+        memoize_codec = 'pickle'
+        """
+        The codec used to serialize values cached by ``memoize()`` when no
+        ``codec`` is configured, so that they are returned with the same
+        type as they were computed (one of the labels in ``cache.CODECS``).
+        Handlers that keep Python objects as is (i.e. in-process caches) can
+        set this to ``None``.
+        """
+
+        track_stats = False
+        """
+        Whether to track hit/miss counters, bytes transferred, and
+        per-operation latency (see ``stats()``).  Overridden by the
+        ``track_stats`` setting of the handler's config section.
+        """
+
     def __init__(self, *args, **kw):
         super(CementCacheHandler, self).__init__(*args, **kw)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self._codec = None
+        self._memoize_codec = None
+        self._compressor = None
+        self._compress_threshold = None
+        self._stats = None
+
+    def _setup(self, app_obj):
+        super(CementCacheHandler, self)._setup(app_obj)
+
+        codec = self._get_setting('codec')
+        compression = self._get_setting('compression')
+        threshold = self._get_setting('compress_threshold')
+
+        if codec in [None, '', 'None', 'none']:
+            self._codec = None
+        elif codec not in CODECS:
+            raise exc.FrameworkError("Unknown cache codec '%s'." % codec)
+        else:
+            self._codec = CODECS[codec]
+
+        memoize_codec = self._meta.memoize_codec
+        if memoize_codec is None:
+            self._memoize_codec = None
+        elif memoize_codec not in CODECS:
+            raise exc.FrameworkError("Unknown cache codec '%s'." %
+                                     memoize_codec)
+        else:
+            self._memoize_codec = CODECS[memoize_codec]
+
+        if compression in [None, '', 'None', 'none']:
+            self._compressor = None
+        elif compression not in COMPRESSORS:
+            raise exc.FrameworkError("Unknown cache compression '%s'." %
+                                     compression)
+        else:
+            self._compressor = COMPRESSORS[compression]
+        self._compress_threshold = int(threshold)
+
+        if is_true(self._get_setting('track_stats')):
+            self._setup_stats()
+
+    def _config_typed(self, key):
+        """
+        Return a value from the handler's config section, converted
+        according to ``Meta.config_schema`` (and cached until the config
+        changes).  Equivalent to:
+        ``self.app.config.get_typed(<config_section>, <key>)``.  The value
+        is returned as is if the config handler does not support schemas.
+
+        :param key: The key to get a config value for.
+        :returns: The converted value of the given key.
+
+        """
+        if not hasattr(self.app.config, 'get_typed'):
+            return self.app.config.get(self._meta.config_section, key)
+        return self.app.config.get_typed(self._meta.config_section, key)
+
+    def _get_setting(self, key):
+        section = self._meta.config_section
+        if self.app.config.has_section(section) and \
+                key in self.app.config.keys(section):
+            return self.app.config.get(section, key)
+        return getattr(self._meta, key)
+
+    def _setup_stats(self):
+        """
+        Enable stats tracking by wrapping the ``get``, ``set``, ``delete``
+        and ``purge`` methods of this handler instance, so that every
+        implementation is instrumented without needing to know about it.
+
+        """
+        if self._stats is not None:
+            return
+
+        LOG.debug("tracking stats for cache handler '%s'" % self._meta.label)
+        self._stats = CacheStats()
+        stats = self._stats
+        orig_get = self.get
+        orig_set = self.set
+        orig_delete = self.delete
+        orig_purge = self.purge
+
+        def get(key, fallback=None, **kw):
+            start = _timer()
+            res = orig_get(key, _MISSING, **kw)
+            stats.record('get', _timer() - start)
+            if res is _MISSING:
+                stats.incr('misses')
+                return fallback
+            stats.incr('hits')
+            if self._codec is None and isinstance(res, (bytes, str)):
+                stats.incr('bytes_read', len(res))
+            return res
+
+        def set(key, value, *args, **kw):
+            start = _timer()
+            res = orig_set(key, value, *args, **kw)
+            stats.record('set', _timer() - start)
+            stats.incr('sets')
+            if self._codec is None and isinstance(value, (bytes, str)):
+                stats.incr('bytes_written', len(value))
+            return res
+
+        def delete(key, **kw):
+            start = _timer()
+            res = orig_delete(key, **kw)
+            stats.record('delete', _timer() - start)
+            stats.incr('deletes')
+            return res
+
+        def purge(**kw):
+            start = _timer()
+            res = orig_purge(**kw)
+            stats.record('purge', _timer() - start)
+            stats.incr('purges')
+            return res
+
+        self.get = wraps(orig_get)(get)
+        self.set = wraps(orig_set)(set)
+        self.delete = wraps(orig_delete)(delete)
+        self.purge = wraps(orig_purge)(purge)
+
+    def _backend_stats(self):
+        """
+        Return stats reported by the cache backend itself.  Handlers can
+        override this to report server side counters such as ``evictions``.
+
+        :returns: ``dict``
+
+        """
+        return dict()
+
+    def stats(self):
+        """
+        Return the stats collected by this handler, or ``None`` if
+        ``track_stats`` is not enabled.  The result includes ``hits``,
+        ``misses``, ``hit_ratio``, ``sets``, ``deletes``, ``purges``,
+        ``bytes_read``, ``bytes_written``, ``evictions`` (if reported by the
+        backend, otherwise ``None``) and a ``latency`` dictionary with the
+        count, total/avg/min/max (in milliseconds) and a histogram
+        (``[(upper_bound_ms, count), ...]``) for each operation.
+
+        :returns: ``dict`` or ``None``
+
+        Usage:
+
+        .. code-block:: python
+
+            stats = app.cache.stats()
+            print(stats['hit_ratio'])
+
+        """
+        if self._stats is None:
+            return None
+
+        res = self._stats.as_dict()
+        res['evictions'] = None
+        try:
+            res.update(self._backend_stats())
+        except Exception as e:
+            LOG.debug("unable to get backend cache stats: %s" % e)
+        return res
+
+    def _encode(self, value, codec=None):
+        """
+        Serialize (and possibly compress) ``value`` with the configured
+        codec, prefixed with a header identifying how it was encoded.
+        If no codec is configured ``value`` is returned as is.
+
+        :param value: The value to encode.
+        :param codec: A ``(id, dumps, loads)`` tuple from ``CODECS`` to use
+         if no codec is configured.
+        :returns: The encoded value (``bytes``).
+
+        """
+        if self._codec is not None:
+            codec = self._codec
+        elif codec is None:
+            return value
+
+        codec_id, dumps, loads = codec
+        data = dumps(value)
+        compressor_id = 0
+        if self._compressor is not None and \
+                len(data) > self._compress_threshold:
+            compressed = self._compressor[1](data)
+            if len(compressed) < len(data):
+                data = compressed
+                compressor_id = self._compressor[0]
+
+        flags = (compressor_id << 4) | codec_id
+        data = _HEADER_MAGIC + bytes(bytearray([_HEADER_VERSION, flags])) + \
+            data
+        if self._stats is not None and self._codec is not None:
+            # without a codec the bytes are counted by set()
+            self._stats.incr('bytes_written', len(data))
+        return data
+
+    def _is_encoded(self, data):
+        """
+        Return whether ``data`` starts with the header written by
+        ``_encode()``.
+
+        :param data: The (possibly) encoded value.
+        :returns: ``bool``
+
+        """
+        return isinstance(data, bytes) and \
+            len(data) >= _HEADER_LENGTH and \
+            data.startswith(_HEADER_MAGIC) and \
+            bytearray(data[len(_HEADER_MAGIC):_HEADER_LENGTH])[0] == \
+            _HEADER_VERSION
+
+    def _decode(self, data):
+        """
+        Decode a value encoded by ``_encode()``.  The header determines
+        the codec and compression, so values written with a different
+        configuration are still decoded.  Data without
+        a header (i.e. values stored before a codec was configured) is
+        returned as is.
+
+        :param data: The encoded value.
+        :returns: The decoded value.
+        :raises: :class:`cement.core.exc.FrameworkError`
+
+        """
+        if self._stats is not None and self._codec is not None and \
+                isinstance(data, bytes):
+            self._stats.incr('bytes_read', len(data))
+
+        if not self._is_encoded(data):
+            return data
+
+        flags = bytearray(data[_HEADER_LENGTH - 1:_HEADER_LENGTH])[0]
+        codec_id = flags & 0x0F
+        compressor_id = (flags >> 4) & 0x07
+        data = data[_HEADER_LENGTH:]
+
+        if compressor_id:
+            for _id, compress, decompress in COMPRESSORS.values():
+                if _id == compressor_id:
+                    data = decompress(data)
+                    break
+            else:
+                raise exc.FrameworkError(
+                    "Unknown cache compression id '%s'." % compressor_id)
+
+        for _id, dumps, loads in CODECS.values():
+            if _id == codec_id:
+                return loads(data)
+        raise exc.FrameworkError("Unknown cache codec id '%s'." % codec_id)
+
+    def _acquire_lock(self, key, timeout, blocking=True):
+        """
+        Acquire the single-flight lock for ``key``.  The default
+        implementation uses an in-process ``threading.Lock`` per key, which
+        is only kept while it is held or waited on.
+        Handlers backed by a shared server can override this (along with
+        ``_release_lock()``) to provide a distributed lock.
+
+        :param key: The lock key.
+        :param timeout: Time (in seconds) after which the lock should be
+         considered abandoned (ignored by the in-process lock).
+        :param blocking: Whether to wait for the lock to become available.
+        :returns: A lock token if acquired, ``None`` otherwise.
+
+        """
+        # entries are [lock, number of threads holding or waiting on it]
+        with self._locks_lock:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+
+        if entry[0].acquire(blocking):
+            return entry[0]
+
+        self._unref_lock(key)
+        return None
+
+    def _unref_lock(self, key):
+        # drop a reference to the in-process lock of ``key``, and forget the
+        # lock once nothing references it
+        with self._locks_lock:
+            entry = self._locks[key]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._locks[key]
+
+    def _release_lock(self, key, token):
+        """
+        Release the single-flight lock for ``key``.
+
+        :param key: The lock key.
+        :param token: The token returned by ``_acquire_lock()``.
+        :returns: ``None``
+
+        """
+        token.release()
+        self._unref_lock(key)
+
+    def _memoize_key(self, func, key, args, kw):
+        if callable(key):
+            return key(*args, **kw)
+
+        if key is None:
+            key = '%s.%s' % (func.__module__,
+                             getattr(func, '__qualname__', func.__name__))
+
+        sig = repr((args, sorted(kw.items())))
+        return '%s:%s' % (key, hashlib.md5(sig.encode('utf-8')).hexdigest())
+
+    def _memoize_get(self, cache_key):
+        value = self.get(cache_key, _MISSING)
+        if self._codec is None and self._memoize_codec is not None:
+            value = self._decode(value)
+        return value
+
+    def _memoize_store(self, cache_key, value, ttl, stale_ttl):
+        if value is None:
+            return
+
+        if self._codec is None and self._memoize_codec is not None:
+            value = self._encode(value, codec=self._memoize_codec)
+
+        if stale_ttl:
+            self.set(cache_key, value, time=ttl + stale_ttl)
+            self.set('%s:fresh' % cache_key, 1, time=ttl)
+        else:
+            self.set(cache_key, value, time=ttl)
+
+    def _memoize_refresh(self, func, args, kw, cache_key, ttl, stale_ttl,
+                         lock_timeout):
+        lock_key = '%s:lock' % cache_key
+        token = self._acquire_lock(lock_key, lock_timeout, blocking=False)
+        if token is None:
+            # someone else is already refreshing this key
+            return
+
+        def refresh():
+            try:
+                value = func(*args, **kw)
+                self._memoize_store(cache_key, value, ttl, stale_ttl)
+            except Exception as e:
+                LOG.debug("failed to refresh cache key '%s': %s" %
+                          (cache_key, e))
+            finally:
+                self._release_lock(lock_key, token)
+
+        LOG.debug("refreshing stale cache key '%s' in the background" %
+                  cache_key)
+        thread = threading.Thread(target=refresh)
+        thread.daemon = True
+        thread.start()
+
+    def _call_memoized(self, func, args, kw, key_args=None, ttl=None,
+                       key=None, stale_ttl=None, lock_timeout=30):
+        if key_args is None:
+            key_args = args
+        cache_key = self._memoize_key(func, key, key_args, kw)
+
+        value = self._memoize_get(cache_key)
+        if value is not _MISSING:
+            if stale_ttl and \
+                    self.get('%s:fresh' % cache_key, _MISSING) is _MISSING:
+                self._memoize_refresh(func, args, kw, cache_key, ttl,
+                                      stale_ttl, lock_timeout)
+            return value
+
+        lock_key = '%s:lock' % cache_key
+        token = self._acquire_lock(lock_key, lock_timeout)
+        try:
+            if token is not None:
+                # another worker may have filled the cache while we waited
+                value = self._memoize_get(cache_key)
+                if value is not _MISSING:
+                    return value
+
+            LOG.debug("computing value for cache key '%s'" % cache_key)
+            value = func(*args, **kw)
+            self._memoize_store(cache_key, value, ttl, stale_ttl)
+            return value
+        finally:
+            if token is not None:
+                self._release_lock(lock_key, token)
+
+    def memoize(self, ttl=None, key=None, stale_ttl=None, lock_timeout=30):
+        """
+        Decorator that caches the return value of a function in this cache
+        handler.  Concurrent callers that miss on the same key are
+        single-flighted: only one of them computes the value while the others
+        wait for it to land in the cache.
+
+        Note that a return value of ``None`` is indistinguishable from a
+        cache miss, and is therefore never cached.  If the handler has no
+        ``codec`` configured, values are serialized with
+        ``Meta.memoize_codec`` (``pickle`` by default).
+
+        :param ttl: The expiration time (in seconds) of the cached value.
+         Defaults to the handler's configured ``expire_time``.
+        :param key: Either a string prefix for the generated keys (defaults
+         to the dotted path of the function), or a callable that accepts the
+         same arguments as the decorated function and returns the full key.
+        :param stale_ttl: If set, values are kept for an additional
+         ``stale_ttl`` seconds after ``ttl`` expires.  Stale values are
+         returned immediately while a background thread refreshes them.
+         Requires ``ttl``.
+        :param lock_timeout: Time (in seconds) after which a single-flight
+         lock is considered abandoned.
+        :raises: :class:`cement.core.exc.FrameworkError`
+
+        Usage:
+
+        .. code-block:: python
+
+            @app.cache.memoize(ttl=300)
+            def get_user(user_id):
+                return api.fetch_user(user_id)
+
+        """
+        if stale_ttl and ttl is None:
+            raise exc.FrameworkError("Memoize 'stale_ttl' requires 'ttl'.")
+
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kw):
+                return self._call_memoized(func, args, kw, ttl=ttl, key=key,
+                                           stale_ttl=stale_ttl,
+                                           lock_timeout=lock_timeout)
+            return wrapper
+        return decorate
+
+
+def _completed(result):
+    """
+    Return an already completed ``asyncio.Future`` resolving to ``result``.
+    Useful for async methods of handlers whose operations never block.
+    """
+    import asyncio
+    future = asyncio.Future()
+    future.set_result(result)
+    return future
+
+
+class CementAsyncCacheHandler(CementCacheHandler):
+
+    """
+    Base class for cache handlers implementing the
+    :ref:`IAsyncCache <cement.core.cache>` interface.  The default ``aget()``,
+    ``aset()``, ``adelete()`` and ``apurge()`` run the synchronous methods
+    in the event loop's default executor; sub-classes backed by an async
+    client library should override them with native implementations.
+
+    """
+
+    def _run_in_executor(self, func, *args, **kw):
+        import asyncio
+        loop = asyncio.get_event_loop()
+        return loop.run_in_executor(None, partial(func, *args, **kw))
+
+    def aget(self, key, fallback=None, **kw):
+        """
+        Get a value from the cache without blocking the event loop.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: An awaitable resolving to the value of the item in the
+         cache, or the ``fallback`` value.
+
+        """
+        return self._run_in_executor(self.get, key, fallback, **kw)
+
+    def aset(self, key, value, time=None, **kw):
+        """
+        Set a value in the cache without blocking the event loop.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached.
+        :returns: An awaitable.
+
+        """
+        return self._run_in_executor(self.set, key, value, time, **kw)
+
+    def adelete(self, key, **kw):
+        """
+        Delete an item from the cache without blocking the event loop.
+
+        :param key: The key to delete from the cache.
+        :returns: An awaitable.
+
+        """
+        return self._run_in_executor(self.delete, key, **kw)
+
+    def apurge(self, **kw):
+        """
+        Purge the entire cache without blocking the event loop.
+
+        :returns: An awaitable.
+
+        """
+        return self._run_in_executor(self.purge, **kw)
+
+
+def dump_stats(app):
+    """
+    This is a ``pre_close`` hook that logs the stats collected by the
+    application's cache handler when the application is in debug mode.
+
+    :param app: The application object.
+
+    """
+    if app.cache is None or not app.debug:
+        return
+
+    stats = app.cache.stats()
+    if stats is None:
+        return
+
+    log = app.log if app.log is not None else LOG
+    latency = stats.pop('latency')
+    log.debug('cache stats: %s' % ', '.join(
+        ['%s=%s' % (k, stats[k]) for k in sorted(stats.keys())]))
+    for operation in sorted(latency.keys()):
+        op = latency[operation]
+        log.debug('cache latency [%s]: count=%s avg=%.3fms min=%.3fms '
+                  'max=%.3fms' % (operation, op['count'], op['avg_ms'],
+                                  op['min_ms'], op['max_ms']))
+
+
+def memoize(ttl=None, key=None, stale_ttl=None, lock_timeout=30):
+    """
+    Decorator that memoizes a handler or controller method using the
+    application's cache handler (``self.app.cache``), which is resolved at
+    call time.  The ``self`` argument is not used to generate the cache key.
+    If the application has no cache handler, the method is simply called.
+    See ``CementCacheHandler.memoize()`` for the available options.
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.core.cache import memoize
+        from cement.ext.ext_argparse import ArgparseController, expose
+
+        class Base(ArgparseController):
+            class Meta:
+                label = 'base'
+
+            @memoize(ttl=60)
+            def _get_report(self, name):
+                return expensive_report(name)
+
+            @expose()
+            def report(self):
+                print(self._get_report(self.app.pargs.name))
+
+    """
+    if stale_ttl and ttl is None:
+        raise exc.FrameworkError("Memoize 'stale_ttl' requires 'ttl'.")
+
+    def decorate(func):
+        @wraps(func)
+        def wrapper(obj, *args, **kw):
+            cache = obj.app.cache
+            if cache is None:
+                return func(obj, *args, **kw)
+            return cache._call_memoized(func, (obj,) + args, kw,
+                                        key_args=args, ttl=ttl, key=key,
+                                        stale_ttl=stale_ttl,
+                                        lock_timeout=lock_timeout)
+        return wrapper
+    return decorate
@@ -1,12 +1,193 @@
 """Cement core config module."""
 
 import os
-from ..core import interface, handler
-from ..utils.fs import abspath
-from ..utils.misc import minimal_logger
+import marshal
+import hashlib
+import threading
+from ..core import exc, interface, handler
+from ..utils.fs import abspath, HOME_DIR
+from ..utils.misc import minimal_logger, parallel_map
 
 LOG = minimal_logger(__name__)
 
+# bump whenever the layout of parse cache files changes
+PARSE_CACHE_VERSION = 1
+
+# sentinel for schema items without a default
+_NO_DEFAULT = object()
+
+
+def register_file_reader(app, extension, func):
+    """
+    Register a function to read config files ending with ``extension`` for
+    the application ``app``, regardless of which config handler is in use.
+    This allows, for example, precompiled config files to be loaded
+    alongside text config files.  Usually called from an extension's
+    ``load()`` function (readers are stored in
+    ``CementApp.Meta.config_file_readers``, and only affect ``app``).
+
+    :param app: The application object.
+    :param extension: The file extension (i.e. ``.cfgc``).
+    :param func: A function that takes a file path, and returns a dictionary
+     of ``{section: {key: value}}``.
+    :returns: ``None``
+
+    """
+    # copied, so that apps sharing the same Meta are not affected
+    readers = dict(app._meta.config_file_readers or {})
+    readers[extension] = func
+    app._meta.config_file_readers = readers
+    if app.config is not None:
+        app.config.register_file_reader(extension, func)
+
+
+def _to_bool(value):
+    if value in [True, 'True', 'true', 'yes', 'on', 1, '1']:
+        return True
+    elif value in [False, 'False', 'false', 'no', 'off', 0, '0', '']:
+        return False
+    raise ValueError("'%s' is not a boolean" % value)
+
+
+def _to_list(value):
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [item.strip() for item in str(value).split(',') if item.strip()]
+
+
+SCHEMA_CONVERTERS = {
+    bool: _to_bool,
+    list: _to_list,
+}
+"""
+Converters used for schema types that can not simply be called with the
+config value (i.e. ``bool('false')`` is ``True``).  Any other type (or
+callable) in a schema is called with the raw value to convert it.
+"""
+
+
+class ReadOnlyDict(dict):
+
+    """
+    A ``dict`` that can not be modified, returned by the (cached)
+    ``get_section_dict()`` and ``get_dict()`` snapshots so that a caller can
+    not alter the cached copy for everyone else.  Copies (``dict(obj)``,
+    ``copy.copy()``, ``copy.deepcopy()``) are regular, mutable dicts.
+
+    """
+
+    def _read_only(self, *args, **kw):
+        raise TypeError("config snapshots are read-only (use "
+                        "app.config.set() or app.config.merge())")
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def copy(self):
+        return dict(self)
+
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        import copy
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return (dict, (dict(self),))
+
+
+class ConfigSnapshot(object):
+
+    """
+    An immutable, point-in-time view of the entire configuration, as
+    returned by ``CementConfigHandler.snapshot()``.  A snapshot never
+    changes once created (reloading config files publishes a new one), so
+    it can be shared between threads without locking, and gives a
+    consistent view across many reads.
+
+    """
+
+    def __init__(self, generation, data):
+        self.generation = generation
+        self._data = data
+
+    def get(self, section, key):
+        """
+        Return a configuration value based on [section][key].
+
+        :raises: ``KeyError`` if the section or key does not exist.
+
+        """
+        return self._data[section][key]
+
+    def keys(self, section):
+        """Return a list of keys in [section]."""
+        return list(self._data[section].keys())
+
+    def get_sections(self):
+        """Return a list of configuration sections."""
+        return list(self._data.keys())
+
+    def get_section_dict(self, section):
+        """Return a (read-only) dict of configuration parameters for
+        [section]."""
+        return self._data[section]
+
+    def get_dict(self):
+        """Return a (read-only) dict of the entire configuration."""
+        return self._data
+
+    def has_section(self, section):
+        """Return whether or not the section exists."""
+        return section in self._data
+
+
+def compile_schema_item(spec):
+    """
+    Compile a config schema item into a ``(converter, default)`` tuple.
+    The returned converter takes a raw config value, and returns the
+    converted value (raising ``ValueError`` or ``TypeError`` if the value is
+    invalid).  ``None`` values are passed through without conversion.
+
+    :param spec: Either a type/callable (i.e. ``int``, ``bool``, ``list``),
+     or a dictionary with the optional keys ``type``, ``default``, and
+     ``validator`` (a callable that returns ``False`` for invalid values).
+    :returns: ``tuple``
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.core.config import compile_schema_item
+
+        convert, default = compile_schema_item(dict(type=int, default=1))
+        convert('10')
+
+    """
+    if isinstance(spec, dict):
+        type_ = spec.get('type', None)
+        default = spec.get('default', _NO_DEFAULT)
+        validator = spec.get('validator', None)
+    else:
+        type_, default, validator = spec, _NO_DEFAULT, None
+
+    if type_ is None:
+        to_type = None
+    else:
+        to_type = SCHEMA_CONVERTERS.get(type_, type_)
+
+    def convert(value):
+        if value is None:
+            return None
+        if to_type is not None:
+            value = to_type(value)
+        if validator is not None and validator(value) is False:
+            raise ValueError("'%s' failed validation" % value)
+        return value
+
+    return (convert, default)
+
 
 def config_validator(klass, obj):
     """Validates a handler implementation against the IConfig interface."""
@@ -205,8 +386,357 @@ class CementConfigHandler(handler.CementBaseHandler):
         interface = IConfig
         """The interface that this handler implements."""
 
+        parse_cache = False
+        """
+        Whether to cache the parsed contents of each config file, so that
+        unchanged files are not re-parsed on the next start (or reload).
+        Cache entries are keyed by the file path, modification time, size
+        and the handler label, and are only used by handlers that implement
+        ``_read_file()``.
+        """
+
+        parse_cache_dir = None
+        """
+        Directory where parsed config files are cached.  Defaults to
+        ``$XDG_CACHE_HOME/<app_label>/config`` (``$XDG_CACHE_HOME`` being
+        ``~/.cache`` if not set).
+        """
+
+        parse_workers = None
+        """
+        The maximum number of threads used to read files in
+        ``parse_files()``.  Defaults to the number of files (up to 32).
+        """
+
     def __init__(self, *args, **kw):
         super(CementConfigHandler, self).__init__(*args, **kw)
+        self._schema = {}
+        self._typed_cache = {}
+        self._generation = 0
+        self._snapshots = {}
+        self._lock = threading.RLock()
+        self._published = None
+        self._file_readers = {}
+
+    def register_file_reader(self, extension, func):
+        """
+        Register a function to read config files ending with ``extension``
+        (instead of parsing them with this handler).  See
+        ``cement.core.config.register_file_reader()``.
+
+        :param extension: The file extension (i.e. ``.cfgc``).
+        :param func: A function that takes a file path, and returns a
+         dictionary of ``{section: {key: value}}``.
+        :returns: ``None``
+
+        """
+        self._file_readers[extension] = func
+
+    def _get_file_reader(self, file_path):
+        for extension, func in self._file_readers.items():
+            if file_path.endswith(extension):
+                return func
+        return None
+
+    def add_schema(self, schema):
+        """
+        Add (or update) config schema items.  Each item is compiled to a
+        converter once, and used by ``get_typed()`` and
+        ``validate_schema()``.
+
+        :param schema: A dictionary of ``{section: {key: spec}}``.  See
+         ``compile_schema_item()`` for the format of ``spec``.
+        :returns: ``None``
+
+        Usage:
+
+        .. code-block:: python
+
+            app.config.add_schema({
+                'myapp': {
+                    'workers': int,
+                    'hosts': list,
+                    'port': dict(type=int, default=8080,
+                                 validator=lambda v: 0 < v < 65536),
+                },
+            })
+
+        """
+        for section, items in schema.items():
+            compiled = self._schema.setdefault(section, {})
+            for key, spec in items.items():
+                compiled[key] = compile_schema_item(spec)
+                self._typed_cache.pop((section, key), None)
+
+    def get_typed(self, section, key):
+        """
+        Return a configuration value converted according to the config
+        schema (or the raw value if the key has no schema).  Converted values
+        are cached until the key is changed (or removed).
+
+        :param section: The [section] of the configuration.
+        :param key: The configuration key.
+        :returns: The converted value.
+        :raises: cement.core.exc.FrameworkError if the value is invalid.
+
+        """
+        try:
+            return self._typed_cache[(section, key)]
+        except KeyError:
+            pass
+
+        convert, default = self._schema.get(section, {}).get(
+            key, (None, _NO_DEFAULT))
+        if default is not _NO_DEFAULT and not self._has_key(section, key):
+            value = default
+        else:
+            value = self.get(section, key)
+            if convert is not None:
+                try:
+                    value = convert(value)
+                except (ValueError, TypeError) as e:
+                    raise exc.FrameworkError(
+                        "Invalid value for config key '%s' in [%s]: %s" %
+                        (key, section, e))
+
+        self._typed_cache[(section, key)] = value
+        return value
+
+    def validate_schema(self, section=None):
+        """
+        Validate all config values that have a schema (or only those in
+        ``section``), reporting every invalid value at once.  Keys that are
+        not set are not validated.
+
+        :param section: Only validate keys in this [section].
+        :returns: ``None``
+        :raises: cement.core.exc.FrameworkError if any value is invalid.
+
+        """
+        if section is None:
+            sections = list(self._schema.keys())
+        else:
+            sections = [section]
+
+        errors = []
+        for _section in sections:
+            for key in self._schema.get(_section, {}):
+                if not self._has_key(_section, key):
+                    continue
+                try:
+                    self.get_typed(_section, key)
+                except exc.FrameworkError as e:
+                    errors.append(e.msg)
+
+        if errors:
+            raise exc.FrameworkError("Invalid configuration:\n    %s" %
+                                     "\n    ".join(sorted(errors)))
+
+    def _has_key(self, section, key):
+        return self.has_section(section) and \
+            key in self.get_section_dict(section)
+
+    def _config_changed(self, section=None, key=None):
+        """
+        Invalidate cached snapshots and ``get_typed()`` values, either for a
+        single key or (if ``section`` and ``key`` are not passed) all of
+        them.  Handlers must call this from every path that changes config
+        values (i.e. ``set()``, ``merge()``, ``add_section()``, removing keys
+        or sections, parsing, and direct item assignment).
+
+        """
+        self._generation += 1
+        if section is None:
+            self._typed_cache = {}
+        else:
+            self._typed_cache.pop((section, key), None)
+
+    def snapshot(self):
+        """
+        Return an immutable snapshot of the entire configuration.  The
+        current snapshot is returned without locking, and a new one is built
+        (under lock, so never from a half-merged state) only once the config
+        has changed.  Reloading a config file (i.e. via the
+        ``reload_config`` extension) publishes the new snapshot in a single
+        reference swap once the file is fully merged.
+
+        Threads that need a consistent view across many reads should use a
+        snapshot, rather than calling ``get()`` repeatedly:
+
+        .. code-block:: python
+
+            config = app.config.snapshot()
+            host = config.get('myapp', 'host')
+            port = config.get('myapp', 'port')
+
+        :returns: ``ConfigSnapshot``
+
+        """
+        published = self._published
+        if published is not None and \
+                published.generation == self._generation:
+            return published
+
+        with self._lock:
+            return self._publish()
+
+    def _publish(self):
+        # must be called with self._lock held
+        generation = self._generation
+        published = self._published
+        if published is None or published.generation != generation:
+            published = ConfigSnapshot(generation, self.get_dict())
+            self._published = published
+        return published
+
+    def get_section_dict(self, section):
+        """
+        Return a dict of configuration parameters for [section].  The dict
+        is a read-only snapshot that is cached until the config changes.
+
+        :param section: The config [section] to generate a dict from (using
+            that section keys).
+        :returns: A dictionary of the config section.
+        :rtype: ``ReadOnlyDict``
+
+        """
+        generation = self._generation
+        cached = self._snapshots.get(section)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        dict_obj = dict()
+        for key in self.keys(section):
+            dict_obj[key] = self.get(section, key)
+        snapshot = ReadOnlyDict(dict_obj)
+        self._snapshots[section] = (generation, snapshot)
+        return snapshot
+
+    def get_dict(self):
+        """
+        Return a dict of the entire configuration.  The dict (and each
+        section dict) is a read-only snapshot that is cached until the
+        config changes.
+
+        :returns: A dictionary of the entire config.
+        :rtype: ``ReadOnlyDict``
+
+        """
+        # sections are strings, so ``None`` can not collide
+        generation = self._generation
+        cached = self._snapshots.get(None)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+
+        dict_obj = dict()
+        for section in self.get_sections():
+            dict_obj[section] = self.get_section_dict(section)
+        snapshot = ReadOnlyDict(dict_obj)
+        self._snapshots[None] = (generation, snapshot)
+        return snapshot
+
+    def _read_file(self, file_path):
+        """
+        Parse a configuration file at ``file_path`` and return its contents
+        as a dictionary of sections (without merging it into the config).
+        Handlers that implement this support ``Meta.parse_cache``.
+
+        :param file_path: The file system path to the configuration file.
+        :returns: A dictionary of ``{section: {key: value}}``, or ``None`` if
+         the file can not be represented as a dictionary (in which case it
+         is parsed by ``_parse_file()`` instead).
+
+        """
+        return None
+
+    def _reads_files(self):
+        # whether files can be read with _read_file() rather than parsed by
+        # parse_file(), which is only the case if _read_file() is defined by
+        # the same class as _parse_file() (and parse_file() is not
+        # overridden), so that sub-classes customizing parsing still get to
+        # parse every file
+        def owner(name):
+            for klass in type(self).__mro__:
+                if name in vars(klass):
+                    return klass
+
+        return owner('_read_file') is owner('_parse_file') and \
+            owner('parse_file') is CementConfigHandler
+
+    def _get_parse_cache_path(self, file_path):
+        cache_dir = self._meta.parse_cache_dir
+        if cache_dir is None:
+            base = os.environ.get('XDG_CACHE_HOME',
+                                  os.path.join(HOME_DIR, '.cache'))
+            cache_dir = os.path.join(base, self.app._meta.label, 'config')
+        name = '%s:%s' % (self._meta.label, file_path)
+        digest = hashlib.md5(name.encode('utf-8')).hexdigest()
+        return os.path.join(abspath(cache_dir), '%s.cache' % digest)
+
+    def _read_file_cached(self, file_path):
+        """
+        Return the contents of ``file_path`` from the parse cache if the file
+        is unchanged since it was cached, otherwise parse it with
+        ``_read_file()`` and update the cache.
+
+        :param file_path: The file system path to the configuration file.
+        :returns: ``dict`` or ``None`` (see ``_read_file()``)
+
+        """
+        stat = os.stat(file_path)
+        mtime = getattr(stat, 'st_mtime_ns', int(stat.st_mtime * 1e9))
+        key = (file_path, mtime, stat.st_size, self._meta.label)
+        cache_path = self._get_parse_cache_path(file_path)
+
+        try:
+            with open(cache_path, 'rb') as cache_file:
+                version, cached_key, cached_data = marshal.load(cache_file)
+            if version == PARSE_CACHE_VERSION and cached_key == key:
+                LOG.debug("loading config file '%s' from parse cache" %
+                          file_path)
+                return cached_data
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            pass
+
+        data = self._read_file(file_path)
+        if data is not None:
+            self._write_parse_cache(cache_path, key, data)
+        return data
+
+    def _parse_file_cached(self, file_path):
+        """
+        Merge the contents of ``file_path`` via the parse cache (see
+        ``_read_file_cached()``).
+
+        :param file_path: The file system path to the configuration file.
+        :returns: ``boolean``
+
+        """
+        data = self._read_file_cached(file_path)
+        if data is None:
+            return self._parse_file(file_path)
+        self.merge(data)
+        return True
+
+    def _write_parse_cache(self, cache_path, key, data):
+        tmp_path = '%s.%s.tmp' % (cache_path, os.getpid())
+        try:
+            dumped = marshal.dumps((PARSE_CACHE_VERSION, key, data))
+            cache_dir = os.path.dirname(cache_path)
+            if not os.path.isdir(cache_dir):
+                os.makedirs(cache_dir)
+            with open(tmp_path, 'wb') as cache_file:
+                cache_file.write(dumped)
+            if hasattr(os, 'replace'):
+                os.replace(tmp_path, cache_path)
+            else:
+                os.rename(tmp_path, cache_path)  # pragma: nocover
+        except (IOError, OSError, ValueError) as e:
+            # unmarshallable values, read-only cache dir, etc
+            LOG.debug("unable to write config parse cache '%s': %s" %
+                      (cache_path, e))
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def _parse_file(self, file_path):
         """
@@ -240,8 +770,76 @@ class CementConfigHandler(handler.CementBaseHandler):
         if os.path.exists(file_path):
             LOG.debug("config file '%s' exists, loading settings..." %
                       file_path)
-            return self._parse_file(file_path)
+            data = None
+            reader = self._get_file_reader(file_path)
+            if reader is not None:
+                data = reader(file_path)
+            return self._parse_file_locked(file_path, data)
         else:
             LOG.debug("config file '%s' does not exist, skipping..." %
                       file_path)
             return False
+
+    def parse_files(self, file_paths):
+        """
+        Parse multiple configuration files.  The files are read in parallel
+        (by handlers that implement ``_read_file()``), and then merged in the
+        order of ``file_paths``, so the result is exactly the same as calling
+        ``parse_file()`` for each file in turn.  Files that do not exist are
+        skipped.
+
+        :param file_paths: A list of file system paths to configuration
+         files.
+        :returns: ``None``
+
+        """
+        if not self._reads_files():
+            # parse_file() or _parse_file() is overridden by a sub-class
+            for file_path in file_paths:
+                self.parse_file(file_path)
+            return
+
+        file_paths = [abspath(path) for path in file_paths]
+        existing = []
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                existing.append(file_path)
+            else:
+                LOG.debug("config file '%s' does not exist, skipping..." %
+                          file_path)
+
+        def read(file_path):
+            reader = self._get_file_reader(file_path)
+            if reader is not None:
+                return reader(file_path)
+            elif self._meta.parse_cache is True:
+                return self._read_file_cached(file_path)
+            return self._read_file(file_path)
+
+        results = parallel_map(read, existing, self._meta.parse_workers)
+
+        for file_path, data in zip(existing, results):
+            LOG.debug("config file '%s' exists, loading settings..." %
+                      file_path)
+            self._parse_file_locked(file_path, data)
+
+    def _parse_file_locked(self, file_path, data=None):
+        # merge already read ``data``, or parse the file (holding the lock
+        # so that snapshots never see a partially merged file)
+        with self._lock:
+            try:
+                if data is not None:
+                    self.merge(data)
+                    res = True
+                elif self._meta.parse_cache is True and \
+                        self._reads_files():
+                    res = self._parse_file_cached(file_path)
+                else:
+                    res = self._parse_file(file_path)
+            finally:
+                self._config_changed()
+
+            # swap in the new snapshot if anyone is using them
+            if self._published is not None:
+                self._publish()
+            return res
@@ -56,6 +56,30 @@ def controller_validator(klass, obj):
         )
 
 
+def _get_exposed_commands(klass):
+    """
+    Return the command meta-data (``__cement_meta__``) of all functions
+    exposed on a controller class.  The result is computed once per class,
+    and cached on the class itself (so sub-classes get their own).
+
+    :param klass: The (uninstantiated) controller class.
+    :returns: A list of ``__cement_meta__`` dictionaries, which must not be
+     modified.
+
+    """
+    exposed = klass.__dict__.get('__cement_exposed__')
+    if exposed is None:
+        exposed = []
+        for member in dir(klass):
+            if member.startswith('_'):
+                continue
+            meta = getattr(getattr(klass, member), '__cement_meta__', None)
+            if meta is not None:
+                exposed.append(meta)
+        setattr(klass, '__cement_exposed__', exposed)
+    return exposed
+
+
 class IController(interface.Interface):
 
     """
@@ -332,6 +356,7 @@ class CementBaseController(handler.CementBaseHandler):
         self._arguments = []  # used to store collected arguments
         self._dispatch_map = {}  # used to map commands/aliases to controller
         self._dispatch_command = None  # set during _parse_args()
+        self._stacked = None  # shared controllers by stacked_on label
 
     def _setup(self, app_obj):
         """
@@ -345,51 +370,55 @@ class CementBaseController(handler.CementBaseHandler):
 
         self.app = app_obj
 
+    def _get_stacked_controllers(self):
+        # a single (setup) instance of every registered controller is shared
+        # by all controllers for the duration of a dispatch, indexed by the
+        # label of the controller they are stacked on
+        if self._stacked is None:
+            stacked = {}
+            for contr in self.app.handler.list('controller'):
+                if contr == self.__class__:
+                    contr = self
+                else:
+                    contr = contr()
+                    contr._setup(self.app)
+                    contr._stacked = stacked
+                stacked.setdefault(contr._meta.stacked_on, []).append(contr)
+            self._stacked = stacked
+        return self._stacked
+
     def _collect(self):
         LOG.debug("collecting arguments/commands for %s" % self)
-        arguments = []
-        commands = []
 
         # process my arguments and commands first
         arguments = list(self._meta.arguments)
-
-        for member in dir(self.__class__):
-            if member.startswith('_'):
-                continue
-            try:
-                func = getattr(self.__class__, member).__cement_meta__
-            except AttributeError:
-                continue
-            else:
-                func['controller'] = self
-                commands.append(func)
+        commands = []
+        for func in _get_exposed_commands(self.__class__):
+            func = func.copy()
+            func['controller'] = self
+            commands.append(func)
 
         # process stacked controllers second for commands and args
-        for contr in self.app.handler.list('controller'):
+        for contr in self._get_stacked_controllers().get(self._meta.label, []):
             # don't include self here
-            if contr == self.__class__:
+            if contr is self:
                 continue
 
-            contr = contr()
-            contr._setup(self.app)
-            if contr._meta.stacked_on == self._meta.label:
-                if contr._meta.stacked_type == 'embedded':
-                    contr_arguments, contr_commands = contr._collect()
-                    for arg in contr_arguments:
-                        arguments.append(arg)
-                    for func in contr_commands:
-                        commands.append(func)
-                elif contr._meta.stacked_type == 'nested':
-                    metadict = {}
-                    metadict['label'] = re.sub('_', '-', contr._meta.label)
-                    metadict['func_name'] = '_dispatch'
-                    metadict['exposed'] = True
-                    metadict['hide'] = contr._meta.hide
-                    metadict['help'] = contr._meta.description
-                    metadict['aliases'] = contr._meta.aliases
-                    metadict['aliases_only'] = contr._meta.aliases_only
-                    metadict['controller'] = contr
-                    commands.append(metadict)
+            if contr._meta.stacked_type == 'embedded':
+                contr_arguments, contr_commands = contr._collect()
+                arguments.extend(contr_arguments)
+                commands.extend(contr_commands)
+            elif contr._meta.stacked_type == 'nested':
+                metadict = {}
+                metadict['label'] = re.sub('_', '-', contr._meta.label)
+                metadict['func_name'] = '_dispatch'
+                metadict['exposed'] = True
+                metadict['hide'] = contr._meta.hide
+                metadict['help'] = contr._meta.description
+                metadict['aliases'] = contr._meta.aliases
+                metadict['aliases_only'] = contr._meta.aliases_only
+                metadict['controller'] = contr
+                commands.append(metadict)
 
         return (arguments, commands)
 
@@ -460,6 +489,10 @@ class CementBaseController(handler.CementBaseHandler):
             if self._meta.epilog is not None:
                 self.app.args.epilog = self._meta.epilog
 
+        # controllers are only shared within a single dispatch
+        if self.app.controller is self:
+            self._stacked = None
+
         self._arguments, self._commands = self._collect()
         self._process_commands()
         self._get_dispatch_command()
@@ -474,7 +507,9 @@ class CementBaseController(handler.CementBaseHandler):
                 self._parse_args()
                 func = getattr(self._dispatch_command['controller'],
                                self._dispatch_command['func_name'])
-                return func()
+                if self.app._profile is not None:
+                    return self.app._run_profiled(func)
+                return self.app._run_controller_function(func)
         else:
             self._process_arguments()
             self._parse_args()
@@ -494,27 +529,28 @@ class CementBaseController(handler.CementBaseHandler):
     def _help_text(self):
         """Returns the help text displayed when '--help' is passed."""
 
-        cmd_txt = ''
+        parts = []
         for label in self._visible_commands:
             cmd = self._dispatch_map[label]
-            if len(cmd['aliases']) > 0 and cmd['aliases_only']:
-                if len(cmd['aliases']) > 1:
-                    first = cmd['aliases'].pop(0)
-                    cmd_txt = cmd_txt + "  %s (aliases: %s)\n" % \
-                        (first, ', '.join(cmd['aliases']))
+            aliases = cmd['aliases']
+            if len(aliases) > 0 and cmd['aliases_only']:
+                if len(aliases) > 1:
+                    parts.append("  %s (aliases: %s)\n" %
+                                 (aliases[0], ', '.join(aliases[1:])))
                 else:
-                    cmd_txt = cmd_txt + "  %s\n" % cmd['aliases'][0]
-            elif len(cmd['aliases']) > 0:
-                cmd_txt = cmd_txt + "  %s (aliases: %s)\n" % \
-                    (label, ', '.join(cmd['aliases']))
+                    parts.append("  %s\n" % aliases[0])
+            elif len(aliases) > 0:
+                parts.append("  %s (aliases: %s)\n" %
+                             (label, ', '.join(aliases)))
             else:
-                cmd_txt = cmd_txt + "  %s\n" % label
+                parts.append("  %s\n" % label)
 
             if cmd['help']:
-                cmd_txt = cmd_txt + "    %s\n\n" % cmd['help']
+                parts.append("    %s\n\n" % cmd['help'])
             else:
-                cmd_txt = cmd_txt + "\n"
+                parts.append("\n")
 
+        cmd_txt = ''.join(parts)
         if len(cmd_txt) > 0:
             txt = '''%s
 
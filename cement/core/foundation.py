@@ -2,15 +2,25 @@
 
 import os
 import sys
+import copy
+import json
+import shlex
 import signal
+import inspect
 import platform
 from time import sleep
+from argparse import _SubParsersAction
 from ..core import backend, exc, log, config, plugin
 from ..core import output, extension, arg, controller, meta, cache, mail
 from ..core.handler import HandlerManager
 from ..core.hook import HookManager
 from ..utils.misc import is_true, minimal_logger
-from ..utils import fs
+from ..utils import fs, profile
+
+try:
+    from StringIO import StringIO   # pragma: nocover
+except ImportError:                 # pragma: nocover
+    from io import StringIO         # pragma: nocover
 
 # The `imp` module is deprecated in favor of `importlib` in 3.4, but it
 # wasn't introduced until 3.1.  Finally, reload is a builtin on Python < 3
@@ -22,6 +32,10 @@ elif pyver[0] >= 3:                                # pragma: nocover  # noqa
 else:                                              # pragma: nocover  # noqa
     reload_module = reload                         # pragma: nocover  # noqa
 
+if pyver[0] < 3:
+    STRING_TYPES = (str, unicode)   # pragma: nocover  # noqa
+else:
+    STRING_TYPES = (str,)           # pragma: nocover
 
 LOG = minimal_logger(__name__)
 if platform.system() == 'Windows':
@@ -123,6 +137,49 @@ def cement_signal_handler(signum, frame):
     raise exc.CaughtSignal(signum, frame)
 
 
+def cancel_loop_tasks(app):
+    """
+    This is a ``pre_close`` hook that cancels the outstanding tasks of the
+    application's event loop (``app.loop``, if it was created), waits for
+    them to finish, and closes the loop.
+
+    :param app: The application object.
+
+    """
+    if app._loop is None:
+        return
+
+    import asyncio
+    loop = app._loop
+    if hasattr(asyncio, 'all_tasks'):
+        tasks = asyncio.all_tasks(loop)
+    else:                                               # pragma: nocover
+        tasks = asyncio.Task.all_tasks(loop)            # pragma: nocover
+
+    tasks = [task for task in tasks if not task.done()]
+    if tasks:
+        LOG.debug('cancelling %s outstanding event loop tasks' % len(tasks))
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks,
+                                               return_exceptions=True))
+
+    if hasattr(loop, 'shutdown_asyncgens'):
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+    asyncio.set_event_loop(None)
+    app._loop = None
+
+
+# the application that batch commands are run against in process pool
+# workers (see CementApp.run_batch())
+_BATCH_APP = None
+
+
+def _run_batch_worker(argv):
+    return _BATCH_APP._run_batch_command(argv)
+
+
 class CementApp(meta.MetaMixin):
 
     """
@@ -261,6 +318,27 @@ class CementApp(meta.MetaMixin):
         ``CementApp.Meta.config_extension``.
         """
 
+        config_env_prefix = None
+        """
+        A prefix for environment variables that override configuration
+        settings, in the form of ``<PREFIX>_<SECTION>__<KEY>`` (note the
+        double underscore).  For example, with a prefix of ``MYAPP``:
+
+        .. code-block:: console
+
+            $ export MYAPP_MYAPP__DEBUG=true
+            $ export MYAPP_CACHE_REDIS__HOST=redis.example.com
+
+        Dots and dashes in section names are written as underscores, and
+        values are converted according to the config schema (see
+        ``CementApp.Meta.config_schema``), or else to the type of the key in
+        the application's or handler's ``config_defaults`` (``bool``,
+        ``int``, ``float``, or ``list``) where possible.  Environment
+        variables override settings from config files, and are in turn
+        overridden by command line arguments (see
+        ``CementApp.Meta.arguments_override_config``).  Disabled if ``None``.
+        """
+
         plugins = []
         """
         A list of plugins to load.  This is generally considered bad
@@ -365,6 +443,57 @@ class CementApp(meta.MetaMixin):
         ``list(sys.argv[1:])`` if no argv is set in Meta during setup().
         """
 
+        batch_option = False
+        """
+        Whether or not to add a ``--batch FILE`` command line option, which
+        runs each command listed in ``FILE`` (or ``-`` for STDIN) with a
+        single application setup.  See ``CementApp.run_batch()``.
+        """
+
+        batch_workers = None
+        """
+        The number of worker processes that ``CementApp.run_batch()`` runs
+        commands in.  If ``None`` (default), commands are run one after the
+        other in the current process.
+        """
+
+        profile = None
+        """
+        The label of a profiler to run every dispatched controller function
+        under (i.e. ``cprofile``, or ``sampling``).  The stats are written
+        to ``CementApp.Meta.profile_file``, and a summary is logged or
+        rendered (see ``CementApp.Meta.profile_summary``).  Additional
+        profilers can be provided by ``profile`` hooks, which are passed the
+        application object and the profiler label, and return a
+        ``cement.utils.profile.Profiler`` object (or ``None``).
+        """
+
+        profile_option = False
+        """
+        Whether or not to add a ``--profile[=PROFILER]`` command line option,
+        which overrides ``CementApp.Meta.profile`` (``--profile`` alone
+        profiles with ``cprofile``).
+        """
+
+        profile_file = None
+        """
+        The file path to write profiler stats to.  If ``None`` (default),
+        stats are written to ``<app_label>-<profiler>.prof`` in the current
+        working directory.
+        """
+
+        profile_limit = 20
+        """
+        The number of functions listed in the profiler summary.
+        """
+
+        profile_summary = 'log'
+        """
+        How to report the profiler summary.  Either ``log`` (logged at the
+        ``info`` level), ``render`` (rendered via ``app.render()`` as
+        ``dict(profile=<rows>, profile_file=<path>)``), or ``None``.
+        """
+
         arguments_override_config = False
         """
         A boolean to toggle whether command line arguments should
@@ -439,6 +568,36 @@ class CementApp(meta.MetaMixin):
         config_defaults = None
         """Default configuration dictionary.  Must be of type 'dict'."""
 
+        config_file_readers = None
+        """
+        A dictionary of ``{extension: function}`` used to read config files
+        ending with ``extension`` regardless of the config handler (i.e.
+        compiled config files).  Each function takes a file path and returns
+        a dictionary of ``{section: {key: value}}``.  Extensions add readers
+        via ``cement.core.config.register_file_reader()``.
+        """
+
+        config_schema = None
+        """
+        A dictionary of ``{section: {key: spec}}`` describing the type (and
+        optional default and validator) of configuration keys.  The entire
+        schema is validated by ``validate_config()``, and converted values
+        can be read via ``app.config.get_typed(section, key)``.
+
+        .. code-block:: python
+
+            class MyApp(CementApp):
+                class Meta:
+                    label = 'myapp'
+                    config_schema = {
+                        'myapp': {
+                            'workers': int,
+                            'verbose': dict(type=bool, default=False),
+                        },
+                    }
+
+        """
+
         meta_defaults = {}
         """
         Default metadata dictionary used to pass high level options from the
@@ -756,6 +915,10 @@ class CementApp(meta.MetaMixin):
         self.__saved_stdout__ = None
         self.__saved_stderr__ = None
         self.__retry_hooks__ = []
+        self.__batch_args__ = None
+        self.__batch_stdout__ = None
+        self._profile = None
+        self._loop = None
         self.handler = None
         self.hook = None
 
@@ -896,6 +1059,13 @@ class CementApp(meta.MetaMixin):
         """
         return_val = None
 
+        # run all commands in a batch file if --batch was passed (but not
+        # from within a batch)
+        if self._meta.batch_option is True and self.__batch_args__ is None:
+            source = self._get_batch_source()
+            if source is not None:
+                return self.run_batch(source)
+
         LOG.debug('running pre_run hook')
         for res in self.hook.run('pre_run', self):
             pass
@@ -912,6 +1082,259 @@ class CementApp(meta.MetaMixin):
 
         return return_val
 
+    def run_batch(self, source, out=None, workers=None):
+        """
+        Run many commands with a single application setup.  Each command is
+        parsed and dispatched just like ``self.run()`` (including the
+        ``pre_run`` and ``post_run`` hooks), with the parsed arguments,
+        ``argv``, ``exit_code`` and last rendered output reset before each
+        command.  The result of each command is written to ``out`` as a
+        line of JSON as soon as it completes (commands' own console output is
+        captured, so that ``out`` only has results), for example:
+
+        .. code-block:: text
+
+            {"argv": ["cmd1", "--foo=bar"], "exit_code": 0, "result": null,
+             "output": null, "error": null}
+
+        Where ``result`` is the return value of the controller function,
+        ``output`` is the last rendered output text (or else the text printed
+        to STDOUT, if any), and ``error`` is the
+        error message if the command raised an exception.  Once all commands
+        have run, ``self.exit_code`` is set to the highest exit code of all
+        commands.
+
+        :param source: A file path, ``-`` for STDIN, a file like object, or
+          a list of commands.  Each line (or list item) is one command,
+          either a JSON list of arguments (``["cmd1", "--foo=bar"]``), a
+          JSON object with an ``argv`` key, a shell style command line
+          (``cmd1 --foo=bar``), or a list of arguments.  Blank lines and
+          lines starting with ``#`` are ignored.
+        :param out: A file like object to write the results to.
+          Default: ``sys.stdout``
+        :param workers: The number of worker processes to run commands in.
+          Results are still written in the order that commands are listed.
+          Default: ``CementApp.Meta.batch_workers``
+        :returns: A list of result dictionaries, one per command.
+
+        """
+        global _BATCH_APP
+
+        if out is None:
+            out = sys.stdout
+        if workers is None:
+            workers = self._meta.batch_workers
+
+        # every command is parsed with a fresh copy of the argument handler
+        # as it was at the end of setup
+        saved_argv = self._meta.argv
+        self.__batch_args__ = self.args
+        self.__batch_stdout__ = sys.stdout
+
+        pool = None
+        results = []
+        commands = self._get_batch_commands(source)
+        try:
+            if workers is not None and workers > 1:
+                _BATCH_APP = self
+                pool = self._get_batch_pool(workers)
+
+            if pool is None:
+                records = (self._run_batch_command(argv) for argv in commands)
+            else:
+                records = pool.imap(_run_batch_worker, commands)
+
+            for record in records:
+                out.write('%s\n' % json.dumps(record, default=str))
+                out.flush()
+                results.append(record)
+        finally:
+            commands.close()
+            if pool is not None:
+                pool.close()
+                pool.join()
+            _BATCH_APP = None
+            self.args = self.__batch_args__
+            self.__batch_args__ = None
+            self.__batch_stdout__ = None
+            self._meta.argv = saved_argv
+
+        self.exit_code = max([r['exit_code'] for r in results] + [0])
+        return results
+
+    def _get_batch_source(self):
+        # the value of --batch if passed, as parsed by the application level
+        # arguments (before any controller adds its own, so sub-commands and
+        # their options are left alone).  --help is left to the controllers.
+        if '-h' in self.argv or '--help' in self.argv:
+            return None
+        pargs, unknown = self.args.parse_known_args(self.argv)
+        return getattr(pargs, 'batch', None)
+
+    def _get_batch_commands(self, source):
+        # generate the argv of each command listed in the batch source
+        if source == '-':
+            lines = sys.stdin
+        elif isinstance(source, STRING_TYPES) or \
+                not hasattr(source, '__iter__'):
+            source = fs.abspath(source)
+            if not os.path.exists(source):
+                raise exc.FrameworkError("Batch file '%s' does not exist." %
+                                         source)
+            with open(source, 'r') as batch_file:
+                for argv in self._get_batch_commands(batch_file):
+                    yield argv
+            return
+        else:
+            lines = source
+
+        for line in lines:
+            if isinstance(line, (list, tuple)):
+                yield [str(item) for item in line]
+                continue
+
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            elif line[0] in '[{':
+                try:
+                    argv = json.loads(line)
+                except ValueError as e:
+                    raise exc.FrameworkError("Invalid batch command %s: %s" %
+                                             (line, e))
+                if isinstance(argv, dict):
+                    argv = argv.get('argv', [])
+                yield [str(item) for item in argv]
+            else:
+                yield shlex.split(line)
+
+    def _get_batch_pool(self, workers):
+        # process pool workers are forked so that they inherit the
+        # application as it was setup (nothing is pickled but the commands
+        # and their results)
+        import multiprocessing
+        try:
+            context = multiprocessing.get_context('fork')
+        except AttributeError:                          # pragma: nocover
+            context = multiprocessing                   # pragma: nocover
+        except ValueError:                              # pragma: nocover
+            LOG.warning('unable to fork batch workers on this platform, ' +
+                        'running commands sequentially')  # pragma: nocover
+            return None                                 # pragma: nocover
+        return context.Pool(workers)
+
+    def _run_batch_command(self, argv):
+        # run a single batch command, and return its result
+        LOG.debug('running batch command %s' % argv)
+        self._meta.argv = list(argv)
+        self._parsed_args = None
+        self._last_rendered = None
+        self.exit_code = 0
+        self.args = copy.deepcopy(self.__batch_args__, {id(self): self})
+
+        record = dict(argv=list(argv), exit_code=0, result=None,
+                      output=None, error=None)
+
+        # console output of the command is captured (see render()), so that
+        # it is not mixed in with the results
+        sys.stdout = captured = StringIO()
+        try:
+            record['result'] = self.run()
+        except SystemExit as e:
+            # argparse exits on errors and --help
+            if e.code is None:
+                self.exit_code = 0
+            elif isinstance(e.code, int):
+                self.exit_code = e.code
+            else:
+                record['error'] = str(e.code)
+                self.exit_code = 1
+        except exc.CaughtSignal:
+            raise
+        except Exception as e:
+            LOG.debug('batch command %s failed: %s' % (argv, e))
+            record['error'] = str(e)
+            if self.exit_code == 0:
+                self.exit_code = 1
+        finally:
+            sys.stdout = self.__batch_stdout__
+
+        record['exit_code'] = self.exit_code
+        if self._last_rendered is not None:
+            record['output'] = self._last_rendered[1]
+        elif captured.getvalue():
+            record['output'] = captured.getvalue()
+
+        # results must be json (and pickle) friendly
+        record['result'] = json.loads(json.dumps(record['result'],
+                                                 default=str))
+        return record
+
+    def _get_profiler(self, label):
+        # profile hooks take precedence over the builtin profilers
+        profiler = None
+        for res in self.hook.run('profile', self, label):
+            if res is not None:
+                profiler = res
+
+        if profiler is None:
+            if label not in profile.PROFILERS:
+                raise exc.FrameworkError("Unknown profiler '%s'." % label)
+            profiler = profile.PROFILERS[label]()
+        return profiler
+
+    def _run_profiled(self, func):
+        """
+        Call a controller function under the profiler set by
+        ``CementApp.Meta.profile`` (or ``--profile``), then write the stats
+        and report a summary.  Only called by controllers when profiling is
+        enabled.
+
+        :param func: The controller function to call.
+        :returns: The return value of ``func``.
+
+        """
+        label = self._profile
+        profiler = self._get_profiler(label)
+
+        profiler.start()
+        try:
+            return self._run_controller_function(func)
+        finally:
+            profiler.stop()
+            # never mask the exception (if any) of the controller function
+            try:
+                self._report_profile(profiler, func.__name__, label)
+            except Exception as e:
+                self.log.warning("unable to report profiler stats: %s" % e)
+
+    def _report_profile(self, profiler, func_name, label):
+        # write the stats of a profiled controller function, and report a
+        # summary (see CementApp.Meta.profile_summary)
+        file_path = self._meta.profile_file
+        if file_path is None:
+            file_path = '%s-%s.prof' % (self._meta.label, label)
+        file_path = fs.abspath(file_path)
+        profiler.write(file_path)
+
+        rows = profiler.summary(self._meta.profile_limit)
+        if self._meta.profile_summary == 'render':
+            self.render(dict(profile=rows, profile_file=file_path))
+        elif self._meta.profile_summary == 'log':
+            self.log.info("profiled %s() with %s (stats written to %s)" %
+                          (func_name, label, file_path))
+            self.log.info('%12s %12s %10s  %s' %
+                          ('cumulative', 'total', 'calls', 'function'))
+            for row in rows:
+                calls = row['calls']
+                if calls is None:
+                    calls = '-'
+                self.log.info('%12.6f %12.6f %10s  %s' %
+                              (row['cumulative_time'],
+                               row['total_time'],
+                               calls,
+                               row['function']))
+
     def run_forever(self, interval=1, tb=True):
         """
         This function wraps ``run()`` with an endless while loop.  If any
@@ -1026,6 +1449,11 @@ class CementApp(meta.MetaMixin):
             else:
                 out_text = str(res)
 
+        if self.__batch_stdout__ is not None and \
+                out in (self.__batch_stdout__, sys.__stdout__):
+            # batch commands' console output is captured
+            out = sys.stdout
+
         if out is not None and not hasattr(out, 'write'):
             raise TypeError("Argument 'out' must be a 'file' like object")
         elif out is not None and out_text is None:
@@ -1067,6 +1495,87 @@ class CementApp(meta.MetaMixin):
         """
         return self._last_rendered
 
+    @property
+    def loop(self):
+        """
+        The ``asyncio`` event loop of the application, created (and set as
+        the current event loop) on first access.  Controller functions that
+        are coroutines (``async def``) are run on this loop, and outstanding
+        tasks are cancelled and the loop closed by ``app.close()``.
+        Requires Python 3.5+.
+        """
+        if self._loop is None:
+            import asyncio
+            LOG.debug('creating %s event loop' % self._meta.label)
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+        return self._loop
+
+    def _run_until_complete(self, awaitable):
+        """
+        Run an awaitable (i.e. a coroutine) to completion on ``self.loop``.
+        While it runs, the signals in ``CementApp.Meta.catch_signals`` are
+        handled by the event loop: the ``signal`` hook is run, the task is
+        cancelled, and ``CaughtSignal`` is raised (as in synchronous code).
+
+        :param awaitable: The awaitable to run.
+        :returns: The result of the awaitable.
+        :raises: cement.core.exc.CaughtSignal
+
+        """
+        import asyncio
+        loop = self.loop
+        task = asyncio.ensure_future(awaitable, loop=loop)
+        caught = []
+
+        def handle_signal(signum):
+            LOG.debug('Caught signal %s' % signum)
+            for res in self.hook.run('signal', self, signum, None):
+                pass  # pragma: nocover
+            caught.append(exc.CaughtSignal(signum, None))
+            task.cancel()
+
+        signums = []
+        for signum in self._meta.catch_signals or []:
+            try:
+                loop.add_signal_handler(signum, handle_signal, signum)
+            except (ValueError, RuntimeError, NotImplementedError):
+                # not the main thread, or not supported (Windows)
+                LOG.debug('unable to handle signal %s on the event loop' %
+                          signum)       # pragma: nocover
+                continue                # pragma: nocover
+            signums.append(signum)
+
+        try:
+            result = loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            if not caught:
+                raise
+        finally:
+            # removing a loop signal handler resets it to the default, so
+            # the framework signal handler is put back
+            for signum in signums:
+                loop.remove_signal_handler(signum)
+                signal.signal(signum, self._meta.signal_handler)
+
+        if caught:
+            raise caught[0]
+        return result
+
+    def _run_controller_function(self, func):
+        """
+        Call a dispatched controller function, and run it to completion on
+        ``self.loop`` if it is a coroutine function (``async def``).
+
+        :param func: The controller function to call.
+        :returns: The return value of ``func``.
+
+        """
+        res = func()
+        if hasattr(inspect, 'isawaitable') and inspect.isawaitable(res):
+            res = self._run_until_complete(res)
+        return res
+
     @property
     def pargs(self):
         """
@@ -1126,6 +1635,7 @@ class CementApp(meta.MetaMixin):
         self.hook.define('signal')
         self.hook.define('pre_render')
         self.hook.define('post_render')
+        self.hook.define('profile')
 
         # define application hooks from meta
         for label in self._meta.define_hooks:
@@ -1136,6 +1646,8 @@ class CementApp(meta.MetaMixin):
                            weight=-99)
         self.hook.register('post_argument_parsing',
                            handler_override, weight=-99)
+        self.hook.register('pre_close', cache.dump_stats, weight=-99)
+        self.hook.register('pre_close', cancel_loop_tasks, weight=99)
 
         # register application hooks from meta.  the hooks listed in
         # CementApp.Meta.hooks are registered here, so obviously can not be
@@ -1174,11 +1686,44 @@ class CementApp(meta.MetaMixin):
         for handler_class in self._meta.handlers:
             self.handler.register(handler_class)
 
+    def _rewrite_profile_option(self, argv):
+        # --profile only takes a value as --profile=PROFILER, otherwise it
+        # would swallow the sub-command.  only the application's own option
+        # is rewritten (before the first sub-command, or ``--``), as
+        # sub-commands may have a --profile option of their own
+        commands = []
+        for action in getattr(self.args, '_actions', []):
+            if isinstance(action, _SubParsersAction):
+                commands.extend(action.choices.keys())
+
+        argv = list(argv)
+        for i, item in enumerate(argv):
+            if item == '--' or item in commands:
+                break
+            elif item == '--profile':
+                argv[i] = '--profile=cprofile'
+        return argv
+
     def _parse_args(self):
         for res in self.hook.run('pre_argument_parsing', self):
             pass
 
-        self._parsed_args = self.args.parse(self.argv)
+        argv = self.argv
+        if self._meta.profile_option is True:
+            argv = self._rewrite_profile_option(argv)
+
+        self._parsed_args = self.args.parse(argv)
+
+        self._profile = self._meta.profile
+        if getattr(self._parsed_args, 'profile', None) is not None:
+            self._profile = self._parsed_args.profile
+
+        # map of config key -> sections having that key, built once rather
+        # than walking every section for every argument
+        key_index = None
+        if self._meta.arguments_override_config is True or \
+                self._meta.override_arguments:
+            key_index = self._get_config_key_index()
 
         if self._meta.arguments_override_config is True:
             for member in dir(self._parsed_args):
@@ -1190,20 +1735,108 @@ class CementApp(meta.MetaMixin):
                 elif getattr(self._parsed_args, member) is None:
                     continue
 
-                for section in self.config.get_sections():
-                    if member in self.config.keys(section):
-                        self.config.set(section, member,
-                                        getattr(self._parsed_args, member))
-
-        for member in self._meta.override_arguments:
-            for section in self.config.get_sections():
-                if member in self.config.keys(section):
+                for section in key_index.get(member, []):
                     self.config.set(section, member,
                                     getattr(self._parsed_args, member))
 
+        for member in self._meta.override_arguments:
+            for section in key_index.get(member, []):
+                self.config.set(section, member,
+                                getattr(self._parsed_args, member))
+
         for res in self.hook.run('post_argument_parsing', self):
             pass
 
+    def _merge_config_env(self, section=None, defaults=None):
+        """
+        Merge settings from environment variables starting with
+        ``CementApp.Meta.config_env_prefix`` into the config (in a single
+        ``merge()``).  Values are converted according to the config schema,
+        or else to the type of the key in the config defaults.
+
+        :param section: Only merge the settings of this [section] (i.e. once
+         a handler has merged its config defaults and schema).
+        :param defaults: Additional config defaults of ``section`` (i.e. the
+         handler's ``Meta.config_defaults``).
+        :returns: ``None``
+
+        """
+        if not self._meta.config_env_prefix:
+            return
+
+        prefix = '%s_' % self._meta.config_env_prefix.upper()
+        if section is None:
+            sections = self.config.get_sections()
+        else:
+            sections = [section]
+
+        env_sections = dict()
+        for _section in sections:
+            env_section = _section.upper().replace('.', '_').replace('-', '_')
+            env_sections[env_section] = _section
+
+        overlay = dict()
+        for name, value in os.environ.items():
+            if not name.startswith(prefix) or '__' not in name:
+                continue
+            env_section, key = name[len(prefix):].split('__', 1)
+            if not env_section or not key:
+                continue
+
+            _section = env_sections.get(env_section.upper(), None)
+            if _section is None:
+                if section is not None:
+                    continue
+                _section = env_section.lower()
+            key = key.lower()
+            overlay.setdefault(_section, dict())[key] = \
+                self._convert_config_env(_section, key, value, defaults)
+
+        if overlay:
+            LOG.debug('merging config from environment: %s' %
+                      ', '.join(sorted(overlay.keys())))
+            self.config.merge(overlay)
+
+    def _convert_config_env(self, section, key, value, defaults=None):
+        # convert with the schema (invalid values are kept as is, and
+        # reported by validate_schema()) ...
+        schema = getattr(self.config, '_schema', {}).get(section, {})
+        if key in schema:
+            convert = schema[key][0]
+            try:
+                return convert(value)
+            except (ValueError, TypeError):
+                return value
+
+        # ... or else to the type of the default (if not a string)
+        default = None
+        if defaults is not None:
+            default = defaults.get(key, None)
+        if default is None and self._meta.config_defaults is not None:
+            default = self._meta.config_defaults.get(section, {}).get(key)
+
+        type_ = type(default)
+        if type_ not in [bool, int, float, list]:
+            return value
+        try:
+            return config.SCHEMA_CONVERTERS.get(type_, type_)(value)
+        except ValueError:
+            return value
+
+    def _get_config_key_index(self):
+        """
+        Return a dictionary mapping each config key to the list of sections
+        (in config order) that have it.
+
+        :returns: ``dict``
+
+        """
+        key_index = {}
+        for section in self.config.get_sections():
+            for key in self.config.keys(section):
+                key_index.setdefault(key, []).append(section)
+        return key_index
+
     def catch_signal(self, signum):
         """
         Add ``signum`` to the list of signals to catch and handle by Cement.
@@ -1252,6 +1885,10 @@ class CementApp(meta.MetaMixin):
         LOG.debug("setting up %s.config handler" % self._meta.label)
         self.config = self._resolve_handler('config',
                                             self._meta.config_handler)
+        if self._meta.config_file_readers is not None:
+            for ext, func in self._meta.config_file_readers.items():
+                self.config.register_file_reader(ext, func)
+
         if self._meta.config_section is None:
             self._meta.config_section = self._meta.label
         self.config.add_section(self._meta.config_section)
@@ -1259,6 +1896,13 @@ class CementApp(meta.MetaMixin):
         if self._meta.config_defaults is not None:
             self.config.merge(self._meta.config_defaults)
 
+        if self._meta.config_schema is not None:
+            if hasattr(self.config, 'add_schema'):
+                self.config.add_schema(self._meta.config_schema)
+            else:
+                LOG.debug("config handler '%s' does not support schemas, " %
+                          self.config._meta.label + "ignoring config_schema")
+
         ext = self._meta.config_extension
         label = self._meta.label
 
@@ -1275,15 +1919,19 @@ class CementApp(meta.MetaMixin):
                 os.path.join(fs.HOME_DIR, '.%s' % label, 'conf.d'),
             ]
 
+        # config dir files (in file name order) are parsed before config
+        # files, so that config files take precedence
+        config_files = []
         for _dir in self._meta.config_dirs:
-            if not os.path.isdir(_dir):
-                continue
-            for f in os.listdir(_dir):
-                if f.endswith(ext):
-                    self.config.parse_file(os.path.join(_dir, f))
-
-        for _file in self._meta.config_files:
-            self.config.parse_file(_file)
+            config_files.extend(fs.list_files(_dir, ext))
+        config_files.extend(self._meta.config_files)
+        if hasattr(self.config, 'parse_files'):
+            self.config.parse_files(config_files)
+        else:
+            # handlers implementing only the IConfig interface
+            for _file in config_files:
+                self.config.parse_file(_file)
+        self._merge_config_env()
 
         self.validate_config()
 
@@ -1426,6 +2074,16 @@ class CementApp(meta.MetaMixin):
         self.args.add_argument('--quiet', dest='suppress_output',
                                action='store_true',
                                help='suppress all output')
+        if self._meta.batch_option is True:
+            self.args.add_argument('--batch', dest='batch', metavar='FILE',
+                                   action='store',
+                                   help='run the commands listed in FILE ' +
+                                        '(or - for STDIN), one per line')
+        if self._meta.profile_option is True:
+            self.args.add_argument('--profile', dest='profile', nargs='?',
+                                   const='cprofile', metavar='PROFILER',
+                                   help='profile the command (cprofile, ' +
+                                        'or sampling)')
 
         # merge handler override meta data
         if self._meta.handler_override_options is not None:
@@ -1480,8 +2138,13 @@ class CementApp(meta.MetaMixin):
                     if not os.path.exists(logdir):
                         os.makedirs(logdir)
 
+        The default implementation validates all config values against
+        ``CementApp.Meta.config_schema`` in a single pass (if the config
+        handler supports schemas).
+
         """
-        pass
+        if hasattr(self.config, 'validate_schema'):
+            self.config.validate_schema()
 
     def add_template_dir(self, path):
         """
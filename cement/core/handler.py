@@ -347,6 +347,15 @@ class CementBaseHandler(meta.MetaMixin):
         override any existing defaults under that section.
         """
 
+        config_schema = None
+        """
+        A dictionary of ``{key: spec}`` describing the type (and optional
+        default and validator) of keys in the ``[<config_section>]`` block.
+        Values are validated when the handler is setup, and can be read
+        already converted via ``app.config.get_typed()``.  See
+        :ref:`cement.core.config <cement.core.config>`.
+        """
+
         overridable = False
         """
         Whether or not handler can be overridden by
@@ -382,6 +391,25 @@ class CementBaseHandler(meta.MetaMixin):
             dict_obj[self._meta.config_section] = self._meta.config_defaults
             self.app.config.merge(dict_obj, override=False)
 
+        # config handlers that only implement the IConfig interface do not
+        # support schemas
+        schema = self._meta.config_schema
+        if not hasattr(self.app.config, 'add_schema'):
+            schema = None
+
+        if schema is not None:
+            section = self._meta.config_section
+            self.app.config.add_schema({section: schema})
+
+        if self._meta.config_defaults is not None or schema is not None:
+            # environment variables were merged before the handler's
+            # defaults and schema were known to convert them
+            self.app._merge_config_env(self._meta.config_section,
+                                       self._meta.config_defaults)
+
+        if schema is not None:
+            self.app.config.validate_schema(self._meta.config_section)
+
 
 def get(handler_type, handler_label, *args):
     """
@@ -20,6 +20,17 @@ Configuration
 -------------
 
 This extension does not honor any application configuration settings.
+It does honor the following ``CementApp.Meta`` settings:
+
+ * **argcomplete_index** - The file system path of a completion index (a
+   precomputed listing of all commands and options).  When set, completions
+   are served from the index without setting up the application (no config
+   files, plugins, handlers, or controllers are loaded).  The index is
+   (re)generated whenever completion runs without a valid index, and is
+   invalidated when any of the source files of the application's
+   controllers, config files, or plugin directories change.  It can also
+   be generated at install time with :func:`generate_completion_index`.
+   Default: ``None`` (disabled).
 
 
 Usage
@@ -86,9 +97,244 @@ on how to properly integrate it's usage into your application deployment.
 This extension simply enables Argcomplete to do it's thing on application
 startup.
 
+
+Completion Index
+----------------
+
+For large applications, setting up the application on every ``[tab]`` can be
+noticeably slow.  Setting ``argcomplete_index`` builds a light-weight parser
+from a cached index instead:
+
+.. code-block:: python
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['argcomplete']
+            handlers = [BaseController]
+            argcomplete_index = '~/.myapp/completion.json'
+
+The index can be generated ahead of time (i.e. by a post-install step):
+
+.. code-block:: python
+
+    from cement.ext.ext_argcomplete import generate_completion_index
+
+    with MyApp() as app:
+        generate_completion_index(app)
+
 """
 
+import os
+import sys
+import json
 import argcomplete
+from argparse import ArgumentParser, SUPPRESS
+from argparse import _HelpAction, _SubParsersAction
+from ..utils import fs
+from ..utils.misc import minimal_logger
+
+LOG = minimal_logger(__name__)
+
+INDEX_VERSION = 1
+
+
+def _stat(path):
+    # [mtime, size] of a path, or None if it does not exist
+    try:
+        res = os.stat(path)
+    except OSError:
+        return None
+    return [res.st_mtime, res.st_size]
+
+
+def _get_index_sources(app):
+    # files that the completion index depends on
+    paths = []
+
+    modules = [app.__class__.__module__]
+    for contr in app.handler.list('controller'):
+        modules.append(contr.__module__)
+    for name in modules:
+        path = getattr(sys.modules.get(name), '__file__', None)
+        if path is not None:
+            paths.append(path)
+
+    if sys.argv and os.path.isfile(sys.argv[0]):
+        paths.append(sys.argv[0])
+
+    for key in ['config_files', 'config_dirs', 'plugin_config_dirs',
+                'plugin_dirs']:
+        paths.extend(getattr(app._meta, key, None) or [])
+
+    sources = {}
+    for path in paths:
+        path = fs.abspath(path)
+        sources[path] = _stat(path)
+    return sources
+
+
+def _get_parser_index(parser):
+    # recursively index the options, positional arguments, and sub-commands
+    # of a parser (skipping hidden ones)
+    node = dict(options=[], positionals=[], commands=[])
+
+    for action in parser._actions:
+        if isinstance(action, _HelpAction) or action.help == SUPPRESS:
+            continue
+        elif isinstance(action, _SubParsersAction):
+            helps = dict([(a.dest, a.help) for a in action._choices_actions])
+            names = {}
+            for name, sub_parser in action.choices.items():
+                if id(sub_parser) in names:
+                    names[id(sub_parser)]['aliases'].append(name)
+                    continue
+                names[id(sub_parser)] = dict(
+                    name=name,
+                    aliases=[],
+                    help=helps.get(name),
+                    node=_get_parser_index(sub_parser),
+                )
+                node['commands'].append(names[id(sub_parser)])
+            continue
+
+        item = dict(nargs=action.nargs, help=action.help, choices=None)
+        if action.choices is not None:
+            item['choices'] = [str(c) for c in action.choices]
+        if action.option_strings:
+            item['option_strings'] = list(action.option_strings)
+            node['options'].append(item)
+        else:
+            item['dest'] = action.dest
+            node['positionals'].append(item)
+
+    return node
+
+
+def _build_parser(node, parser):
+    # recursively build a parser from a completion index node
+    for item in node['options']:
+        kwargs = dict(help=item['help'])
+        if item['nargs'] == 0:
+            kwargs['action'] = 'store_const'
+            kwargs['const'] = None
+        else:
+            kwargs['nargs'] = item['nargs']
+            kwargs['choices'] = item['choices']
+        parser.add_argument(*item['option_strings'], **kwargs)
+
+    for item in node['positionals']:
+        parser.add_argument(item['dest'], nargs=item['nargs'],
+                            help=item['help'], choices=item['choices'])
+
+    if node['commands']:
+        sub_parsers = parser.add_subparsers(dest='command')
+        for command in node['commands']:
+            kwargs = dict(help=command['help'])
+            if sys.version_info[0] >= 3:
+                kwargs['aliases'] = command['aliases']
+            _build_parser(command['node'],
+                          sub_parsers.add_parser(command['name'], **kwargs))
+
+    return parser
+
+
+def generate_completion_index(app, path=None):
+    """
+    Generate a completion index for the application, and write it to
+    ``path``.  The application must be setup (but not necessarily run).
+
+    :param app: The application object.
+    :param path: The file system path to write the index to.  Defaults to
+     ``CementApp.Meta.argcomplete_index``.
+    :returns: The completion index.
+    :rtype: ``dict``
+
+    """
+    if path is None:
+        path = getattr(app._meta, 'argcomplete_index', None)
+
+    # build the parser tree if it hasn't been already
+    contr = app.controller
+    if contr is not None and hasattr(contr, '_build_parsers') and \
+            not contr._controllers:
+        contr._setup_controllers()
+        contr._build_parsers()
+
+    index = dict(
+        version=INDEX_VERSION,
+        prog=app.args.prog,
+        sources=_get_index_sources(app),
+        parser=_get_parser_index(app.args),
+    )
+
+    if path is not None:
+        path = fs.abspath(path)
+        LOG.debug("writing completion index to '%s'" % path)
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        tmp_path = '%s.%s.tmp' % (path, os.getpid())
+        with open(tmp_path, 'w') as index_file:
+            json.dump(index, index_file)
+        if hasattr(os, 'replace'):
+            os.replace(tmp_path, path)
+        else:  # pragma: nocover
+            os.rename(tmp_path, path)
+
+    return index
+
+
+def load_completion_index(path):
+    """
+    Load a completion index, if it exists and is not stale (i.e. none of the
+    files it was generated from have changed).
+
+    :param path: The file system path of the index.
+    :returns: The completion index, or ``None``.
+    :rtype: ``dict``
+
+    """
+    try:
+        with open(fs.abspath(path), 'r') as index_file:
+            index = json.load(index_file)
+    except (IOError, OSError, ValueError):
+        LOG.debug("completion index '%s' does not exist or is invalid" %
+                  path)
+        return None
+
+    if index.get('version') != INDEX_VERSION:
+        return None
+    for source, stat in index['sources'].items():
+        if _stat(source) != stat:
+            LOG.debug("completion index is stale ('%s' changed)" % source)
+            return None
+    return index
+
+
+def complete_from_index(app, **kw):
+    """
+    Perform completion from the application's completion index (see
+    ``CementApp.Meta.argcomplete_index``), without setting up the
+    application.  If completion is performed, the process exits.  Does
+    nothing if there is no valid index.  Additional keyword arguments are
+    passed to ``argcomplete.autocomplete()``.
+
+    :param app: The application object.
+    :returns: ``None``
+
+    """
+    path = getattr(app._meta, 'argcomplete_index', None)
+    if path is None:
+        return
+
+    index = load_completion_index(path)
+    if index is None:
+        return
+
+    LOG.debug("completing from index '%s'" % path)
+    parser = _build_parser(index['parser'],
+                           ArgumentParser(prog=index['prog']))
+    argcomplete.autocomplete(parser, **kw)
 
 
 def argparse_autocompletion(app):
@@ -101,9 +347,21 @@ def argparse_autocompletion(app):
         if hasattr(app.controller, '_controller_option'):
             exclude.append(app.controller._controller_option)
 
+    # refresh the completion index, now that the parser tree is built
+    if '_ARGCOMPLETE' in os.environ and \
+            getattr(app._meta, 'argcomplete_index', None) is not None:
+        try:
+            generate_completion_index(app)
+        except (IOError, OSError) as e:
+            LOG.debug("unable to write completion index: %s" % e)
+
     argcomplete.autocomplete(app.args, exclude=exclude)
 
 
 def load(app):
+    # fast path: complete from the index before anything else is setup
+    if '_ARGCOMPLETE' in os.environ:
+        complete_from_index(app)
+
     app.hook.register('pre_argument_parsing',
                       argparse_autocompletion, weight=99)
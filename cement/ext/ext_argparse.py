@@ -163,19 +163,92 @@ The above looks like:
     $ python myapp.py nested-controller command3
     Inside NestedController.command3
 
+
+Lazy Loading
+------------
+
+Large applications can avoid building (and importing) controllers that are
+not used by the command being run.  Setting ``lazy_parsers = True`` in the
+base controller's ``Meta`` builds only the controllers on the path given on
+the command line, and controllers can be registered as *stubs* that are
+imported only when they are built:
+
+.. code-block:: python
+
+    from cement.ext.ext_argparse import controller_stub
+
+    class BaseController(ArgparseController):
+        class Meta:
+            label = 'base'
+            lazy_parsers = True
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            handlers = [
+                BaseController,
+                controller_stub('reports', 'myapp.controllers.reports:Reports',
+                                stacked_type='nested',
+                                help='generate reports'),
+            ]
+
+Above, ``myapp.controllers.reports`` is only imported when running
+``myapp reports ...``.
+
+``--help`` output can also be cached on disk (see
+``ArgparseController.Meta.help_cache_dir``), in which case cached help is
+printed without building (or importing) any controllers' parsers.
+
+
+Async Commands
+--------------
+
+Commands can be coroutine functions (Python 3.5+), which are run to
+completion on the application's event loop (``app.loop``):
+
+.. code-block:: python
+
+    import asyncio
+
+    class BaseController(ArgparseController):
+        class Meta:
+            label = 'base'
+
+        @expose(help='fetch all the things')
+        async def fetch(self):
+            results = await asyncio.gather(fetch_one(), fetch_two())
+            return results
+
+Signals caught by the application raise ``CaughtSignal`` as usual (the
+running command is cancelled), and outstanding tasks are cancelled when the
+application is closed.
+
 """
 
+import os
 import re
 import sys
+import json
+import hashlib
 from argparse import ArgumentParser, RawDescriptionHelpFormatter, SUPPRESS
+from argparse import _HelpAction, _SubParsersAction
 from ..core.handler import CementBaseHandler
 from ..core.arg import CementArgumentHandler, IArgument
-from ..core.controller import IController
+from ..core.controller import IController, _get_exposed_commands
 from ..core.exc import FrameworkError
 from ..utils.misc import minimal_logger
+from ..utils import fs
+
+try:
+    from StringIO import StringIO   # pragma: nocover
+except ImportError:                 # pragma: nocover
+    from io import StringIO         # pragma: nocover
 
 LOG = minimal_logger(__name__)
 
+# memory addresses in the repr of objects (i.e. '<Foo object at 0x7f...>')
+_ADDRESS_RE = re.compile(r' at 0x[0-9a-fA-F]+')
+
 
 def _clean_label(label):
     return re.sub('_', '-', label)
@@ -458,6 +531,33 @@ class ArgparseController(CementBaseHandler):
         #: exception ``error: too few arguments``.
         default_func = 'default'
 
+        #: Whether to only build the parsers, arguments, and commands needed
+        #: for the command line being parsed (i.e. ``app.argv``), rather
+        #: than the entire controller tree.  The argv is pre-scanned to find
+        #: the controller/command path, and sibling controllers are only
+        #: listed (not built), which is also all that ``--help`` needs.  The
+        #: full tree is still built when argcomplete is active
+        #: (``_ARGCOMPLETE`` is set), or when the argv can not be resolved
+        #: unambiguously (i.e. unknown options, positional arguments).
+        #: Controllers registered via ``controller_stub()`` are only imported
+        #: when they are built.  Note that ``_pre_argument_parsing()`` and
+        #: ``_post_argument_parsing()`` are only called on controllers that
+        #: were built.  Only honored on the ``base`` controller.
+        lazy_parsers = False
+
+        #: A directory to cache ``--help`` output in.  Help output is cached
+        #: per command line, keyed by a hash of the metadata of all
+        #: controllers, their commands and arguments (and the source files
+        #: they are defined in), so that it is regenerated (and the stale
+        #: help removed) whenever the controller tree changes.  When cached,
+        #: help is printed without building any parsers.  Only static parser
+        #: trees are cached: help is not cached if any
+        #: ``pre_argument_parsing`` hooks are registered, or any controller
+        #: overrides ``_pre_argument_parsing()`` (controllers registered via
+        #: ``controller_stub()`` are not imported to check).  Only honored
+        #: on the ``base`` controller.
+        help_cache_dir = None
+
     def __init__(self, *args, **kw):
         super(ArgparseController, self).__init__(*args, **kw)
         self.app = None
@@ -468,6 +568,7 @@ class ArgparseController(CementBaseHandler):
             self._sub_parsers = dict()
             self._controllers = []
             self._controllers_map = {}
+            self._built_controllers = []
 
         if self._meta.help is None:
             self._meta.help = '%s controller' % _clean_label(self._meta.label)
@@ -480,14 +581,9 @@ class ArgparseController(CementBaseHandler):
         self.app = app
 
     def _setup_controllers(self):
-        # need a list to maintain order
-        resolved_controllers = []
-
-        # need a dict to do key/label based lookup
-        resolved_controllers_map = {}
-
-        # list to maintain which controllers we haven't resolved yet
-        unresolved_controllers = []
+        # index of stacked_on label -> controllers stacked on it, in the
+        # order they were registered
+        children = {}
         for contr in self.app.handler.list('controller'):
             # don't include self/base
             if contr == self.__class__:
@@ -495,77 +591,46 @@ class ArgparseController(CementBaseHandler):
 
             contr = contr()
             contr._setup(self.app)
-            unresolved_controllers.append(contr)
+            children.setdefault(contr._meta.stacked_on, []).append(contr)
 
-        # treat self/base separately
-        resolved_controllers.append(self)
-        resolved_controllers_map['base'] = self
+        # controllers must be resolved in the order that they are
+        # nested/embedded (parents before children), otherwise argparse does
+        # weird things.  resolved_controllers doubles as the queue for a
+        # breadth first walk down from base.
+        LOG.debug('resolving controller nesting/embedding order')
 
-        # all this crazy shit is to resolve controllers in the order that they
-        # are nested/embedded, otherwise argparse does weird things
+        resolved_controllers = [self]
+        resolved_controllers_map = {'base': self}
 
-        LOG.debug('resolving controller nesting/embedding order')
+        i = 0
+        while i < len(resolved_controllers):
+            parent = resolved_controllers[i]
+            i += 1
 
-        current_parent = self._meta.label
-        while unresolved_controllers:
-            LOG.debug('unresolved controllers > %s' % unresolved_controllers)
-            LOG.debug('current parent > %s' % current_parent)
-
-            # handle all controllers nested on parent
-            current_children = []
-            resolved_child_controllers = []
-            for contr in list(unresolved_controllers):
-                # if stacked_on is the current parent, we want to process
-                # its children in this run first
-                if contr._meta.stacked_on == current_parent:
-                    current_children.append(contr)
-                    if contr._meta.stacked_type == 'embedded':
-                        resolved_child_controllers.append(contr)
-                    else:
-                        resolved_child_controllers.insert(0, contr)
-                    unresolved_controllers.remove(contr)
-                    LOG.debug('resolved controller %s %s on %s' %
-                              (contr, contr._meta.stacked_type,
-                               current_parent))
-
-                # if not, fall back on whether the stacked_on parent is
-                # already resolved
-                elif contr._meta.stacked_on in resolved_controllers_map.keys():
-                    resolved_controllers.append(contr)
-                    resolved_controllers_map[contr._meta.label] = contr
-                    unresolved_controllers.remove(contr)
-                    LOG.debug('resolved controller %s %s on %s' %
-                              (contr, contr._meta.stacked_type,
-                               contr._meta.stacked_on))
-
-            resolved_controllers.extend(resolved_child_controllers)
-            for contr in resolved_child_controllers:
-                resolved_controllers_map[contr._meta.label] = contr
+            # nested controllers are resolved in reverse registration order,
+            # followed by embedded controllers in registration order
+            current_children = children.pop(parent._meta.label, [])
+            nested = [c for c in current_children
+                      if c._meta.stacked_type != 'embedded']
+            embedded = [c for c in current_children
+                        if c._meta.stacked_type == 'embedded']
 
-            # then, for all those controllers... handler all controllers
-            # nested on them
-            resolved_child_controllers = []
-            for child_contr in current_children:
-                for contr in list(unresolved_controllers):
-                    if contr._meta.stacked_on == child_contr._meta.label:
-                        if contr._meta.stacked_type == 'embedded':
-                            resolved_child_controllers.append(contr)
-                        else:
-                            resolved_child_controllers.insert(0, contr)
-
-                        unresolved_controllers.remove(contr)
-                        LOG.debug('resolved controller %s %s on %s' %
-                                  (contr, contr._meta.stacked_type,
-                                   child_contr._meta.label))
-
-            resolved_controllers.extend(resolved_child_controllers)
-            for contr in resolved_child_controllers:
+            for contr in nested[::-1] + embedded:
+                resolved_controllers.append(contr)
                 resolved_controllers_map[contr._meta.label] = contr
-
-            # re-iterate with the next in line as the parent (handles multiple
-            # level nesting)
-            if unresolved_controllers:
-                current_parent = unresolved_controllers[0]._meta.label
+                LOG.debug('resolved controller %s %s on %s' %
+                          (contr, contr._meta.stacked_type,
+                           parent._meta.label))
+
+        if children:
+            unresolved = []
+            for stacked_on in sorted(children.keys()):
+                for contr in children[stacked_on]:
+                    unresolved.append("%s (stacked on '%s')" %
+                                      (contr._meta.label, stacked_on))
+            raise FrameworkError("Unable to resolve controllers stacked " +
+                                 "on unknown controllers: %s" %
+                                 ', '.join(unresolved))
 
         self._controllers = resolved_controllers
         self._controllers_map = resolved_controllers_map
@@ -628,7 +693,7 @@ class ArgparseController(CementBaseHandler):
 
         return kwargs
 
-    def _setup_parsers(self):
+    def _setup_parsers(self, controllers=None):
         # this should only be run by the base controller
         from cement.utils.misc import rando
 
@@ -639,8 +704,11 @@ class ArgparseController(CementBaseHandler):
         # parents are sub-parser namespaces (that we can add subparsers to)
         # where-as parsers are the actual root parser and sub-parsers to
         # add arguments to
+        # parsers from a previous dispatch are stale (i.e. batch commands)
         parents = self._sub_parser_parents
         parsers = self._sub_parsers
+        parents.clear()
+        parsers.clear()
         parsers['base'] = self.app.args
         # parsers['base'] = ArgumentParser()
         # sub1 = parsers['base'].add_subparsers(title='sub-commands')
@@ -672,43 +740,334 @@ class ArgparseController(CementBaseHandler):
         # note that the order of self._controllers was already organized by
         # stacking/embedding order in self._setup_controllers ... order is
         # important here otherwise argparse does wierd things
+        if controllers is None:
+            controllers = self._controllers
+        for contr in controllers:
+            self._setup_controller_parser(contr)
+
+    def _setup_controller_parser(self, contr):
+        parents = self._sub_parser_parents
+        parsers = self._sub_parsers
+        label = contr._meta.label
+        stacked_on = contr._meta.stacked_on
+        stacked_type = contr._meta.stacked_type
+
+        if stacked_type == 'nested':
+            # if the controller is nested, we need to create a new parser
+            # parent using the one that it is stacked on, as well as as a
+            # new parser
+            kwargs = self._get_parser_options(contr)
+            parsers[label] = parents[stacked_on].add_parser(
+                _clean_label(label),
+                **kwargs
+            )
+
+            contr._parser = parsers[label]
+
+            # we need to add subparsers to this parser so we can
+            # attach commands and other nested controllers to it
+            kwargs = self._get_subparser_options(contr)
+            parents[label] = parsers[label].add_subparsers(**kwargs)
+
+            # add an invisible controller option so we can figure out what
+            # to call later in self._dispatch
+            parsers[label].add_argument(self._controller_option,
+                                        action='store',
+                                        default=contr._meta.label,
+                                        help=SUPPRESS,
+                                        dest='__controller_namespace__',
+                                        )
+            parsers[label].formatter_class = contr._meta.argument_formatter
+
+        elif stacked_type == 'embedded':
+            # if it's embedded, then just set it to use the same as the
+            # controller its stacked on
+            parents[label] = parents[stacked_on]
+            parsers[label] = parsers[stacked_on]
+
+    def _build_parsers(self):
+        # this should only be run by the base controller.  builds the
+        # parsers, arguments, and commands of the entire controller tree, and
+        # returns the list of controllers
+        self._setup_parsers()
+        for contr in list(self._controllers):
+            contr = self._resolve_stub(contr)
+            self._process_arguments(contr)
+            self._process_commands(contr)
+        return self._controllers
+
+    def _build_controllers(self, controllers, built):
+        # this should only be run by the base controller.  sets up the
+        # parsers, arguments, and commands of the given controllers that are
+        # not already built (appending them to ``built``), and returns
+        # ``built``
+        built_labels = set([contr._meta.label for contr in built])
+        for contr in controllers:
+            if contr._meta.label not in self._sub_parsers:
+                self._setup_controller_parser(contr)
+        for contr in controllers:
+            if contr._meta.label in built_labels:
+                continue
+            contr = self._resolve_stub(contr)
+            self._process_arguments(contr)
+            self._process_commands(contr)
+            built.append(contr)
+            built_labels.add(contr._meta.label)
+        return built
+
+    def _setup_parsers_lazy(self):
+        # this should only be run by the base controller.  walks the argv
+        # down the controller tree, building only the controllers on the
+        # path (and listing the nested controllers stacked on them).  falls
+        # back on building everything if the argv can't be resolved.
+        # returns the list of controllers that were built.
+        order = {}
+        children = {}
+        for i, contr in enumerate(self._controllers):
+            order[contr._meta.label] = i
+            if contr is not self:
+                children.setdefault(contr._meta.stacked_on, []).append(contr)
+
+        built = []
+
+        def build(controllers):
+            self._build_controllers(controllers, built)
+
+        def build_all():
+            LOG.debug('unable to resolve controller path from argv, ' +
+                      'building all controllers')
+            build(self._controllers)
+            return self._controllers
+
+        self._setup_parsers(controllers=[])
+        args = list(self.app.argv)
+        current = self
+
+        while True:
+            # the current controller, and everything embedded in it
+            scope = [current]
+            nested = []
+            for contr in scope:
+                for child in children.get(contr._meta.label, []):
+                    if child._meta.stacked_type == 'embedded':
+                        scope.append(child)
+                    else:
+                        nested.append(child)
+            scope.sort(key=lambda c: order[c._meta.label])
+            nested.sort(key=lambda c: order[c._meta.label])
+
+            # nested controllers get a parser (so that they are listed), but
+            # their arguments and commands are not built
+            for contr in nested:
+                self._setup_controller_parser(contr)
+            build(scope)
+
+            LOG.debug("lazily built controller namespace '%s'" %
+                      current._meta.label)
+
+            label = current._meta.label
+            parser = self._get_parser(label)
+            sub_parsers = self._get_parser_parent(label)
+            nested_map = dict([(id(self._get_parser(c._meta.label)), c)
+                               for c in nested])
+
+            for action in parser._actions:
+                if not action.option_strings and \
+                        not isinstance(action, _SubParsersAction):
+                    # positional arguments are ambiguous
+                    return build_all()
+
+            next_contr = None
+            while args:
+                token = args.pop(0)
+                if token.startswith('-') and token != '-':
+                    action = parser._option_string_actions.get(
+                        token.split('=', 1)[0])
+                    if action is None:
+                        return build_all()
+                    elif isinstance(action, _HelpAction):
+                        # everything listed in this help is already built
+                        return built
+                    elif '=' in token:
+                        continue
+
+                    nargs = action.nargs
+                    if nargs is None:
+                        nargs = 1
+                    elif not isinstance(nargs, int):
+                        return build_all()
+                    del args[:nargs]
+                    continue
+
+                choice = sub_parsers._name_parser_map.get(token)
+                if choice is None:
+                    return build_all()
+                next_contr = nested_map.get(id(choice))
+                break
+
+            # either a command was found, or argv is exhausted
+            if next_contr is None:
+                return built
+            current = next_contr
+
+    def _help_cache_enabled(self):
+        # help is only cached for static parser trees, as parsers modified
+        # right before parsing (by pre_argument_parsing hooks, or controllers
+        # overriding _pre_argument_parsing()) are not covered by the key
+        if self.app.hook.__hooks__.get('pre_argument_parsing'):
+            LOG.debug('not caching help, pre_argument_parsing hooks are ' +
+                      'registered')
+            return False
+
         for contr in self._controllers:
-            label = contr._meta.label
-            stacked_on = contr._meta.stacked_on
-            stacked_type = contr._meta.stacked_type
-
-            if stacked_type == 'nested':
-                # if the controller is nested, we need to create a new parser
-                # parent using the one that it is stacked on, as well as as a
-                # new parser
-                kwargs = self._get_parser_options(contr)
-                parsers[label] = parents[stacked_on].add_parser(
-                    _clean_label(label),
-                    **kwargs
-                )
-
-                contr._parser = parsers[label]
-
-                # we need to add subparsers to this parser so we can
-                # attach commands and other nested controllers to it
-                kwargs = self._get_subparser_options(contr)
-                parents[label] = parsers[label].add_subparsers(**kwargs)
-
-                # add an invisible controller option so we can figure out what
-                # to call later in self._dispatch
-                parsers[label].add_argument(self._controller_option,
-                                            action='store',
-                                            default=contr._meta.label,
-                                            help=SUPPRESS,
-                                            dest='__controller_namespace__',
-                                            )
-                parsers[label].formatter_class = contr._meta.argument_formatter
-
-            elif stacked_type == 'embedded':
-                # if it's embedded, then just set it to use the same as the
-                # controller its stacked on
-                parents[label] = parents[stacked_on]
-                parsers[label] = parsers[stacked_on]
+            for klass in contr.__class__.__mro__:
+                if klass is ArgparseController:
+                    break
+                elif '_pre_argument_parsing' in vars(klass):
+                    LOG.debug('not caching help, %s overrides ' % klass +
+                              '_pre_argument_parsing()')
+                    return False
+        return True
+
+    def _get_help_cache_key(self):
+        # hash of everything that the help output of a command line depends
+        # on: the app level arguments, and the meta-data of every
+        # controller, its commands and the source file it is defined in
+        def describe_action(action):
+            return [action.option_strings, action.dest, action.nargs,
+                    action.default, action.choices, action.help,
+                    action.metavar, action.required]
+
+        def describe_controller(contr):
+            meta = contr._meta
+            klass = contr.__class__
+            data = dict(
+                handler='%s.%s' % (klass.__module__, klass.__name__),
+                source=_get_module_stat(klass.__module__),
+                commands=_get_exposed_commands(klass),
+            )
+            for key in ['label', 'stacked_on', 'stacked_type', 'aliases',
+                        'aliases_only', 'hide', 'help', 'description',
+                        'usage', 'epilog', 'title', 'arguments',
+                        'parser_options', 'subparser_options', 'default_func',
+                        'argument_formatter', 'import_path']:
+                data[key] = getattr(meta, key, None)
+            if isinstance(contr, ArgparseControllerStub):
+                # the real controller is not imported
+                path = meta.import_path or ''
+                if ':' in path:
+                    module = path.split(':', 1)[0]
+                else:
+                    module = path.rsplit('.', 1)[0]
+                data['source'] = _get_module_stat(module)
+            return data
+
+        data = dict(
+            python=sys.version,
+            columns=_get_terminal_columns(),
+            prog=self.app.args.prog,
+            arguments=[describe_action(a) for a in self.app.args._actions],
+            controllers=[describe_controller(c) for c in self._controllers],
+        )
+        raw = json.dumps(data, sort_keys=True, default=_json_default)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _get_help_cache_path(self):
+        # <command line hash>.<key>.txt, so that the stale help of a command
+        # line can be found and pruned (see _prune_cached_help())
+        argv = json.dumps(list(self.app.argv))
+        prefix = hashlib.sha1(argv.encode('utf-8')).hexdigest()
+        return os.path.join(fs.abspath(self._meta.help_cache_dir),
+                            '%s.%s.txt' % (prefix,
+                                           self._get_help_cache_key()))
+
+    def _read_cached_help(self, path):
+        try:
+            with open(path, 'r') as help_file:
+                return help_file.read()
+        except (IOError, OSError):
+            return None
+
+    def _write_cached_help(self, path, text):
+        cache_dir = os.path.dirname(path)
+        tmp_path = '%s.%s.tmp' % (path, os.getpid())
+        try:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            with open(tmp_path, 'w') as help_file:
+                help_file.write(text)
+            if hasattr(os, 'replace'):
+                os.replace(tmp_path, path)
+            else:                                   # pragma: nocover
+                os.rename(tmp_path, path)           # pragma: nocover
+        except (IOError, OSError) as e:
+            LOG.debug("unable to cache help in '%s': %s" % (path, e))
+            return
+        self._prune_cached_help(path)
+
+    def _prune_cached_help(self, path):
+        # remove the help cached for the same command line under previous
+        # keys (i.e. before the controller tree changed)
+        cache_dir, file_name = os.path.split(path)
+        prefix = '%s.' % file_name.split('.', 1)[0]
+        for other in os.listdir(cache_dir):
+            if other == file_name or not other.startswith(prefix) or \
+                    not other.endswith('.txt'):
+                continue
+            try:
+                os.remove(os.path.join(cache_dir, other))
+            except (IOError, OSError) as e:
+                LOG.debug("unable to remove stale help '%s': %s" % (other, e))
+
+    def _parse_args_caching_help(self, path):
+        # argparse prints help to stdout and exits, so the output is
+        # captured while parsing and cached if that is what happened
+        saved_stdout = sys.stdout
+        sys.stdout = captured = StringIO()
+        try:
+            self.app._parse_args()
+        except SystemExit as e:
+            if e.code is None or e.code == 0:
+                LOG.debug("caching help in '%s'" % path)
+                self._write_cached_help(path, captured.getvalue())
+            raise
+        finally:
+            sys.stdout = saved_stdout
+            sys.stdout.write(captured.getvalue())
+
+    def _resolve_stub(self, contr):
+        # this should only be run by the base controller.  replaces a
+        # controller stub with the real controller (importing it), and
+        # returns the controller to build.
+        if not isinstance(contr, ArgparseControllerStub):
+            return contr
+
+        handler = contr._load()
+        self.app.handler.register(handler, force=True)
+        real = handler()
+        real._setup(self.app)
+
+        for key in ['label', 'stacked_on', 'stacked_type']:
+            if getattr(real._meta, key) != getattr(contr._meta, key):
+                raise FrameworkError(
+                    "Controller stub '%s' does not match %s " %
+                    (contr._meta.label, contr._meta.import_path) +
+                    "(%s: '%s' != '%s')" %
+                    (key, getattr(contr._meta, key),
+                     getattr(real._meta, key)))
+
+        # the parser was created from the stub's meta-data
+        real._parser = contr._parser
+        if real._parser is not None:
+            for key, val in self._get_parser_options(real).items():
+                if key not in ['aliases', 'help']:
+                    setattr(real._parser, key, val)
+            real._parser.formatter_class = real._meta.argument_formatter
+
+        index = self._controllers.index(contr)
+        self._controllers[index] = real
+        self._controllers_map[real._meta.label] = real
+        return real
 
     def _get_parser_by_controller(self, controller):
         if controller._meta.stacked_type == 'embedded':
@@ -797,13 +1156,10 @@ class ArgparseController(CementBaseHandler):
                   (self._meta.stacked_on, self._meta.stacked_type))
 
         commands = []
-        for member in dir(self.__class__):
-            if member.startswith('_'):
-                continue
-            elif hasattr(getattr(self, member), '__cement_meta__'):
-                func = getattr(self.__class__, member).__cement_meta__
-                func['controller'] = self
-                commands.append(func)
+        for func in _get_exposed_commands(self.__class__):
+            func = func.copy()
+            func['controller'] = self
+            commands.append(func)
 
         return commands
 
@@ -878,18 +1234,43 @@ class ArgparseController(CementBaseHandler):
     def _dispatch(self):
         LOG.debug("controller dispatch passed off to %s" % self)
         self._setup_controllers()
-        self._setup_parsers()
 
-        for contr in self._controllers:
-            self._process_arguments(contr)
-            self._process_commands(contr)
-
-        for contr in self._controllers:
+        help_cache = None
+        if self._meta.help_cache_dir is not None and \
+                '_ARGCOMPLETE' not in os.environ and \
+                ('-h' in self.app.argv or '--help' in self.app.argv) and \
+                self._help_cache_enabled():
+            help_cache = self._get_help_cache_path()
+            text = self._read_cached_help(help_cache)
+            if text is not None:
+                LOG.debug("printing cached help from '%s'" % help_cache)
+                sys.stdout.write(text)
+                self.app.args.exit()
+
+        if self._meta.lazy_parsers is True and \
+                '_ARGCOMPLETE' not in os.environ:
+            controllers = self._setup_parsers_lazy()
+        else:
+            controllers = self._build_parsers()
+
+        self._built_controllers = controllers
+        return self._dispatch_controllers(controllers, help_cache)
+
+    def _dispatch_controllers(self, controllers, help_cache=None):
+        # this should only be run by the base controller.  parses
+        # ``app.argv`` with the parsers already built for ``controllers``,
+        # and calls the controller function (without rebuilding anything,
+        # so it can be called once per command, i.e. from a shell).  help
+        # output is written to ``help_cache`` if set.
+        for contr in controllers:
             contr._pre_argument_parsing()
 
-        self.app._parse_args()
+        if help_cache is None:
+            self.app._parse_args()
+        else:
+            self._parse_args_caching_help(help_cache)
 
-        for contr in self._controllers:
+        for contr in controllers:
             contr._post_argument_parsing()
             contr._process_parsed_arguments()
 
@@ -920,7 +1301,9 @@ class ArgparseController(CementBaseHandler):
 
         if hasattr(contr, func_name):
             func = getattr(contr, func_name)
-            return func()
+            if self.app._profile is not None:
+                return self.app._run_profiled(func)
+            return self.app._run_controller_function(func)
         else:
             # only time that we'd get here is if Controller.Meta.default_func
             # is pointing to something that doesn't exist
@@ -932,5 +1315,133 @@ class ArgparseController(CementBaseHandler):
                 (contr.__class__.__name__, func_name))      # pragma: nocover
 
 
+def _get_module_stat(module_name):
+    # [mtime, size] of the source file of a module (without importing it if
+    # not already imported), or None if it can't be found
+    module = sys.modules.get(module_name)
+    path = getattr(module, '__file__', None)
+    if path is None:
+        try:
+            from importlib.util import find_spec
+            spec = find_spec(module_name)
+            path = getattr(spec, 'origin', None)
+        except (ImportError, ValueError, AttributeError):
+            path = None
+    if path is None:
+        return None
+    try:
+        res = os.stat(path)
+    except OSError:
+        return None
+    return [res.st_mtime, res.st_size]
+
+
+def _get_terminal_columns():
+    # argparse wraps help output to the width of the terminal
+    try:
+        from shutil import get_terminal_size
+        return get_terminal_size().columns
+    except ImportError:                             # pragma: nocover
+        return os.environ.get('COLUMNS')            # pragma: nocover
+
+
+def _json_default(obj):
+    # a representation that is the same in every process: classes and
+    # functions (i.e. formatter classes, argument types) are identified by
+    # name, sets are sorted, and memory addresses are stripped from the
+    # repr of anything else
+    if hasattr(obj, '__module__') and hasattr(obj, '__name__'):
+        return '%s.%s' % (obj.__module__, obj.__name__)
+    elif isinstance(obj, (set, frozenset)):
+        return sorted([json.dumps(item, sort_keys=True, default=_json_default)
+                       for item in obj])
+    klass = obj.__class__
+    return '%s.%s:%s' % (klass.__module__, klass.__name__,
+                         _ADDRESS_RE.sub('', repr(obj)))
+
+
+class ArgparseControllerStub(ArgparseController):
+
+    """
+    A placeholder for an :class:`ArgparseController` that is imported only
+    when it is needed (see :func:`controller_stub`).  The stub provides the
+    meta-data required to list the controller (``label``, ``stacked_on``,
+    ``stacked_type``, ``help``, ``aliases``, etc), and is replaced by the
+    real controller when the base controller builds it.
+
+    """
+
+    class Meta:
+
+        """Controller meta-data."""
+
+        #: The import path of the real controller class, in the form of
+        #: ``package.module:ClassName`` (or ``package.module.ClassName``).
+        import_path = None
+
+    def _load(self):
+        """
+        Import the real controller class.
+
+        :returns: The (uninstantiated) controller class.
+        :raises: cement.core.exc.FrameworkError
+
+        """
+        path = self._meta.import_path
+        if path is None:
+            raise FrameworkError("Controller stub '%s' has no import_path." %
+                                 self._meta.label)
+
+        if ':' in path:
+            module, class_name = path.split(':', 1)
+        else:
+            module, _, class_name = path.rpartition('.')
+
+        LOG.debug("importing controller '%s' from '%s'" %
+                  (self._meta.label, path))
+        try:
+            return self.app.__import__(class_name, from_module=module)
+        except (ImportError, AttributeError) as e:
+            raise FrameworkError("Unable to import controller '%s': %s" %
+                                 (path, e))
+
+
+def controller_stub(label, import_path, **meta):
+    """
+    Create a controller stub, which can be registered in place of an
+    :class:`ArgparseController` that is expensive to import.  The real
+    controller is only imported when it is built, which (with
+    ``lazy_parsers`` enabled on the base controller) is only when the
+    command line requires it.  Note that embedded stubs are built with the
+    controller they are stacked on.
+
+    :param label: The label of the real controller.
+    :param import_path: The import path of the real controller class, in
+     the form of ``package.module:ClassName``.
+    :param meta: Additional controller meta-data (i.e. ``stacked_on``,
+     ``stacked_type``, ``help``, ``aliases``, ``hide``), which must match
+     the real controller.
+    :returns: A (uninstantiated) ``ArgparseControllerStub`` sub-class.
+
+    Usage:
+
+    .. code-block:: python
+
+        from cement.ext.ext_argparse import controller_stub
+
+        app.handler.register(
+            controller_stub('reports', 'myapp.controllers.reports:Reports',
+                            stacked_type='nested',
+                            help='generate reports')
+        )
+
+    """
+    meta['label'] = label
+    meta['import_path'] = import_path
+    meta_class = type('Meta', (object,), meta)
+    name = '%sStub' % re.sub('[^0-9a-zA-Z]', '_', label)
+    return type(name, (ArgparseControllerStub,), dict(Meta=meta_class))
+
+
 def load(app):
     app.handler.register(ArgparseArgumentHandler)
@@ -0,0 +1,312 @@
+"""
+The Compiled Config Extension provides the
+:class:`CompiledConfigHandler`, which loads configuration from a compact
+binary format with a single read and no text parsing.  Compiled config
+files are generated from existing configuration files (``.conf``, ``.yml``,
+``.json``, etc) by deployment tooling via :func:`compile_config`.
+
+Requirements
+------------
+
+ * No external dependencies (``msgpack`` is optional)
+
+
+Configuration
+-------------
+
+This extension does not honor any application configuration settings.
+
+
+File Format
+-----------
+
+Compiled config files start with a short header (a magic string, the format
+version, and the codec) followed by the serialized configuration dictionary
+(``{section: {key: value}}``).  The following codecs are supported:
+
+ * **marshal** (default) - Python's ``marshal`` format.  The marshal format
+   can change between Python versions, so the version used to compile a file
+   is stored in the header and loading it from a different version raises
+   an error (recompile the file).
+ * **msgpack** - Portable between Python versions.  Requires ``msgpack``
+   (``pip install msgpack``).
+
+
+Usage
+-----
+
+Compile existing configuration files:
+
+.. code-block:: python
+
+    from cement.ext.ext_compiled_config import compile_config
+
+    compile_config('/etc/myapp/myapp.conf', '/etc/myapp/myapp.cfgc')
+
+Then either use the compiled config handler for all config files:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['compiled_config']
+            config_handler = 'compiled'
+            config_extension = '.cfgc'
+
+
+Or simply load the extension, and compiled files (ending in ``.cfgc``) are
+loaded alongside text config files by any config handler:
+
+.. code-block:: python
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['compiled_config']
+            config_files = [
+                '/etc/myapp/myapp.cfgc',
+                '~/.myapp.conf',
+            ]
+
+"""
+
+import os
+import json
+import marshal
+from ..core import config, exc
+from ..utils.misc import minimal_logger
+from ..utils.fs import abspath
+from ..ext.ext_configparser import ConfigParserConfigHandler
+
+LOG = minimal_logger(__name__)
+
+MAGIC = b'CEMENTC'
+FORMAT_VERSION = 1
+COMPILED_EXTENSION = '.cfgc'
+
+# codec label -> id stored in the file header
+CODECS = dict(marshal=0, msgpack=1)
+
+
+def _get_msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise exc.FrameworkError("The msgpack codec requires 'msgpack' " +
+                                 "(pip install msgpack).")
+    return msgpack
+
+
+def dumps(data, codec='marshal'):
+    """
+    Serialize a configuration dictionary into the compiled config format.
+
+    :param data: A dictionary of ``{section: {key: value}}``.
+    :param codec: The codec to serialize with (``marshal`` or ``msgpack``).
+    :returns: ``bytes``
+
+    """
+    if codec not in CODECS:
+        raise exc.FrameworkError("Unknown compiled config codec '%s'." %
+                                 codec)
+
+    if codec == 'msgpack':
+        marshal_version = 0
+        payload = _get_msgpack().packb(data, use_bin_type=True)
+    else:
+        marshal_version = marshal.version
+        payload = marshal.dumps(data)
+
+    header = bytearray(MAGIC)
+    header.extend([FORMAT_VERSION, CODECS[codec], marshal_version])
+    return bytes(header) + payload
+
+
+def loads(raw):
+    """
+    Deserialize a configuration dictionary from the compiled config format.
+
+    :param raw: The compiled config (``bytes``).
+    :returns: A dictionary of ``{section: {key: value}}``.
+    :raises: cement.core.exc.FrameworkError if ``raw`` is not a compiled
+     config, or was compiled by an incompatible version.
+
+    """
+    size = len(MAGIC)
+    if raw[:size] != MAGIC:
+        raise exc.FrameworkError("Not a compiled config file.")
+
+    header = bytearray(raw[size:size + 3])
+    if len(header) < 3 or header[0] != FORMAT_VERSION:
+        raise exc.FrameworkError("Unsupported compiled config format " +
+                                 "version, please recompile.")
+
+    payload = raw[size + 3:]
+    if header[1] == CODECS['msgpack']:
+        return _get_msgpack().unpackb(payload, raw=False)
+    elif header[1] == CODECS['marshal']:
+        if header[2] != marshal.version:
+            raise exc.FrameworkError("Compiled config was compiled with " +
+                                     "an incompatible version of Python, " +
+                                     "please recompile.")
+        return marshal.loads(payload)
+    raise exc.FrameworkError("Unknown compiled config codec (%s)." %
+                             header[1])
+
+
+def read_compiled_file(file_path):
+    """
+    Read a compiled config file.
+
+    :param file_path: The file system path to the compiled config file.
+    :returns: A dictionary of ``{section: {key: value}}``.
+
+    """
+    with open(file_path, 'rb') as config_file:
+        raw = config_file.read()
+    try:
+        return loads(raw)
+    except exc.FrameworkError as e:
+        raise exc.FrameworkError("%s: %s" % (file_path, e.msg))
+
+
+def write_compiled_file(file_path, data, codec='marshal'):
+    """
+    Write a configuration dictionary to a compiled config file.  The file is
+    written to a temporary file first, and then renamed over ``file_path``
+    so that readers never see a partially written file.
+
+    :param file_path: The file system path to write to.
+    :param data: A dictionary of ``{section: {key: value}}``.
+    :param codec: The codec to serialize with (``marshal`` or ``msgpack``).
+    :returns: ``None``
+
+    """
+    raw = dumps(data, codec)
+    tmp_path = '%s.%s.tmp' % (file_path, os.getpid())
+    with open(tmp_path, 'wb') as config_file:
+        config_file.write(raw)
+    if hasattr(os, 'replace'):
+        os.replace(tmp_path, file_path)
+    else:  # pragma: nocover
+        os.rename(tmp_path, file_path)
+
+
+def _read_text_file(file_path):
+    # parse a text config file based on its extension
+    if file_path.endswith('.json'):
+        with open(file_path) as config_file:
+            return json.load(config_file)
+    elif file_path.endswith('.yml') or file_path.endswith('.yaml'):
+        from .ext_yaml import SafeLoader
+        import yaml
+        with open(file_path) as config_file:
+            return yaml.load(config_file, Loader=SafeLoader)
+    else:
+        handler = ConfigParserConfigHandler()
+        handler.parse_file(file_path)
+        return dict(handler.get_dict())
+
+
+def compile_config(source, dest=None, codec='marshal', handler=None):
+    """
+    Compile a text configuration file into the compiled config format.
+
+    :param source: The file system path to the configuration file to
+     compile.  ``.json``, ``.yml`` and ``.yaml`` files are parsed as JSON
+     and Yaml, and any other file with ``ConfigParser``.
+    :param dest: The file system path to write the compiled config to.
+     Defaults to ``source`` with its extension replaced by ``.cfgc``.
+    :param codec: The codec to serialize with (``marshal`` or ``msgpack``).
+    :param handler: A config handler class to parse ``source`` with
+     instead (i.e. ``ConfigObjConfigHandler``).
+    :returns: The file system path of the compiled config.
+    :rtype: ``str``
+
+    """
+    source = abspath(source)
+    if dest is None:
+        dest = '%s%s' % (os.path.splitext(source)[0], COMPILED_EXTENSION)
+    dest = abspath(dest)
+
+    if not os.path.exists(source):
+        raise exc.FrameworkError("Config file '%s' does not exist." %
+                                 source)
+
+    if handler is not None:
+        config_handler = handler()
+        config_handler.parse_file(source)
+        data = config_handler.get_dict()
+    else:
+        data = _read_text_file(source)
+
+    data = dict([(section, dict(items)) for section, items in data.items()
+                 if isinstance(items, dict)])
+    LOG.debug("compiling config file '%s' to '%s'" % (source, dest))
+    write_compiled_file(dest, data, codec)
+    return dest
+
+
+class CompiledConfigHandler(ConfigParserConfigHandler):
+
+    """
+    This class implements the :ref:`IConfig <cement.core.config>`
+    interface, and provides the same functionality of
+    :ref:`ConfigParserConfigHandler <cement.ext.ext_configparser>`
+    but loads compiled config files (see :func:`compile_config`).
+
+    """
+    class Meta:
+
+        """Handler meta-data."""
+
+        label = 'compiled'
+
+        #: The codec used by ``write_file()``, either ``marshal`` or
+        #: ``msgpack``.  Files of either codec can be read.
+        codec = 'marshal'
+
+    def __init__(self, *args, **kw):
+        super(CompiledConfigHandler, self).__init__(*args, **kw)
+
+    def _read_file(self, file_path):
+        """
+        Read a compiled configuration file and return it as a dictionary.
+
+        :param file_path: The file system path to the compiled config file.
+        :returns: dict
+
+        """
+        return read_compiled_file(file_path)
+
+    def _parse_file(self, file_path):
+        """
+        Read a compiled configuration file and merge its settings,
+        overwriting existing config settings.
+
+        :param file_path: The file system path to the compiled config file.
+        :returns: boolean
+
+        """
+        self.merge(self._read_file(file_path))
+        return True
+
+    def write_file(self, file_path):
+        """
+        Write the entire configuration to a compiled config file.
+
+        :param file_path: The file system path to write to.
+        :returns: ``None``
+
+        """
+        data = dict([(section, dict(items))
+                     for section, items in self.get_dict().items()])
+        write_compiled_file(abspath(file_path), data, self._meta.codec)
+
+
+def load(app):
+    config.register_file_reader(app, COMPILED_EXTENSION, read_compiled_file)
+    app.handler.register(CompiledConfigHandler)
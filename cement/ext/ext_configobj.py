@@ -48,11 +48,42 @@ Usage
 
 from ..core import config
 from ..utils.misc import minimal_logger
-from configobj import ConfigObj
+from configobj import ConfigObj, Section
 
 LOG = minimal_logger(__name__)
 
 
+class ConfigObjSection(Section):
+
+    """
+    A ``configobj.Section`` that invalidates the cached snapshots and typed
+    values of its config handler whenever it is modified directly (i.e.
+    ``app.config['myapp']['foo'] = 'bar'``).
+
+    """
+
+    def __setitem__(self, key, value, unrepr=False):
+        Section.__setitem__(self, key, value, unrepr)
+        self.main._config_changed(self.name, key)
+
+    def __delitem__(self, key):
+        Section.__delitem__(self, key)
+        self.main._config_changed(self.name, key)
+
+    def clear(self):
+        Section.clear(self)
+        self.main._config_changed()
+
+    def rename(self, oldkey, newkey):
+        Section.rename(self, oldkey, newkey)
+        self.main._config_changed()
+
+    def restore_default(self, key):
+        res = Section.restore_default(self, key)
+        self.main._config_changed(self.name, key)
+        return res
+
+
 class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
 
     """
@@ -77,23 +108,30 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         super(ConfigObjConfigHandler, self).__init__(*args, **kw)
         self.app = None
 
-    def _setup(self, app_obj):
-        self.app = app_obj
+    def __setitem__(self, key, value, unrepr=False):
+        # sections are created as ``ConfigObjSection`` so that direct item
+        # assignment invalidates cached values
+        if isinstance(value, dict) and not isinstance(value, Section) and \
+                not unrepr:
+            value = ConfigObjSection(self, self.depth + 1, self.main,
+                                     indict=value, name=key)
+        super(ConfigObjConfigHandler, self).__setitem__(key, value, unrepr)
+        self._config_changed()
 
-    def get_dict(self):
-        """
-        Return a dict of the entire configuration.
-        [block] label in a config file.
+    def __delitem__(self, key):
+        super(ConfigObjConfigHandler, self).__delitem__(key)
+        self._config_changed()
 
-        :returns: A dictionary of the entire config.
-        :rtype: ``dict``
+    def clear(self):
+        super(ConfigObjConfigHandler, self).clear()
+        self._config_changed()
 
-        """
+    def rename(self, oldkey, newkey):
+        super(ConfigObjConfigHandler, self).rename(oldkey, newkey)
+        self._config_changed()
 
-        config = dict()
-        for section in self.get_sections():
-            config[section] = self.get_section_dict(section)
-        return config
+    def _setup(self, app_obj):
+        self.app = app_obj
 
     def get_sections(self):
         """
@@ -103,19 +141,16 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         """
         return self.sections
 
-    def get_section_dict(self, section):
+    def _read_file(self, file_path):
         """
-        Return a dict representation of a section.
+        Parse a configuration file at ``file_path`` and return it as a
+        dictionary (used by the parse cache).
 
-        :param section: The section of the configuration.
-         I.e. ``[block_section]``
+        :param file_path: The file system path to the configuration file.
         :returns: dict
 
         """
-        dict_obj = dict()
-        for key in self.keys(section):
-            dict_obj[key] = self.get(section, key)
-        return dict_obj
+        return ConfigObj(file_path).dict()
 
     def _parse_file(self, file_path):
         """
@@ -125,8 +160,7 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         :returns: boolean (True if file was read properly, False otherwise)
 
         """
-        _c = ConfigObj(file_path)
-        self.merge(_c.dict())
+        self.merge(self._read_file(file_path))
 
         # FIX ME: Should check that file was read properly, however if not it
         # will likely raise an exception anyhow.
@@ -161,7 +195,9 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         :param value: The value to set the key to.
         :returns: None
         """
-        self[section][key] = value
+        with self._lock:
+            # the section invalidates cached values (see ConfigObjSection)
+            self[section][key] = value
 
     def has_section(self, section):
         """
@@ -171,10 +207,9 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         :returns: bool
 
         """
-        if section in self.get_sections():
-            return True
-        else:
-            return False
+        # sections are (dict) values of the config object, a dict lookup
+        # avoids scanning the list of sections
+        return isinstance(dict.get(self, section), dict)
 
     def add_section(self, section):
         """
@@ -183,8 +218,9 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         :param section: The configuration [section] to add.
 
         """
-        if not self.has_section(section):
-            self[section] = dict()
+        with self._lock:
+            if not self.has_section(section):
+                self[section] = dict()
 
     def merge(self, dict_obj, override=True):
         """
@@ -198,21 +234,27 @@ class ConfigObjConfigHandler(config.CementConfigHandler, ConfigObj):
         :returns: None
 
         """
-        for section in list(dict_obj.keys()):
-            if type(dict_obj[section]) == dict:
-                if section not in self.get_sections():
-                    self.add_section(section)
+        with self._lock:
+            sections = set(self.get_sections())
+            for section in list(dict_obj.keys()):
+                if type(dict_obj[section]) == dict:
+                    if section not in sections:
+                        self.add_section(section)
+                        sections.add(section)
 
-                for key in list(dict_obj[section].keys()):
                     if override:
-                        self.set(section, key, dict_obj[section][key])
-                    else:
-                        # only set it if the key doesn't exist
-                        if key not in self.keys(section):
+                        for key in list(dict_obj[section].keys()):
                             self.set(section, key, dict_obj[section][key])
-
-                # we don't support nested config blocks, so no need to go
-                # further down to more nested dicts.
+                    else:
+                        # only set keys that don't exist (looked up once per
+                        # section, rather than once per key)
+                        existing = set(self.keys(section))
+                        for key in list(dict_obj[section].keys()):
+                            if key not in existing:
+                                self.set(section, key, dict_obj[section][key])
+
+                    # we don't support nested config blocks, so no need to go
+                    # further down to more nested dicts.
 
 
 def load(app):
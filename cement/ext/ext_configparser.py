@@ -73,8 +73,14 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
     def __init__(self, *args, **kw):
         # ConfigParser is not a new style object, so you can't call super()
         # super(ConfigParserConfigHandler, self).__init__(*args, **kw)
-        RawConfigParser.__init__(self, *args, **kw)
+        # handler meta options (i.e. via ``CementApp.Meta.meta_defaults``)
+        # are not for RawConfigParser
+        meta_keys = set(dir(config.CementConfigHandler.Meta)) | \
+            set(dir(self.Meta))
+        parser_kw = dict([(k, v) for k, v in kw.items()
+                          if k not in meta_keys])
         super(ConfigParserConfigHandler, self).__init__(*args, **kw)
+        RawConfigParser.__init__(self, *args, **parser_kw)
         self.app = None
 
     def merge(self, dict_obj, override=True):
@@ -89,21 +95,97 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
             config.
 
         """
-        for section in list(dict_obj.keys()):
-            if type(dict_obj[section]) == dict:
-                if section not in self.get_sections():
-                    self.add_section(section)
+        with self._lock:
+            sections = set(self.get_sections())
+            for section in list(dict_obj.keys()):
+                if type(dict_obj[section]) == dict:
+                    if section not in sections:
+                        self.add_section(section)
+                        sections.add(section)
 
-                for key in list(dict_obj[section].keys()):
                     if override:
-                        self.set(section, key, dict_obj[section][key])
-                    else:
-                        # only set it if the key doesn't exist
-                        if key not in self.keys(section):
+                        for key in list(dict_obj[section].keys()):
                             self.set(section, key, dict_obj[section][key])
+                    else:
+                        # only set keys that don't exist (looked up once per
+                        # section, rather than once per key)
+                        existing = set(self.keys(section))
+                        for key in list(dict_obj[section].keys()):
+                            if key not in existing:
+                                self.set(section, key, dict_obj[section][key])
+
+                    # we don't support nested config blocks, so no need to go
+                    # further down to more nested dicts.
+
+    def set(self, section, key, value=None):
+        """
+        Set a configuration value based at [section][key].
+
+        :param section: The [section] of the configuration.
+        :param key: The configuration key to set the value at.
+        :param value: The value to set.
+        :returns: ``None``
+
+        """
+        with self._lock:
+            RawConfigParser.set(self, section, key, value)
+            self._config_changed(section, key)
+
+    def remove_option(self, section, option):
+        """
+        Remove the configuration key ``option`` from [section].
+
+        :param section: The [section] of the configuration.
+        :param option: The configuration key to remove.
+        :returns: ``True`` if the key existed, ``False`` otherwise.
+
+        """
+        with self._lock:
+            res = RawConfigParser.remove_option(self, section, option)
+            self._config_changed(section, option)
+            return res
+
+    def remove_section(self, section):
+        """
+        Remove [section] (and all of its keys) from the configuration.
+
+        :param section: The section to remove.
+        :returns: ``True`` if the section existed, ``False`` otherwise.
+
+        """
+        with self._lock:
+            res = RawConfigParser.remove_section(self, section)
+            self._config_changed()
+            return res
+
+    def _read(self, *args, **kw):
+        # every read*() method of RawConfigParser parses via _read()
+        with self._lock:
+            try:
+                return RawConfigParser._read(self, *args, **kw)
+            finally:
+                self._config_changed()
+
+    def _read_file(self, file_path):
+        """
+        Parse a configuration file at ``file_path`` and return it as a
+        dictionary (used by the parse cache).  Files with a ``[DEFAULT]``
+        section can not be represented as a dictionary, and return ``None``.
 
-                # we don't support nested config blocks, so no need to go
-                # further down to more nested dicts.
+        :param file_path: The file system path to the configuration file.
+        :returns: dict or ``None``
+
+        """
+        parser = RawConfigParser()
+        parser.optionxform = self.optionxform
+        parser.read(file_path)
+        if parser.defaults():
+            return None
+
+        dict_obj = dict()
+        for section in parser.sections():
+            dict_obj[section] = dict(parser.items(section))
+        return dict_obj
 
     def _parse_file(self, file_path):
         """
@@ -130,21 +212,6 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
         """
         return self.options(section)
 
-    def get_dict(self):
-        """
-        Return a dict of the entire configuration.
-        [block] label in a config file.
-
-        :returns: A dictionary of the entire config.
-        :rtype: ``dict``
-
-        """
-
-        config = dict()
-        for section in self.get_sections():
-            config[section] = self.get_section_dict(section)
-        return config
-
     def get_sections(self):
         """
         Return a list of configuration sections or [blocks].
@@ -155,21 +222,6 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
         """
         return self.sections()
 
-    def get_section_dict(self, section):
-        """
-        Return a dict representation of a section.
-
-        :param section: The section of the configuration.
-         I.e. [block_section]
-        :returns: Dictionary reprisentation of the config section.
-        :rtype: ``dict``
-
-        """
-        dict_obj = dict()
-        for key in self.keys(section):
-            dict_obj[key] = self.get(section, key)
-        return dict_obj
-
     def add_section(self, section):
         """
         Adds a block section to the config.
@@ -177,7 +229,9 @@ class ConfigParserConfigHandler(config.CementConfigHandler, RawConfigParser):
         :param section: The section to add.
 
         """
-        super(ConfigParserConfigHandler, self).add_section(section)
+        with self._lock:
+            super(ConfigParserConfigHandler, self).add_section(section)
+            self._config_changed()
 
 
 def load(app):
@@ -95,6 +95,18 @@ class JsonConfigObjConfigHandler(ConfigObjConfigHandler):
         self._json = __import__(self._meta.json_module,
                                 globals(), locals(), [], 0)
 
+    def _read_file(self, file_path):
+        """
+        Parse JSON configuration file settings from ``file_path`` and return
+        them as a dictionary (used by the parse cache).
+
+        :param file_path: The file system path to the JSON configuration file.
+        :returns: dict
+
+        """
+        with open(file_path) as config_file:
+            return self._json.load(config_file)
+
     def _parse_file(self, file_path):
         """
         Parse JSON configuration file settings from ``file_path``, overwriting
@@ -105,7 +117,7 @@ class JsonConfigObjConfigHandler(ConfigObjConfigHandler):
         :returns: boolean
 
         """
-        self.merge(self._json.load(open(file_path)))
+        self.merge(self._read_file(file_path))
 
         # FIX ME: Should check that file was read properly, however if not it
         # will likely raise an exception anyhow.
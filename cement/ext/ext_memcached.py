@@ -20,6 +20,28 @@ under a ``[cache.memcached]`` section in any configuration file:
     * **expire_time** - The default time in second to expire items in the
       cache.  Default: 0 (does not expire).
     * **hosts** - List of Memcached servers.
+    * **pool_mode** - How clients are shared between threads.  One of
+      ``none`` (a single client, not thread safe), ``thread_mapped`` (one
+      client per thread via ``pylibmc.ThreadMappedPool``), or ``client_pool``
+      (a fixed size ``pylibmc.ClientPool``).  Default: ``none``.
+    * **pool_size** - Number of clients in the pool when ``pool_mode`` is
+      ``client_pool``.  Default: 4.
+    * **socket_timeout** - Time in seconds to wait when connecting to, and
+      sending to/receiving from, a server.  Default: None (library default).
+    * **tcp_keepalive** - Whether to enable TCP keepalive.  Default: False.
+    * **codec** - Serialize values with one of ``pickle``, ``json``,
+      ``msgpack`` (requires ``msgpack``), or ``marshal`` before storing them.
+      Default: None (values are pickled by ``pylibmc``).
+    * **compression** - Compress encoded values larger than
+      ``compress_threshold`` with ``zlib`` or ``lz4`` (requires ``lz4``).
+      Default: None.
+    * **compress_threshold** - Size in bytes above which encoded values are
+      compressed.  Default: 1024.
+    * **track_stats** - Track hits, misses, bytes transferred, and latency
+      (see ``app.cache.stats()``).  Stats are logged on close in debug mode.
+      Default: False.
+
+Pooled clients are disconnected in a ``pre_close`` hook.
 
 
 Configurations can be passed as defaults to a CementApp:
@@ -60,6 +82,20 @@ the following:
     # comma seperated list of memcached servers
     hosts = 127.0.0.1, cache.example.com
 
+    # share clients between threads (none, thread_mapped, client_pool)
+    pool_mode = thread_mapped
+
+    # socket timeout in seconds
+    socket_timeout = 5
+
+    # enable tcp keepalive
+    tcp_keepalive = true
+
+    # serialize values as json, and zlib compress those over 1KB
+    codec = json
+    compression = zlib
+    compress_threshold = 1024
+
 
 Usage
 -----
@@ -99,8 +135,10 @@ Usage
 """
 
 import pylibmc
-from ..core import cache
-from ..utils.misc import minimal_logger
+from contextlib import contextmanager
+from time import sleep, time as now
+from ..core import cache, exc
+from ..utils.misc import minimal_logger, rando
 
 LOG = minimal_logger(__name__)
 
@@ -127,16 +165,97 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
         config_defaults = dict(
             hosts=['127.0.0.1'],
             expire_time=0,
+            pool_mode='none',
+            pool_size=4,
+            socket_timeout=None,
+            tcp_keepalive=False,
+        )
+        config_schema = dict(
+            hosts=list,
+            expire_time=int,
+            pool_size=int,
+            tcp_keepalive=bool,
         )
 
     def __init__(self, *args, **kw):
         super(MemcachedCacheHandler, self).__init__(*args, **kw)
         self.mc = None
+        self.pool = None
 
     def _setup(self, *args, **kw):
         super(MemcachedCacheHandler, self)._setup(*args, **kw)
         self._fix_hosts()
         self.mc = pylibmc.Client(self._config('hosts'))
+        self.mc.behaviors.update(self._get_behaviors())
+
+        pool_mode = self._config('pool_mode')
+        if pool_mode in [None, 'none', 'None']:
+            self.pool = None
+        elif pool_mode == 'thread_mapped':
+            self.pool = pylibmc.ThreadMappedPool(self.mc)
+        elif pool_mode == 'client_pool':
+            self.pool = pylibmc.ClientPool()
+            self.pool.fill(self.mc, self._config_typed('pool_size'))
+        else:
+            raise exc.FrameworkError(
+                "Invalid memcached pool_mode '%s' " % pool_mode +
+                "(must be one of: none, thread_mapped, client_pool)"
+            )
+
+    def _get_behaviors(self):
+        """
+        Build the ``pylibmc`` client behaviors from the handler config.
+
+        :returns: ``dict``
+
+        """
+        behaviors = dict()
+        if self._config_typed('tcp_keepalive'):
+            behaviors['tcp_keepalive'] = True
+
+        timeout = self._config('socket_timeout')
+        if timeout not in [None, '', 'None']:
+            timeout = float(timeout)
+            # pylibmc takes milliseconds to connect, and microseconds to
+            # send/receive
+            behaviors['connect_timeout'] = int(timeout * 1000)
+            behaviors['send_timeout'] = int(timeout * 1000000)
+            behaviors['receive_timeout'] = int(timeout * 1000000)
+        return behaviors
+
+    @contextmanager
+    def _client(self):
+        """
+        Context manager that yields a ``pylibmc`` client, reserved from the
+        pool if one is configured.
+
+        """
+        if self.pool is None:
+            yield self.mc
+        else:
+            with self.pool.reserve() as mc:
+                yield mc
+
+    def close(self):
+        """
+        Drain the client pool (if any) and disconnect all clients.
+
+        :returns: ``None``
+
+        """
+        clients = []
+        if isinstance(self.pool, pylibmc.ThreadMappedPool):
+            clients = list(self.pool.values())
+            self.pool.clear()
+        elif self.pool is not None:
+            while not self.pool.empty():
+                clients.append(self.pool.get(False))
+
+        LOG.debug('disconnecting %s memcached client(s)' % (len(clients) + 1))
+        for client in clients:
+            client.disconnect_all()
+        if self.mc is not None:
+            self.mc.disconnect_all()
 
     def _fix_hosts(self):
         """
@@ -160,6 +279,52 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
             fixed_hosts = hosts
         self.app.config.set(self._meta.config_section, 'hosts', fixed_hosts)
 
+    def _acquire_lock(self, key, timeout, blocking=True):
+        """
+        Acquire a distributed single-flight lock using memcached's atomic
+        ``add``, so that only one process (across all hosts) computes a
+        memoized value.  The lock expires after ``timeout`` seconds in case
+        its owner dies.
+
+        :param key: The lock key.
+        :param timeout: Time (in seconds) after which the lock expires.
+        :param blocking: Whether to wait (up to ``timeout``) for the lock.
+        :returns: A lock token if acquired, ``None`` otherwise.
+
+        """
+        token = rando()
+        expire = now() + timeout
+        while True:
+            with self._client() as mc:
+                if mc.add(key, token, time=int(timeout)):
+                    return token
+            if not blocking or now() >= expire:
+                return None
+            sleep(0.05)
+
+    def _release_lock(self, key, token):
+        """
+        Release a lock acquired by ``_acquire_lock()`` (only if it is still
+        owned by ``token``, i.e. it did not expire and get acquired by
+        another process).
+
+        :param key: The lock key.
+        :param token: The token returned by ``_acquire_lock()``.
+        :returns: ``None``
+
+        """
+        with self._client() as mc:
+            if mc.get(key) == token:
+                mc.delete(key)
+
+    def _backend_stats(self):
+        with self._client() as mc:
+            servers = mc.get_stats()
+        evictions = 0
+        for server, stats in servers:
+            evictions += int(stats.get('evictions', 0))
+        return dict(evictions=evictions)
+
     def get(self, key, fallback=None, **kw):
         """
         Get a value from the cache.  Any additional keyword arguments will be
@@ -172,11 +337,12 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
 
         """
         LOG.debug("getting cache value using key '%s'" % key)
-        res = self.mc.get(key, **kw)
+        with self._client() as mc:
+            res = mc.get(key, **kw)
         if res is None:
             return fallback
         else:
-            return res
+            return self._decode(res)
 
     def _config(self, key):
         """
@@ -205,9 +371,11 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
 
         """
         if time is None:
-            time = int(self._config('expire_time'))
+            time = self._config_typed('expire_time')
 
-        self.mc.set(key, value, time=time, **kw)
+        value = self._encode(value)
+        with self._client() as mc:
+            mc.set(key, value, time=time, **kw)
 
     def delete(self, key, **kw):
         """
@@ -219,7 +387,8 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
         :returns: ``None``
 
         """
-        self.mc.delete(key, **kw)
+        with self._client() as mc:
+            mc.delete(key, **kw)
 
     def purge(self, **kw):
         """
@@ -230,9 +399,22 @@ class MemcachedCacheHandler(cache.CementCacheHandler):
         :returns: ``None``
 
         """
+        with self._client() as mc:
+            mc.flush_all(**kw)
+
 
-        self.mc.flush_all(**kw)
+def memcached_pre_close(app):
+    """
+    This is a ``pre_close`` hook that drains the memcached client pool if
+    the application's cache handler is the ``MemcachedCacheHandler``.
+
+    :param app: The application object.
+
+    """
+    if isinstance(app.cache, MemcachedCacheHandler):
+        app.cache.close()
 
 
 def load(app):
     app.handler.register(MemcachedCacheHandler)
+    app.hook.register('pre_close', memcached_pre_close)
@@ -0,0 +1,251 @@
+"""
+The Memory Extension provides in-process application caching support.
+Values are stored as-is (without serialization) in a dictionary that lives
+for the life of the application object, making it useful for single process
+applications, daemons, and testing.
+
+Requirements
+------------
+
+ * No external dependencies.
+
+Configuration
+-------------
+
+This extension honors the following config settings
+under a ``[cache.memory]`` section in any configuration file:
+
+    * **expire_time** - The default time in second to expire items in the
+      cache.  Default: 0 (does not expire).
+    * **max_entries** - The maximum number of items to keep in the cache.
+      When full, the least recently used item is evicted.  Default: 0
+      (unlimited).
+
+
+Configurations can be passed as defaults to a CementApp:
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+    from cement.utils.misc import init_defaults
+
+    defaults = init_defaults('myapp', 'cache.memory')
+    defaults['cache.memory']['expire_time'] = 300
+    defaults['cache.memory']['max_entries'] = 10000
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            config_defaults = defaults
+            extensions = ['memory']
+            cache_handler = 'memory'
+
+
+Usage
+-----
+
+The handler implements both the synchronous
+:ref:`ICache <cement.core.cache>` interface, and the awaitable
+``IAsyncCache`` variants (which complete immediately, as no operation
+blocks).
+
+.. code-block:: python
+
+    with MyApp() as app:
+        app.run()
+
+        # Set a cached value
+        app.cache.set('my_key', 'my value')
+
+        # Get a cached value
+        app.cache.get('my_key')
+
+        # From a coroutine
+        async def work():
+            await app.cache.aset('my_key', 'my value')
+            return await app.cache.aget('my_key')
+
+"""
+
+import threading
+from collections import OrderedDict
+from time import time as now
+from ..core import cache
+from ..utils.misc import minimal_logger
+
+LOG = minimal_logger(__name__)
+
+
+class MemoryCacheHandler(cache.CementAsyncCacheHandler):
+
+    """
+    This class implements the :ref:`IAsyncCache <cement.core.cache>`
+    interface.  It provides an in-process, thread safe, LRU caching
+    interface.
+    """
+
+    class Meta:
+
+        """Handler meta-data."""
+
+        interface = cache.ICache
+        label = 'memory'
+        memoize_codec = None
+        config_defaults = dict(
+            expire_time=0,
+            max_entries=0,
+        )
+        config_schema = dict(
+            expire_time=int,
+            max_entries=int,
+        )
+
+    def __init__(self, *args, **kw):
+        super(MemoryCacheHandler, self).__init__(*args, **kw)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._evictions = 0
+
+    def _config(self, key):
+        """
+        This is a simple wrapper, and is equivalent to:
+        ``self.app.config.get('cache.memory', <key>)``.
+
+        :param key: The key to get a config value from the 'cache.memory'
+         config section.
+        :returns: The value of the given key.
+
+        """
+        return self.app.config.get(self._meta.config_section, key)
+
+    def _backend_stats(self):
+        return dict(evictions=self._evictions, entries=len(self._data))
+
+    def get(self, key, fallback=None, **kw):
+        """
+        Get a value from the cache.  Additional keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: The value of the item in the cache, or the `fallback` value.
+
+        """
+        LOG.debug("getting cache value using key '%s'" % key)
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return fallback
+
+            value, expires = item
+            if expires and expires <= now():
+                del self._data[key]
+                return fallback
+
+            # mark as most recently used
+            del self._data[key]
+            self._data[key] = item
+            return value
+
+    def set(self, key, value, time=None, **kw):
+        """
+        Set a value in the cache for the given ``key``.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached.
+         Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: ``None``
+
+        """
+        if time is None:
+            time = self._config_typed('expire_time')
+        max_entries = self._config_typed('max_entries')
+        expires = now() + time if time else None
+
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (value, expires)
+            while max_entries and len(self._data) > max_entries:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key, **kw):
+        """
+        Delete an item from the cache for the given ``key``.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key to delete from the cache.
+        :returns: ``None``
+
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def purge(self, **kw):
+        """
+        Purge the entire cache, all keys and values will be lost.  Additional
+        keyword arguments are ignored.
+
+        :returns: ``None``
+
+        """
+        with self._lock:
+            self._data.clear()
+
+    def aget(self, key, fallback=None, **kw):
+        """
+        Get a value from the cache from a coroutine.  The in-process cache
+        never blocks, so the value is looked up immediately.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: An awaitable resolving to the value of the item in the
+         cache, or the `fallback` value.
+
+        """
+        return cache._completed(self.get(key, fallback, **kw))
+
+    def aset(self, key, value, time=None, **kw):
+        """
+        Set a value in the cache for the given ``key`` from a coroutine.
+        Additional keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached.
+         Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: An awaitable.
+
+        """
+        return cache._completed(self.set(key, value, time, **kw))
+
+    def adelete(self, key, **kw):
+        """
+        Delete an item from the cache for the given ``key`` from a
+        coroutine.  Additional keyword arguments are ignored.
+
+        :param key: The key to delete from the cache.
+        :returns: An awaitable.
+
+        """
+        return cache._completed(self.delete(key, **kw))
+
+    def apurge(self, **kw):
+        """
+        Purge the entire cache from a coroutine, all keys and values will be
+        lost.  Additional keyword arguments are ignored.
+
+        :returns: An awaitable.
+
+        """
+        return cache._completed(self.purge(**kw))
+
+
+def load(app):
+    app.handler.register(MemoryCacheHandler)
@@ -23,11 +23,10 @@ For usage information see :ref:`application_plugins`.
 
 import os
 import sys
-import glob
 import imp
 from ..core import plugin, exc
-from ..utils.misc import is_true, minimal_logger
-from ..utils.fs import abspath
+from ..utils.misc import is_true, minimal_logger, parallel_map
+from ..utils.fs import abspath, list_files
 
 LOG = minimal_logger(__name__)
 
@@ -82,20 +81,24 @@ class CementPluginHandler(plugin.CementPluginHandler):
                           config_dir)
                 continue
             else:
-                # sort so that we always load plugins in the same order
+                # sorted so that we always load plugins in the same order
                 # regardless of OS (seems some don't sort reliably)
-                path = "%s/*%s" % (config_dir,
-                                   self.app._meta.config_extension)
-                plugin_config_files = glob.glob(path)
-                plugin_config_files.sort()
+                plugin_config_files = list_files(
+                    config_dir, self.app._meta.config_extension,
+                    hidden=False)
 
-                for config in plugin_config_files:
-                    config = os.path.abspath(os.path.expanduser(config))
+                def parse_plugin_config(config):
                     LOG.debug("loading plugin config from '%s'." % config)
                     pconfig = config_handler()
                     pconfig._setup(self.app)
                     pconfig.parse_file(config)
+                    return pconfig
 
+                # parse in parallel, but process in order
+                pconfigs = parallel_map(parse_plugin_config,
+                                        plugin_config_files)
+
+                for config, pconfig in zip(plugin_config_files, pconfigs):
                     if not pconfig.get_sections():
                         LOG.debug("config file '%s' has no sections." %
                                   config)
@@ -18,6 +18,28 @@ under a ``[cache.redis]`` section in any configuration file:
     * **host** - Redis server.
     * **port** - Redis port.
     * **db** - Redis database number.
+    * **max_connections** - Maximum number of connections kept in the
+      connection pool.  Default: None (unlimited).
+    * **socket_timeout** - Time in seconds to wait on a socket operation.
+      Default: None (wait forever).
+    * **socket_connect_timeout** - Time in seconds to wait when connecting.
+      Default: None (wait forever).
+    * **socket_keepalive** - Whether to enable TCP keepalive on pooled
+      connections.  Default: False.
+    * **codec** - Serialize values with one of ``pickle``, ``json``,
+      ``msgpack`` (requires ``msgpack``), or ``marshal`` before storing them.
+      Default: None (values must be ``str`` or ``bytes``).
+    * **compression** - Compress encoded values larger than
+      ``compress_threshold`` with ``zlib`` or ``lz4`` (requires ``lz4``).
+      Default: None.
+    * **compress_threshold** - Size in bytes above which encoded values are
+      compressed.  Default: 1024.
+    * **track_stats** - Track hits, misses, bytes transferred, and latency
+      (see ``app.cache.stats()``).  Stats are logged on close in debug mode.
+      Default: False.
+
+Connections are drawn from a single connection pool that is shared across
+threads, and the pool is disconnected in a ``pre_close`` hook.
 
 
 Configurations can be passed as defaults to a CementApp:
@@ -66,6 +88,21 @@ the following:
     # Redis database number
     db = 0
 
+    # maximum number of pooled connections
+    max_connections = 10
+
+    # socket timeouts in seconds
+    socket_timeout = 5
+    socket_connect_timeout = 5
+
+    # enable tcp keepalive
+    socket_keepalive = true
+
+    # serialize values as json, and zlib compress those over 1KB
+    codec = json
+    compression = zlib
+    compress_threshold = 1024
+
 
 Usage
 -----
@@ -107,11 +144,20 @@ Usage
 """
 
 import redis
+from time import sleep, time as now
 from ..core import cache
-from ..utils.misc import minimal_logger
+from ..utils.misc import minimal_logger, rando
 
 LOG = minimal_logger(__name__)
 
+# compare-and-delete so that a lock is only released by its owner
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
 
 class RedisCacheHandler(cache.CementCacheHandler):
 
@@ -134,21 +180,63 @@ class RedisCacheHandler(cache.CementCacheHandler):
         label = 'redis'
         config_defaults = dict(
             hosts='127.0.0.1',
+            host='127.0.0.1',
             port=6379,
             db=0,
             expire_time=0,
+            max_connections=None,
+            socket_timeout=None,
+            socket_connect_timeout=None,
+            socket_keepalive=False,
+        )
+        config_schema = dict(
+            port=dict(type=int, default=6379),
+            db=dict(type=int, default=0),
+            expire_time=int,
+            socket_keepalive=dict(type=bool, default=False),
         )
 
     def __init__(self, *args, **kw):
         super(RedisCacheHandler, self).__init__(*args, **kw)
         self.mc = None
+        self.r = None
+        self.pool = None
 
     def _setup(self, *args, **kw):
         super(RedisCacheHandler, self)._setup(*args, **kw)
-        self.r = redis.StrictRedis(
+        self.pool = redis.ConnectionPool(**self._get_pool_kwargs())
+        self.r = redis.StrictRedis(connection_pool=self.pool)
+
+    def _get_pool_kwargs(self):
+        """
+        Build the connection pool keyword arguments from the handler config.
+
+        :returns: ``dict``
+
+        """
+        return dict(
             host=self._config('host', default='127.0.0.1'),
-            port=self._config('port', default=6379),
-            db=self._config('db', default=0))
+            port=self._config_typed('port'),
+            db=self._config_typed('db'),
+            max_connections=self._config_number('max_connections', int),
+            socket_timeout=self._config_number('socket_timeout', float),
+            socket_connect_timeout=self._config_number(
+                'socket_connect_timeout', float),
+            socket_keepalive=self._config_typed('socket_keepalive'),
+        )
+
+    def _get_expire_time(self, time):
+        if time is None:
+            time = self._config_typed('expire_time')
+        return time
+
+    def _decode_result(self, res, fallback):
+        if res is None:
+            return fallback
+        elif self._codec is None and not self._is_encoded(res):
+            return res.decode('utf-8')
+        else:
+            return self._decode(res)
 
     def _config(self, key, default=None):
         """
@@ -157,10 +245,70 @@ class RedisCacheHandler(cache.CementCacheHandler):
 
         :param key: The key to get a config value from the 'cache.redis'
          config section.
+        :param default: The value to return if ``key`` is not set.
         :returns: The value of the given key.
 
         """
-        return self.app.config.get(self._meta.config_section, key)
+        section = self._meta.config_section
+        if key not in self.app.config.keys(section):
+            return default
+        return self.app.config.get(section, key)
+
+    def _config_number(self, key, type_func):
+        # values parsed from config files are strings, and 'None' disables
+        # the setting
+        value = self._config(key)
+        if value in [None, '', 'None']:
+            return None
+        return type_func(value)
+
+    def close(self):
+        """
+        Disconnect all connections in the connection pool.
+
+        :returns: ``None``
+
+        """
+        if self.pool is not None:
+            LOG.debug('disconnecting redis connection pool')
+            self.pool.disconnect()
+
+    def _acquire_lock(self, key, timeout, blocking=True):
+        """
+        Acquire a distributed single-flight lock using ``SET NX``, so that
+        only one process (across all hosts) computes a memoized value.  The
+        lock expires after ``timeout`` seconds in case its owner dies.
+
+        :param key: The lock key.
+        :param timeout: Time (in seconds) after which the lock expires.
+        :param blocking: Whether to wait (up to ``timeout``) for the lock.
+        :returns: A lock token if acquired, ``None`` otherwise.
+
+        """
+        token = rando()
+        expire = now() + timeout
+        while True:
+            if self.r.set(key, token, nx=True, px=int(timeout * 1000)):
+                return token
+            if not blocking or now() >= expire:
+                return None
+            sleep(0.05)
+
+    def _release_lock(self, key, token):
+        """
+        Release a lock acquired by ``_acquire_lock()`` (only if it is still
+        owned by ``token``).
+
+        :param key: The lock key.
+        :param token: The token returned by ``_acquire_lock()``.
+        :returns: ``None``
+
+        """
+        self.r.eval(RELEASE_LOCK_SCRIPT, 1, key, token)
+
+    def _backend_stats(self):
+        info = self.r.info('stats')
+        return dict(evictions=info.get('evicted_keys'))
 
     def get(self, key, fallback=None, **kw):
         """
@@ -174,10 +322,7 @@ class RedisCacheHandler(cache.CementCacheHandler):
         """
         LOG.debug("getting cache value using key '%s'" % key)
         res = self.r.get(key)
-        if res is None:
-            return fallback
-        else:
-            return res.decode('utf-8')
+        return self._decode_result(res, fallback)
 
     def set(self, key, value, time=None, **kw):
         """
@@ -192,9 +337,8 @@ class RedisCacheHandler(cache.CementCacheHandler):
         :returns: ``None``
 
         """
-        if time is None:
-            time = int(self._config('expire_time'))
-
+        time = self._get_expire_time(time)
+        value = self._encode(value)
         if time == 0:
             self.r.set(key, value)
         else:
@@ -225,5 +369,18 @@ class RedisCacheHandler(cache.CementCacheHandler):
             self.r.delete(*keys)
 
 
+def redis_pre_close(app):
+    """
+    This is a ``pre_close`` hook that drains the redis connection pool if
+    the application's cache handler is the ``RedisCacheHandler``.
+
+    :param app: The application object.
+
+    """
+    if isinstance(app.cache, RedisCacheHandler):
+        app.cache.close()
+
+
 def load(app):
     app.handler.register(RedisCacheHandler)
+    app.hook.register('pre_close', redis_pre_close)
@@ -0,0 +1,263 @@
+"""
+The Redis Async Extension provides application caching and key/value store
+support via Redis, usable from both synchronous code and ``asyncio``
+coroutines without blocking the event loop.
+
+Requirements
+------------
+
+ * Python 3.7+
+ * redis >= 4.2 (``pip install redis``)
+
+Configuration
+-------------
+
+This extension shares the ``[cache.redis]`` config section (and all of its
+settings) with the :ref:`Redis <cement.ext.ext_redis>` extension.  The
+async client uses its own connection pool (configured with the same
+``max_connections``, timeouts, etc), created lazily the first time an
+async method is awaited on a given event loop.  The pool of the previous
+event loop (if any) is disconnected when a new one is created.
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+    from cement.utils.misc import init_defaults
+
+    defaults = init_defaults('myapp', 'cache.redis')
+    defaults['cache.redis']['host'] = '127.0.0.1'
+    defaults['cache.redis']['port'] = 6379
+    defaults['cache.redis']['max_connections'] = 10
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            config_defaults = defaults
+            extensions = ['redis_async']
+            cache_handler = 'redis_async'
+
+
+Usage
+-----
+
+.. code-block:: python
+
+    import asyncio
+
+    async def work(app):
+        await app.cache.aset('my_key', 'my value')
+        value = await app.cache.aget('my_key')
+        await app.cache.adelete('my_key')
+        await app.cache.aclose()
+
+    with MyApp() as app:
+        app.run()
+
+        # synchronous calls are still available
+        app.cache.set('my_key', 'my value')
+
+        asyncio.run(work(app))
+
+"""
+
+import asyncio
+import threading
+import redis.asyncio as aioredis
+from ..core import cache
+from ..utils.misc import minimal_logger
+from .ext_redis import RedisCacheHandler
+
+LOG = minimal_logger(__name__)
+
+
+class AsyncRedisCacheHandler(RedisCacheHandler,
+                             cache.CementAsyncCacheHandler):
+
+    """
+    This class implements the :ref:`IAsyncCache <cement.core.cache>`
+    interface.  It provides both the synchronous caching interface of the
+    ``RedisCacheHandler``, and native async variants using
+    ``redis.asyncio``.
+
+    **Note** This extension has an external dependency on ``redis``.  You
+    must include ``redis`` in your applications dependencies as Cement
+    explicitly does *not* include external dependencies for optional
+    extensions.
+    """
+
+    class Meta:
+
+        """Handler meta-data."""
+
+        interface = cache.ICache
+        label = 'redis_async'
+        config_section = 'cache.redis'
+
+    def __init__(self, *args, **kw):
+        super(AsyncRedisCacheHandler, self).__init__(*args, **kw)
+        self.ar = None
+        self.async_pool = None
+        self._async_loop = None
+
+    def _async_client(self):
+        """
+        Return the async redis client, creating it (and its connection
+        pool) if this is the first use on the running event loop.  Async
+        connections are bound to the loop that created them.
+
+        :returns: ``redis.asyncio.Redis``
+
+        """
+        loop = asyncio.get_event_loop()
+        if self.ar is None or self._async_loop is not loop:
+            self._release_async_pool()
+            LOG.debug('creating async redis connection pool')
+            self.async_pool = aioredis.ConnectionPool(
+                **self._get_pool_kwargs())
+            self.ar = aioredis.Redis(connection_pool=self.async_pool)
+            self._async_loop = loop
+        return self.ar
+
+    def _release_async_pool(self):
+        """
+        Disconnect the async connection pool (if any) on the event loop it
+        was created on, i.e. when the pool is replaced or the handler is
+        closed outside of that loop.  If that loop is running (in another
+        thread) the pool is disconnected on it, if it is stopped it is run
+        (in a helper thread) until the pool is disconnected, and if it is
+        closed there is nothing left to disconnect with.
+
+        :returns: ``None``
+
+        """
+        pool = self.async_pool
+        loop = self._async_loop
+        self.ar = None
+        self.async_pool = None
+        self._async_loop = None
+        if pool is None:
+            return
+
+        LOG.debug('releasing async redis connection pool')
+        if loop is None or loop.is_closed():
+            LOG.debug('event loop of the async redis connection pool is ' +
+                      'closed, not disconnecting it')
+            return
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(pool.disconnect(), loop)
+            return
+
+        # a stopped loop can not be run from within another running loop,
+        # so it is run in a thread of its own
+        def disconnect():
+            try:
+                loop.run_until_complete(pool.disconnect())
+            except Exception as e:
+                LOG.debug('unable to disconnect async redis connection ' +
+                          'pool: %s' % e)
+
+        thread = threading.Thread(target=disconnect)
+        thread.start()
+        thread.join()
+
+    async def aget(self, key, fallback=None, **kw):
+        """
+        Get a value from the cache.  Additional keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to get.
+        :param fallback: The value to return if the item is not found in the
+         cache.
+        :returns: The value of the item in the cache, or the `fallback` value.
+
+        """
+        LOG.debug("getting cache value using key '%s'" % key)
+        res = await self._async_client().get(key)
+        return self._decode_result(res, fallback)
+
+    async def aset(self, key, value, time=None, **kw):
+        """
+        Set a value in the cache for the given ``key``.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key of the item in the cache to set.
+        :param value: The value of the item to set.
+        :param time: The expiration time (in seconds) to keep the item cached.
+         Defaults to `expire_time` as defined in the applications
+         configuration.
+        :returns: ``None``
+
+        """
+        time = self._get_expire_time(time)
+        value = self._encode(value)
+        if time == 0:
+            await self._async_client().set(key, value)
+        else:
+            await self._async_client().setex(key, time, value)
+
+    async def adelete(self, key, **kw):
+        """
+        Delete an item from the cache for the given ``key``.  Additional
+        keyword arguments are ignored.
+
+        :param key: The key to delete from the cache.
+        :returns: ``None``
+
+        """
+        await self._async_client().delete(key)
+
+    async def apurge(self, **kw):
+        """
+        Purge the entire cache, all keys and values will be lost.  Additional
+        keyword arguments are ignored.
+
+        :returns: ``None``
+
+        """
+        client = self._async_client()
+        keys = await client.keys('*')
+        if keys:
+            await client.delete(*keys)
+
+    async def aclose(self):
+        """
+        Disconnect all connections in the async connection pool.  Must be
+        awaited on the event loop that used them.
+
+        :returns: ``None``
+
+        """
+        if self.async_pool is not None:
+            LOG.debug('disconnecting async redis connection pool')
+            await self.async_pool.disconnect()
+        self.ar = None
+        self.async_pool = None
+        self._async_loop = None
+
+    def close(self):
+        """
+        Disconnect the synchronous connection pool, and release the async
+        connection pool (see ``aclose()`` to disconnect it from within the
+        event loop).
+
+        :returns: ``None``
+
+        """
+        super(AsyncRedisCacheHandler, self).close()
+        self._release_async_pool()
+
+
+def redis_async_pre_close(app):
+    """
+    This is a ``pre_close`` hook that drains the redis connection pool if
+    the application's cache handler is the ``AsyncRedisCacheHandler``.
+
+    :param app: The application object.
+
+    """
+    if isinstance(app.cache, AsyncRedisCacheHandler):
+        app.cache.close()
+
+
+def load(app):
+    app.handler.register(AsyncRedisCacheHandler)
+    app.hook.register('pre_close', redis_async_pre_close)
@@ -24,10 +24,17 @@ Features
    reloaded if modified.
  * Application plugin configuration files (Anything found in
    (``CementApp.Meta.plugin_config_dirs``) are reloaded if modified.
+ * Application configuration directories (``CementApp.Meta.config_dirs``,
+   i.e. ``conf.d``) are watched, including files added after startup.
+ * Bursts of modifications (i.e. from editors or configuration management
+   tools) are coalesced into a single reload.
  * The framework calls ``CementApp.config.parse_file()`` on any watched files
    once the kernel has signaled a modification.
  * New configurations settings are accessible via ``CementApp.config`` nearly
    immediately once the kernel (inotify) picks up the change.
+ * Files are fully merged before the new settings are published to
+   ``CementApp.config.snapshot()``, so threads reading from a snapshot never
+   see a partially reloaded configuration.
  * Provides a ``pre_reload_config`` and ``post_reload_config`` hook so that
    applications can tie into the event and perform operations any time a
    configuration file is modified.
@@ -52,7 +59,13 @@ Limitations
 Configuration
 -------------
 
-This extension does not currently honor any configuration settings.
+This extension honors the following config settings under a
+``[reload_config]`` section in any configuration file:
+
+    * **debounce** - The time (in seconds) to wait for further modifications
+      before reloading.  All files modified within the window are reloaded
+      together, and hooks are run once.  A value of ``0`` reloads on every
+      modification.  Default: ``0.5``
 
 
 Hooks
@@ -78,13 +91,17 @@ post_reload_config
 
 Run right after any framework actions are performed once modifications to any
 of the watched files are detected.  Expects a single argument, which is the
-``app`` object, and does not expect anything in return.
+``app`` object, and does not expect anything in return.  The settings that
+changed are available as ``app.config_diff``, a dictionary in the form of
+``{section: {key: (old_value, new_value)}}`` (``old_value`` being ``None``
+for new settings).
 
 .. code-block:: python
 
     def my_post_reload_config_hook(app):
-        # do something with app?
-        pass
+        if 'database' in app.config_diff:
+            # only reconnect if the database settings changed
+            reconnect(app)
 
 
 Usage
@@ -182,35 +199,140 @@ or any other configuration file is modified (spaces added for clarity):
 
 import os
 import signal
+import threading
 import pyinotify
 from ..utils.misc import minimal_logger
 from ..utils import fs
 
 LOG = minimal_logger(__name__)
-MASK = pyinotify.IN_CLOSE_WRITE
+
+# editors commonly save by writing a temporary file and renaming it
+MASK = pyinotify.IN_CLOSE_WRITE | pyinotify.IN_MOVED_TO
 NOTIFIER = None
+EVENT_HANDLER = None
+
+
+def config_diff(before, after):
+    """
+    Compare two config dictionaries (i.e. from ``app.config.get_dict()``)
+    and return the settings that were added or changed.
+
+    :param before: The config dictionary before the change.
+    :param after: The config dictionary after the change.
+    :returns: A dictionary of ``{section: {key: (old_value, new_value)}}``.
+
+    """
+    diff = dict()
+    for section, items in after.items():
+        old_items = before.get(section, {})
+        for key, value in items.items():
+            if key not in old_items or old_items[key] != value:
+                diff.setdefault(section, {})[key] = (old_items.get(key),
+                                                     value)
+    return diff
 
 
 class ConfigEventHandler(pyinotify.ProcessEvent):
 
-    def __init__(self, app, watched_files, **kw):
+    def __init__(self, app, watched_files, watched_config_dirs=None,
+                 debounce=0, **kw):
         self.app = app
         self.watched_files = watched_files
+        self.watched_config_dirs = watched_config_dirs or []
+        self.debounce = debounce
+        self._pending = set()
+        self._timer = None
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
         super(ConfigEventHandler, self).__init__()
 
+    def is_watched(self, path):
+        if path in self.watched_files:
+            return True
+        return os.path.dirname(path) in self.watched_config_dirs and \
+            path.endswith(self.app._meta.config_extension)
+
+    def _precedence(self, path):
+        # reload files in the same order they are parsed on startup
+        # (config dirs first, then config files and plugin configs)
+        _dir = os.path.dirname(path)
+        if _dir in self.watched_config_dirs and \
+                path not in self.watched_files:
+            return (0, self.watched_config_dirs.index(_dir), path)
+        return (1, self.watched_files.index(path), path)
+
     def process_default(self, event):
-        if event.pathname in self.watched_files:
-            LOG.debug('config path modified: mask=%s, path=%s' %
-                      (event.maskname, event.pathname))
+        if not self.is_watched(event.pathname):
+            return
+
+        LOG.debug('config path modified: mask=%s, path=%s' %
+                  (event.maskname, event.pathname))
+        with self._lock:
+            self._pending.add(event.pathname)
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.debounce > 0:
+                self._timer = threading.Timer(self.debounce, self.reload)
+                self._timer.daemon = True
+                self._timer.start()
+                return
+        self.reload()
+
+    def reload(self):
+        """
+        Re-parse all modified files (in startup precedence order), and run
+        the ``pre_reload_config`` and ``post_reload_config`` hooks once.  If
+        any config dir file was modified, the watched config files are also
+        re-parsed so that they still take precedence over it.
+
+        """
+        with self._reload_lock:
+            with self._lock:
+                paths = set(self._pending)
+                self._pending = set()
+                self._timer = None
+
+            if not paths:
+                return
+
+            # config files take precedence over config dir files, so they
+            # are re-parsed after any config dir file
+            if [p for p in paths if self._precedence(p)[0] == 0]:
+                paths.update([p for p in self.watched_files
+                              if os.path.exists(p)])
+            paths = sorted(paths, key=self._precedence)
+
             for res in self.app.hook.run('pre_reload_config', self.app):
                 pass
-            self.app.config.parse_file(event.pathname)
+
+            before = self.app.config.get_dict()
+            for path in paths:
+                self.app.config.parse_file(path)
+
+            # environment variables still take precedence over files
+            self.app._merge_config_env()
+            diff = config_diff(before, self.app.config.get_dict())
+            LOG.debug('reloaded config from %s: %s' % (paths, diff))
+
+            self.app.config_diff = diff
             for res in self.app.hook.run('post_reload_config', self.app):
                 pass
 
+    def cancel(self):
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._pending = set()
+
 
 def spawn_watcher(app):
-    global NOTIFIER
+    global NOTIFIER, EVENT_HANDLER
+
+    app.config.merge(dict(reload_config=dict(debounce=0.5)), override=False)
+    if hasattr(app.config, 'add_schema'):
+        app.config.add_schema(dict(reload_config=dict(debounce=float)))
 
     # directories to tell inotify to watch
     watched_dirs = []
@@ -218,6 +340,9 @@ def spawn_watcher(app):
     # files to actual perform actions on
     watched_files = []
 
+    # config dirs (conf.d) whose files are all watched
+    watched_config_dirs = []
+
     # watch manager
     wm = pyinotify.WatchManager()
 
@@ -243,6 +368,16 @@ def spawn_watcher(app):
             if full_plugin_path not in watched_files:
                 watched_files.append(full_plugin_path)
 
+    for config_dir in app._meta.config_dirs:
+        config_dir = fs.abspath(config_dir)
+        if not os.path.isdir(config_dir):
+            continue
+
+        if config_dir not in watched_config_dirs:
+            watched_config_dirs.append(config_dir)
+        if config_dir not in watched_dirs:
+            watched_dirs.append(config_dir)
+
     for path in app._meta.config_files:
         if os.path.exists(path):
             if path not in watched_files:
@@ -256,25 +391,36 @@ def spawn_watcher(app):
         wm.add_watch(path, MASK, rec=True)
 
     # event handler
-    eh = ConfigEventHandler(app, watched_files)
+    if hasattr(app.config, 'get_typed'):
+        debounce = app.config.get_typed('reload_config', 'debounce')
+    else:
+        debounce = float(app.config.get('reload_config', 'debounce'))
+    EVENT_HANDLER = ConfigEventHandler(app, watched_files,
+                                       watched_config_dirs=watched_config_dirs,
+                                       debounce=debounce)
 
     # notifier
-    NOTIFIER = pyinotify.ThreadedNotifier(wm, eh)
+    NOTIFIER = pyinotify.ThreadedNotifier(wm, EVENT_HANDLER)
     NOTIFIER.start()
 
 
 def kill_watcher(app):
-    if NOTIFIER.isAlive():
+    if EVENT_HANDLER is not None:
+        EVENT_HANDLER.cancel()
+    if NOTIFIER.is_alive():
         NOTIFIER.stop()
 
 
 def signal_handler(app, signum, frame):
     if signum in [signal.SIGTERM, signal.SIGINT]:
-        if NOTIFIER.isAlive():
+        if EVENT_HANDLER is not None:
+            EVENT_HANDLER.cancel()
+        if NOTIFIER.is_alive():
             NOTIFIER.stop()
 
 
 def load(app):
+    app.extend('config_diff', dict())
     app.hook.define('pre_reload_config')
     app.hook.define('post_reload_config')
     app.hook.register('pre_run', spawn_watcher)
@@ -0,0 +1,337 @@
+"""
+The Shell Extension provides an interactive shell that runs application
+commands without exiting, so that the application (and its controllers and
+argument parsers) are only setup once per session.  Each line is parsed and
+dispatched by the :class:`cement.ext.ext_argparse.ArgparseController`
+parser tree that was already built to run the ``shell`` command, and
+:py:mod:`readline` (if available) provides command history, and tab
+completion of commands and options.
+
+Requirements
+------------
+
+ * Application controllers based on
+   :class:`cement.ext.ext_argparse.ArgparseController`
+ * History and completion require :py:mod:`readline` (not available on
+   Windows)
+
+
+Configuration
+-------------
+
+The shell extension is configurable with the following settings under the
+``[shell]`` section.
+
+    * **prompt** - The prompt to display.
+      Default: ``<app_label>> ``
+    * **history_file** - The filesystem path to store command history in.
+      Default: ``~/.<app_label>_history``
+    * **history_length** - The maximum number of commands to store in the
+      history file.
+      Default: 1000
+
+
+Usage
+-----
+
+.. code-block:: python
+
+    from cement.core.foundation import CementApp
+    from cement.ext.ext_argparse import ArgparseController, expose
+
+
+    class BaseController(ArgparseController):
+        class Meta:
+            label = 'base'
+
+        @expose(
+            arguments=[
+                (['--name'], dict(help='who to greet', default='world')),
+            ],
+            help='say hello',
+        )
+        def hello(self):
+            print('Hello %s!' % self.app.pargs.name)
+
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['shell']
+            handlers = [BaseController]
+
+
+    with MyApp() as app:
+        app.run()
+
+
+Looks like:
+
+.. code-block:: console
+
+    $ python myapp.py shell
+    myapp> hello --name john
+    Hello john!
+    myapp> hel<TAB>
+    myapp> hello --<TAB>
+    --help  --name
+    myapp> exit
+
+Type ``exit``, ``quit``, or ``Ctrl-D`` to leave the shell.  ``Ctrl-C``
+cancels the current line (or running command).
+
+"""
+
+import os
+import sys
+import shlex
+import signal
+import traceback
+from argparse import SUPPRESS, _SubParsersAction
+from ..core.exc import CaughtSignal
+from ..ext.ext_argparse import ArgparseController, expose
+from ..utils.misc import minimal_logger
+from ..utils import fs
+
+if sys.version_info[0] < 3:
+    input = raw_input   # pragma: nocover  # noqa
+
+LOG = minimal_logger(__name__)
+
+EXIT_COMMANDS = ['exit', 'quit']
+
+
+class ShellController(ArgparseController):
+
+    """
+    This class implements the :ref:`IController <cement.core.controller>`
+    interface, and adds a ``shell`` command (embedded in the ``base``
+    controller) that starts an interactive shell.
+
+    """
+
+    class Meta:
+
+        """Controller meta-data."""
+
+        label = 'shell'
+        stacked_on = 'base'
+        stacked_type = 'embedded'
+        config_section = 'shell'
+        config_defaults = dict(
+            prompt=None,
+            history_file=None,
+            history_length=1000,
+        )
+
+    def __init__(self, *args, **kw):
+        super(ShellController, self).__init__(*args, **kw)
+        self._running = False
+        self._readline = None
+        self._matches = []
+
+    def _read_line(self, prompt):
+        """
+        Read a line of input from the user.
+
+        :param prompt: The prompt to display.
+        :returns: The line of input (``str``).
+        :raises: ``EOFError`` when there is no more input (``Ctrl-D``).
+
+        """
+        return input(prompt)
+
+    def _get_completions(self, line, text):
+        """
+        Return the commands and options of the controller tree that start
+        with ``text``, given the ``line`` preceding it.
+
+        :param line: The input line preceding the word being completed.
+        :param text: The word being completed.
+        :returns: A sorted list of matches.
+
+        """
+        try:
+            words = shlex.split(line)
+        except ValueError:
+            words = line.split()
+
+        # walk down the parser tree to the current (sub-)command
+        parser = self.app.args
+        skip = 0
+        for word in words:
+            if skip > 0:
+                skip -= 1
+                continue
+            elif word.startswith('-'):
+                action = parser._option_string_actions.get(word)
+                if action is not None and action.nargs is None:
+                    skip = 1
+                elif action is not None and isinstance(action.nargs, int):
+                    skip = action.nargs
+                continue
+
+            for action in parser._actions:
+                if isinstance(action, _SubParsersAction) and \
+                        word in action.choices:
+                    parser = action.choices[word]
+                    break
+
+        candidates = []
+        if parser is self.app.args:
+            candidates.extend(EXIT_COMMANDS)
+
+        for action in parser._actions:
+            if isinstance(action, _SubParsersAction):
+                candidates.extend(action.choices.keys())
+            elif action.help != SUPPRESS:
+                candidates.extend(action.option_strings)
+
+        return sorted(set([c for c in candidates if c.startswith(text)]))
+
+    def _complete(self, text, state):
+        # readline completer
+        if state == 0:
+            line = self._readline.get_line_buffer()
+            line = line[:self._readline.get_begidx()]
+            self._matches = self._get_completions(line, text)
+
+        if state < len(self._matches):
+            return self._matches[state]
+        return None
+
+    def _get_history_file(self):
+        history_file = self.app.config.get('shell', 'history_file')
+        if history_file is None:
+            history_file = '~/.%s_history' % self.app._meta.label
+        return fs.abspath(history_file)
+
+    def _setup_readline(self):
+        try:
+            import readline
+        except ImportError:     # pragma: nocover
+            LOG.debug('readline is not available, command history and ' +
+                      'completion are disabled')    # pragma: nocover
+            return None         # pragma: nocover
+
+        readline.set_history_length(
+            int(self.app.config.get('shell', 'history_length')))
+        history_file = self._get_history_file()
+        if os.path.exists(history_file):
+            try:
+                readline.read_history_file(history_file)
+            except (IOError, OSError) as e:
+                LOG.debug("unable to read history file '%s': %s" %
+                          (history_file, e))
+
+        self._saved_completer = readline.get_completer()
+        self._saved_delims = readline.get_completer_delims()
+        readline.set_completer(self._complete)
+        readline.set_completer_delims(' \t\n')
+        if 'libedit' in (readline.__doc__ or ''):
+            readline.parse_and_bind('bind ^I rl_complete')  # pragma: nocover
+        else:
+            readline.parse_and_bind('tab: complete')
+        return readline
+
+    def _teardown_readline(self):
+        readline = self._readline
+        readline.set_completer(self._saved_completer)
+        readline.set_completer_delims(self._saved_delims)
+
+        history_file = self._get_history_file()
+        try:
+            readline.write_history_file(history_file)
+        except (IOError, OSError) as e:
+            LOG.debug("unable to write history file '%s': %s" %
+                      (history_file, e))
+
+    def _run_command(self, controllers, argv):
+        """
+        Parse and dispatch a single command, with the per command state of
+        the application (parsed arguments, ``argv``, ``exit_code`` and last
+        rendered output) reset.
+
+        :param controllers: The controllers that were built.
+        :param argv: The command line arguments of the command.
+        :returns: The return value of the controller function.
+
+        """
+        self.app._meta.argv = argv
+        self.app._parsed_args = None
+        self.app._last_rendered = None
+        self.app.exit_code = 0
+
+        try:
+            return self.app.controller._dispatch_controllers(controllers)
+        except SystemExit as e:
+            # argparse already printed the error (or --help)
+            if isinstance(e.code, int):
+                self.app.exit_code = e.code
+        except CaughtSignal as e:
+            if e.signum != signal.SIGINT:
+                raise
+            print('')
+            self.app.exit_code = 1
+        except Exception as e:
+            if self.app.debug is True:
+                traceback.print_exc()
+            self.app.log.error(str(e))
+            self.app.exit_code = 1
+
+    @expose(help='start an interactive shell')
+    def shell(self):
+        if self._running is True:
+            LOG.debug('already running an interactive shell')
+            return
+
+        # build any controllers that were not (i.e. lazy parsers), once
+        base = self.app.controller
+        controllers = base._build_controllers(base._controllers,
+                                              list(base._built_controllers))
+
+        prompt = self.app.config.get('shell', 'prompt')
+        if prompt is None:
+            prompt = '%s> ' % self.app._meta.label
+
+        saved_argv = self.app._meta.argv
+        self._readline = self._setup_readline()
+        self._running = True
+        try:
+            while True:
+                try:
+                    line = self._read_line(prompt)
+                except EOFError:
+                    print('')
+                    break
+                except KeyboardInterrupt:
+                    print('')
+                    continue
+                except CaughtSignal as e:
+                    if e.signum != signal.SIGINT:
+                        raise
+                    print('')
+                    continue
+
+                try:
+                    argv = shlex.split(line)
+                except ValueError as e:
+                    self.app.log.error(str(e))
+                    continue
+
+                if not argv:
+                    continue
+                elif argv[0] in EXIT_COMMANDS:
+                    break
+
+                self._run_command(controllers, argv)
+        finally:
+            self._running = False
+            self.app._meta.argv = saved_argv
+            self.app.exit_code = 0
+            if self._readline is not None:
+                self._teardown_readline()
+
+
+def load(app):
+    app.handler.register(ShellController)
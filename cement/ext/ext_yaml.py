@@ -15,6 +15,28 @@ Configuration
 
 This extension does not honor any application configuration settings.
 
+When PyYaml is built with libyaml, the C implementations
+(``CSafeLoader`` / ``CSafeDumper``) are used for parsing config files and
+rendering output, which are an order of magnitude faster than the pure
+Python ``SafeLoader`` / ``SafeDumper`` used otherwise.  Either can be
+overridden with the ``loader`` (``YamlConfigHandler``) and ``dumper``
+(``YamlOutputHandler``) meta options, as a class or the name of a class in
+the ``yaml`` module:
+
+.. code-block:: python
+
+    from cement.utils.misc import init_defaults
+
+    META = init_defaults('config.yaml', 'output.yaml')
+    META['config.yaml']['loader'] = 'FullLoader'
+    META['output.yaml']['dumper'] = 'Dumper'
+
+    class MyApp(CementApp):
+        class Meta:
+            label = 'myapp'
+            extensions = ['yaml']
+            meta_defaults = META
+
 
 Usage
 _____
@@ -65,15 +87,61 @@ See ``CementApp.Meta.handler_override_options``.
     $ python myapp.py -o yaml
     {foo: bar}
 
+Large outputs can be rendered as a stream of Yaml documents (one per item
+of an iterable, including generators), optionally written to a file as they
+are generated rather than building the entire output in memory:
+
+.. code-block:: python
+
+    def documents():
+        for item in get_many_items():
+            yield dict(item=item)
+
+    app.render(documents(), multi_document=True, stream=sys.stdout)
+
 """
 
+import sys
 import yaml
 from ..core import output
 from ..utils.misc import minimal_logger
 from ..ext.ext_configparser import ConfigParserConfigHandler
 
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # pragma: nocover
+    from yaml import SafeLoader, SafeDumper
+
 LOG = minimal_logger(__name__)
 
+if sys.version_info[0] < 3:
+    STRING_TYPES = (str, unicode)   # pragma: nocover  # noqa
+else:
+    STRING_TYPES = (str,)           # pragma: nocover
+
+
+def get_yaml_class(value, default):
+    """
+    Resolve a PyYaml ``Loader`` or ``Dumper`` class.
+
+    :param value: A class, the name of a class in the ``yaml`` module (i.e.
+     ``CSafeLoader``), or ``None``.  Names of C implementations fall back to
+     their pure Python equivalent if PyYaml is built without libyaml.
+    :param default: The class to return if ``value`` is ``None``.
+    :returns: A ``Loader`` or ``Dumper`` class.
+
+    """
+    if value is None:
+        return default
+    elif isinstance(value, STRING_TYPES):
+        value = str(value)
+        if not hasattr(yaml, value) and value.startswith('C'):
+            LOG.debug("yaml.%s is not available (no libyaml), " % value +
+                      "falling back to yaml.%s" % value[1:])
+            value = value[1:]
+        return getattr(yaml, value)
+    return value
+
 
 def suppress_output_before_run(app):
     """
@@ -146,27 +214,47 @@ class YamlOutputHandler(output.CementOutputHandler):
         #: to override the ``output_handler`` via command line options.
         overridable = True
 
+        #: The PyYaml ``Dumper`` class (or name of the class) used to render
+        #: output.  Defaults to ``CSafeDumper`` if available, otherwise
+        #: ``SafeDumper``.
+        dumper = None
+
+        #: Whether to render data as multiple Yaml documents by default (in
+        #: which case the data passed to ``render()`` must be an iterable of
+        #: documents).
+        multi_document = False
+
     def __init__(self, *args, **kw):
         super(YamlOutputHandler, self).__init__(*args, **kw)
         self.config = None
+        self._dumper = None
 
     def _setup(self, app_obj):
         self.app = app_obj
+        self._dumper = get_yaml_class(self._meta.dumper, SafeDumper)
 
     def render(self, data_dict, template=None, **kw):
         """
         Take a data dictionary and render it as Yaml output.  Note that the
         template option is received here per the interface, however this
         handler just ignores it.  Additional keyword arguments passed to
-        ``yaml.dump()``.
+        ``yaml.dump()`` (or ``yaml.dump_all()``).
 
-        :param data_dict: The data dictionary to render.
+        :param data_dict: The data dictionary to render (or an iterable of
+         documents if ``multi_document`` is ``True``).
         :keyword template: Ignored in this output handler implementation.
+        :keyword multi_document: Whether to render ``data_dict`` as multiple
+         Yaml documents.  Defaults to ``Meta.multi_document``.
+        :keyword stream: A file-like object to write the Yaml to as it is
+         generated (in which case ``None`` is returned).
         :returns: A Yaml encoded string.
         :rtype: ``str``
 
         """
         LOG.debug("rendering output as yaml via %s" % self.__module__)
+        kw.setdefault('Dumper', self._dumper)
+        if kw.pop('multi_document', self._meta.multi_document):
+            return yaml.dump_all(data_dict, **kw)
         return yaml.dump(data_dict, **kw)
 
 
@@ -188,8 +276,26 @@ class YamlConfigHandler(ConfigParserConfigHandler):
     class Meta:
         label = 'yaml'
 
+        #: The PyYaml ``Loader`` class (or name of the class) used to parse
+        #: config files.  Defaults to ``CSafeLoader`` if available,
+        #: otherwise ``SafeLoader``.
+        loader = None
+
     def __init__(self, *args, **kw):
         super(YamlConfigHandler, self).__init__(*args, **kw)
+        self._loader = get_yaml_class(self._meta.loader, SafeLoader)
+
+    def _read_file(self, file_path):
+        """
+        Parse Yaml configuration file settings from ``file_path`` and return
+        them as a dictionary (used by the parse cache).
+
+        :param file_path: The file system path to the Yaml configuration file.
+        :returns: dict
+
+        """
+        with open(file_path) as config_file:
+            return yaml.load(config_file, Loader=self._loader)
 
     def _parse_file(self, file_path):
         """
@@ -200,7 +306,7 @@ class YamlConfigHandler(ConfigParserConfigHandler):
         :returns: boolean
 
         """
-        self.merge(yaml.load(open(file_path)))
+        self.merge(self._read_file(file_path))
 
         # FIX ME: Should check that file was read properly, however if not it
         # will likely raise an exception anyhow.
@@ -56,6 +56,7 @@ Usage
 import yaml
 from ..utils.misc import minimal_logger
 from ..ext.ext_configobj import ConfigObjConfigHandler
+from ..ext.ext_yaml import get_yaml_class, SafeLoader
 
 LOG = minimal_logger(__name__)
 
@@ -83,8 +84,26 @@ class YamlConfigObjConfigHandler(ConfigObjConfigHandler):
 
         label = 'yaml_configobj'
 
+        #: The PyYaml ``Loader`` class (or name of the class) used to parse
+        #: config files.  Defaults to ``CSafeLoader`` if available,
+        #: otherwise ``SafeLoader``.
+        loader = None
+
     def __init__(self, *args, **kw):
         super(YamlConfigObjConfigHandler, self).__init__(*args, **kw)
+        self._loader = get_yaml_class(self._meta.loader, SafeLoader)
+
+    def _read_file(self, file_path):
+        """
+        Parse YAML configuration file settings from ``file_path`` and return
+        them as a dictionary (used by the parse cache).
+
+        :param file_path: The file system path to the YAML configuration file.
+        :returns: dict
+
+        """
+        with open(file_path) as config_file:
+            return yaml.load(config_file, Loader=self._loader)
 
     def _parse_file(self, file_path):
         """
@@ -95,7 +114,7 @@ class YamlConfigObjConfigHandler(ConfigObjConfigHandler):
         :returns: boolean
 
         """
-        self.merge(yaml.load(open(file_path)))
+        self.merge(self._read_file(file_path))
 
         # FIX ME: Should check that file was read properly, however if not it
         # will likely raise an exception anyhow.
@@ -49,6 +49,42 @@ def backup(path, suffix='.bak'):
     return new_path
 
 
+def list_files(path, extension=None, hidden=True):
+    """
+    List the regular files in a directory (not recursively) in a single
+    pass, sorted by file name so that the order does not depend on the
+    operating or file system.
+
+    :param path: The directory to list files from.
+    :param extension: Only list files whose name ends with this extension.
+    :param hidden: Whether to include files starting with a ``.``.
+    :returns: A sorted list of full file paths (empty if ``path`` does not
+     exist).
+    :rtype: list
+
+    """
+    paths = []
+    if not os.path.isdir(path):
+        return paths
+
+    if hasattr(os, 'scandir'):
+        entries = [(entry.name, entry.is_file())
+                   for entry in os.scandir(path)]
+    else:  # pragma: nocover
+        entries = [(name, os.path.isfile(os.path.join(path, name)))
+                   for name in os.listdir(path)]
+
+    for name, is_file in entries:
+        if not is_file:
+            continue
+        elif extension is not None and not name.endswith(extension):
+            continue
+        elif not hidden and name.startswith('.'):
+            continue
+        paths.append(os.path.join(path, name))
+    return sorted(paths)
+
+
 # Kinda dirty, but should resolve issues on Windows per #183
 if 'HOME' in os.environ:
     HOME_DIR = abspath(os.environ['HOME'])
@@ -166,6 +166,37 @@ def is_true(item):
         return False
 
 
+def parallel_map(func, items, max_workers=None):
+    """
+    Call ``func`` for every item in ``items`` using a thread pool, and return
+    the results in the same order as ``items`` (regardless of the order in
+    which the calls complete).  Calls are made sequentially if there is only
+    one item, or ``concurrent.futures`` is not available.  Exceptions raised
+    by ``func`` are re-raised.
+
+    :param func: The function to call with each item.
+    :param items: The items to call ``func`` with.
+    :param max_workers: The maximum number of threads.  Defaults to the
+     number of items (up to 32).
+    :returns: A list of results.
+    :rtype: list
+
+    """
+    items = list(items)
+    try:
+        from concurrent.futures import ThreadPoolExecutor
+    except ImportError:  # pragma: nocover
+        ThreadPoolExecutor = None
+
+    if len(items) < 2 or ThreadPoolExecutor is None:
+        return [func(item) for item in items]
+
+    if max_workers is None:
+        max_workers = min(32, len(items))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
+
+
 def wrap(text, width=77, indent='', long_words=False, hyphens=False):
     """
     Wrap text for cleaner output (this is a simple wrapper around
@@ -0,0 +1,199 @@
+"""
+Profilers used to profile controller functions (see
+``CementApp.Meta.profile``, and the ``--profile`` command line option).
+
+Usage:
+
+.. code-block:: python
+
+    from cement.utils.profile import CProfileProfiler
+
+    profiler = CProfileProfiler()
+    profiler.start()
+    try:
+        do_something()
+    finally:
+        profiler.stop()
+
+    profiler.write('/path/to/myapp.prof')
+    for row in profiler.summary(10):
+        print(row)
+
+"""
+
+import signal
+import pstats
+import cProfile
+from ..core.meta import MetaMixin
+from ..core.exc import FrameworkError
+
+
+class Profiler(MetaMixin):
+
+    """
+    Base class for profilers.  Sub-classes must implement ``start()``,
+    ``stop()``, ``write()``, and ``summary()``.
+
+    """
+
+    class Meta:
+
+        """Profiler meta-data."""
+
+        label = None
+        """The label of the profiler (as passed to ``--profile=<label>``)."""
+
+    def __init__(self, *args, **kw):
+        super(Profiler, self).__init__(*args, **kw)
+
+    def start(self):
+        """Start profiling."""
+        raise NotImplementedError   # pragma: nocover
+
+    def stop(self):
+        """Stop profiling."""
+        raise NotImplementedError   # pragma: nocover
+
+    def write(self, file_path):
+        """
+        Write the collected stats to a file.
+
+        :param file_path: The file system path to write to.
+
+        """
+        raise NotImplementedError   # pragma: nocover
+
+    def summary(self, limit=20):
+        """
+        Return the functions that the most time was spent in.
+
+        :param limit: The number of functions to return.
+        :returns: A list of dictionaries with the keys ``function``,
+         ``calls`` (``None`` if not known), ``total_time`` (time spent in
+         the function itself), and ``cumulative_time`` (time spent in the
+         function and the functions it called), ordered by
+         ``cumulative_time``.
+
+        """
+        raise NotImplementedError   # pragma: nocover
+
+
+class CProfileProfiler(Profiler):
+
+    """
+    Deterministic profiler based on :py:mod:`cProfile`.  Stats are written
+    in the ``pstats`` format (i.e. ``python -m pstats myapp.prof``).
+
+    """
+
+    class Meta:
+
+        """Profiler meta-data."""
+
+        label = 'cprofile'
+
+    def __init__(self, *args, **kw):
+        super(CProfileProfiler, self).__init__(*args, **kw)
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self):
+        self._profile.disable()
+
+    def write(self, file_path):
+        self._profile.dump_stats(file_path)
+
+    def summary(self, limit=20):
+        stats = pstats.Stats(self._profile).stats
+        rows = []
+        for (file_name, line, func_name), stat in stats.items():
+            rows.append(dict(
+                function='%s:%s(%s)' % (file_name, line, func_name),
+                calls=stat[1],
+                total_time=stat[2],
+                cumulative_time=stat[3],
+            ))
+        rows.sort(key=lambda row: (-row['cumulative_time'], row['function']))
+        return rows[:limit]
+
+
+class SamplingProfiler(Profiler):
+
+    """
+    Statistical profiler that samples the call stack every
+    ``Meta.interval`` seconds of CPU time (using ``SIGPROF``), with much
+    lower overhead than :class:`CProfileProfiler`.  Stats are written as
+    collapsed stacks (one ``frame;frame;frame count`` line per unique
+    stack), as used by flame graph tools.  Only available on Unix/Linux.
+
+    """
+
+    class Meta:
+
+        """Profiler meta-data."""
+
+        label = 'sampling'
+
+        interval = 0.001
+        """The sampling interval (in seconds of CPU time)."""
+
+    def __init__(self, *args, **kw):
+        super(SamplingProfiler, self).__init__(*args, **kw)
+        self._samples = {}
+        self._saved_handler = None
+
+    def _sample(self, signum, frame):
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append('%s:%s(%s)' % (code.co_filename,
+                                        code.co_firstlineno,
+                                        code.co_name))
+            frame = frame.f_back
+        stack = tuple(reversed(stack))
+        self._samples[stack] = self._samples.get(stack, 0) + 1
+
+    def start(self):
+        if not hasattr(signal, 'setitimer'):
+            raise FrameworkError("The sampling profiler is not available " +
+                                 "on this platform.")   # pragma: nocover
+        self._saved_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self._meta.interval,
+                         self._meta.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._saved_handler or signal.SIG_DFL)
+
+    def write(self, file_path):
+        with open(file_path, 'w') as stats_file:
+            for stack, count in sorted(self._samples.items()):
+                stats_file.write('%s %s\n' % (';'.join(stack), count))
+
+    def summary(self, limit=20):
+        own = {}
+        cumulative = {}
+        for stack, count in self._samples.items():
+            own[stack[-1]] = own.get(stack[-1], 0) + count
+            for function in set(stack):
+                cumulative[function] = cumulative.get(function, 0) + count
+
+        interval = self._meta.interval
+        rows = []
+        for function, count in cumulative.items():
+            rows.append(dict(
+                function=function,
+                calls=None,
+                total_time=own.get(function, 0) * interval,
+                cumulative_time=count * interval,
+            ))
+        rows.sort(key=lambda row: (-row['cumulative_time'], row['function']))
+        return rows[:limit]
+
+
+PROFILERS = dict(
+    cprofile=CProfileProfiler,
+    sampling=SamplingProfiler,
+)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark config merging and argument-to-config overrides against the
+number of sections/keys.  Run time should roughly double with each row
+(linear scaling):
+
+    $ python scripts/benchmarks/config_merge.py
+
+"""
+
+import sys
+import timeit
+
+from cement.core.foundation import CementApp
+from cement.ext.ext_configparser import ConfigParserConfigHandler
+
+SIZES = [50, 100, 200, 400]
+KEYS_PER_SECTION = 20
+
+
+def make_config(num_sections):
+    config = dict()
+    for i in range(num_sections):
+        section = 'section%d' % i
+        config[section] = dict()
+        for j in range(KEYS_PER_SECTION):
+            config[section]['key%d' % j] = 'value%d' % j
+    return config
+
+
+def bench_merge(handler_class, num_sections):
+    config = make_config(num_sections)
+
+    def run():
+        handler = handler_class()
+        handler.merge(config)
+        handler.merge(config, override=False)
+
+    return min(timeit.repeat(run, number=1, repeat=3))
+
+
+def bench_override_args(num_sections):
+    config = make_config(num_sections)
+    argv = []
+    for j in range(KEYS_PER_SECTION):
+        argv.append('--key%d=override' % j)
+
+    def run():
+        app = CementApp('bench', argv=argv, config_defaults=config,
+                        config_files=[], config_dirs=[],
+                        arguments_override_config=True,
+                        exit_on_close=False)
+        app.setup()
+        for j in range(KEYS_PER_SECTION):
+            app.args.add_argument('--key%d' % j, action='store')
+        app._parse_args()
+        app.close()
+
+    return min(timeit.repeat(run, number=1, repeat=3))
+
+
+def main():
+    handlers = [('configparser', ConfigParserConfigHandler)]
+    try:
+        from cement.ext.ext_configobj import ConfigObjConfigHandler
+        handlers.append(('configobj', ConfigObjConfigHandler))
+    except ImportError:
+        pass
+
+    header = '%-10s' % 'sections'
+    for label, _ in handlers:
+        header += '%22s' % ('merge (%s)' % label)
+    header += '%22s' % 'override args'
+    print(header)
+
+    for size in SIZES:
+        row = '%-10d' % size
+        for label, handler_class in handlers:
+            row += '%21.4fs' % bench_merge(handler_class, size)
+        row += '%21.4fs' % bench_override_args(size)
+        print(row)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Benchmark ArgparseController controller resolution (nesting/embedding
+order) against the number of registered controllers.  Run time should
+grow roughly linearly with the number of controllers:
+
+    $ python scripts/benchmarks/controller_resolution.py
+
+"""
+
+import sys
+import timeit
+
+from cement.core.foundation import CementApp
+from cement.ext.ext_argparse import ArgparseController
+
+SIZES = [10, 100, 1000]
+
+
+class Base(ArgparseController):
+
+    class Meta:
+        label = 'base'
+
+
+def make_controllers(num_controllers):
+    # a mix of nested and embedded controllers in a binary tree (many levels
+    # deep), registered children-first (worst case for ordering)
+    controllers = []
+    for i in range(num_controllers):
+        if i == 0:
+            stacked_on = 'base'
+        else:
+            stacked_on = 'contr%d' % ((i - 1) // 2)
+
+        meta = type('Meta', (object,), dict(
+            label='contr%d' % i,
+            stacked_on=stacked_on,
+            stacked_type='embedded' if i % 3 == 0 else 'nested',
+        ))
+        controllers.append(type('Contr%d' % i, (ArgparseController,),
+                                dict(Meta=meta)))
+    return [Base] + controllers[::-1]
+
+
+def bench_resolution(num_controllers):
+    app = CementApp('bench', argv=[], config_files=[], config_dirs=[],
+                    handlers=make_controllers(num_controllers),
+                    exit_on_close=False)
+    app.setup()
+
+    def setup_only():
+        # instantiating and setting up controllers, without resolving them
+        for contr in app.handler.list('controller'):
+            contr()._setup(app)
+
+    def run():
+        app.controller._setup_controllers()
+
+    total = min(timeit.repeat(run, number=1, repeat=3))
+    setup = min(timeit.repeat(setup_only, number=1, repeat=3))
+    app.close()
+    return total, max(total - setup, 0)
+
+
+def main():
+    print('%-14s%14s%14s' % ('controllers', 'total', 'resolution'))
+    for size in SIZES:
+        print('%-14d%13.4fs%13.4fs' % ((size,) + bench_resolution(size)))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
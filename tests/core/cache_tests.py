@@ -1,7 +1,13 @@
 """Tests for cement.core.cache."""
 
-from cement.core import cache
+import sys
+import mock
+import pickle
+import threading
+from time import sleep
+from cement.core import cache, exc
 from cement.utils import test
+from cement.utils.misc import init_defaults
 
 
 class MyCacheHandler(cache.CementCacheHandler):
@@ -35,3 +41,392 @@ class CacheTestCase(test.CementCoreTestCase):
         self.app.cache.get('foo')
         self.app.cache.delete('foo')
         self.app.cache.purge()
+
+
+class DictCacheHandler(cache.CementCacheHandler):
+
+    class Meta:
+        label = 'dict_cache_handler'
+
+    def __init__(self, *args, **kw):
+        super(DictCacheHandler, self).__init__(*args, **kw)
+        self.data = {}
+
+    def get(self, key, fallback=None):
+        return self.data.get(key, fallback)
+
+    def set(self, key, value, time=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def purge(self):
+        self.data = {}
+
+
+class AsyncDictCacheHandler(cache.CementAsyncCacheHandler, DictCacheHandler):
+
+    class Meta:
+        label = 'async_dict_cache_handler'
+
+
+@test.attr('core')
+class CacheMemoizeTestCase(test.CementCoreTestCase):
+
+    def setUp(self):
+        super(CacheMemoizeTestCase, self).setUp()
+        self.app = self.make_app(cache_handler=DictCacheHandler)
+        self.app.setup()
+        self.calls = []
+
+    def test_memoize(self):
+        @self.app.cache.memoize(ttl=60)
+        def double(x):
+            self.calls.append(x)
+            return x * 2
+
+        self.eq(double(2), 4)
+        self.eq(double(2), 4)
+        self.eq(double(3), 6)
+        self.eq(self.calls, [2, 3])
+
+    def test_memoize_locks_released(self):
+        @self.app.cache.memoize(ttl=60)
+        def double(x):
+            self.eq(len(self.app.cache._locks), 1)
+            return x * 2
+
+        for i in range(100):
+            double(i)
+        self.eq(self.app.cache._locks, {})
+
+        # held locks are kept until released
+        token = self.app.cache._acquire_lock('held', 30)
+        self.eq(self.app.cache._acquire_lock('held', 30, blocking=False),
+                None)
+        self.eq(list(self.app.cache._locks.keys()), ['held'])
+        self.app.cache._release_lock('held', token)
+        self.eq(self.app.cache._locks, {})
+
+    def test_memoize_key_callable(self):
+        @self.app.cache.memoize(key=lambda x: 'my-key-%s' % x)
+        def double(x):
+            return x * 2
+
+        double(5)
+        # without a codec, memoized values are stored pickled
+        self.eq(self.app.cache._decode(self.app.cache.get('my-key-5')), 10)
+
+    def test_memoize_none_not_cached(self):
+        @self.app.cache.memoize(key='none')
+        def value():
+            self.calls.append(1)
+
+        self.eq(value(), None)
+        self.eq(value(), None)
+        self.eq(self.calls, [1, 1])
+        self.eq(self.app.cache.data, {})
+
+    def test_memoize_codec_disabled(self):
+        app = self.make_app(cache_handler=DictCacheHandler(memoize_codec=None))
+        app.setup()
+
+        @app.cache.memoize(key=lambda: 'plain')
+        def value():
+            return [1]
+
+        self.eq(value(), [1])
+        self.eq(app.cache.get('plain'), [1])
+
+    @test.raises(exc.FrameworkError)
+    def test_memoize_unknown_codec(self):
+        app = self.make_app(cache_handler=DictCacheHandler(
+            memoize_codec='bogus'))
+        app.setup()
+
+    def test_memoize_stale_while_revalidate(self):
+        @self.app.cache.memoize(ttl=60, stale_ttl=60, key='stale')
+        def value():
+            self.calls.append(1)
+            return len(self.calls)
+
+        self.eq(value(), 1)
+
+        # expire the freshness marker, the stale value is returned while a
+        # background thread refreshes it
+        for key in list(self.app.cache.data.keys()):
+            if key.endswith(':fresh'):
+                self.app.cache.delete(key)
+        self.eq(value(), 1)
+
+        for i in range(100):
+            if len(self.calls) == 2:
+                break
+            sleep(0.01)
+        sleep(0.01)
+        self.eq(value(), 2)
+
+    @test.raises(exc.FrameworkError)
+    def test_memoize_stale_requires_ttl(self):
+        self.app.cache.memoize(stale_ttl=60)
+
+    def test_memoize_single_flight(self):
+        @self.app.cache.memoize(ttl=60)
+        def slow(x):
+            self.calls.append(x)
+            sleep(0.1)
+            return x
+
+        threads = [threading.Thread(target=slow, args=(1,))
+                   for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.eq(self.calls, [1])
+
+    def test_memoize_method(self):
+        test_case = self
+
+        class MyHandler(object):
+            app = self.app
+
+            @cache.memoize(ttl=60)
+            def double(self, x):
+                test_case.calls.append(x)
+                return x * 2
+
+        self.eq(MyHandler().double(2), 4)
+        self.eq(MyHandler().double(2), 4)
+        self.eq(self.calls, [2])
+
+    def test_memoize_method_no_cache_handler(self):
+        app = self.make_app()
+        app.setup()
+
+        class MyHandler(object):
+            @cache.memoize(ttl=60)
+            def double(self, x):
+                return x * 2
+
+        handler = MyHandler()
+        handler.app = app
+        self.eq(handler.double(2), 4)
+
+
+@test.attr('core')
+class CacheCodecTestCase(test.CementCoreTestCase):
+
+    def make_cache(self, **settings):
+        defaults = init_defaults('cache.dict_cache_handler')
+        defaults['cache.dict_cache_handler'].update(settings)
+        app = self.make_app(cache_handler=DictCacheHandler,
+                            config_defaults=defaults)
+        app.setup()
+        return app.cache
+
+    def test_no_codec(self):
+        cache = self.make_cache()
+        data = dict(foo='bar')
+        self.ok(cache._encode(data) is data)
+        self.ok(cache._decode(data) is data)
+
+    def test_codecs(self):
+        data = dict(foo='bar', items=[1, 2, 3])
+        for codec in ['pickle', 'json', 'marshal']:
+            cache = self.make_cache(codec=codec)
+            encoded = cache._encode(data)
+            self.ok(isinstance(encoded, bytes))
+            self.eq(cache._decode(encoded), data)
+
+    def test_msgpack_codec(self):
+        try:
+            import msgpack  # noqa
+        except ImportError:
+            raise test.SkipTest('msgpack is not installed')
+        cache = self.make_cache(codec='msgpack')
+        self.eq(cache._decode(cache._encode(dict(foo='bar'))),
+                dict(foo='bar'))
+
+    def test_compression(self):
+        cache = self.make_cache(codec='json', compression='zlib',
+                                compress_threshold='100')
+        small = 'x' * 10
+        large = 'x' * 1000
+        encoded_small = cache._encode(small)
+        encoded_large = cache._encode(large)
+        self.ok(len(encoded_large) < len(large))
+        self.eq(bytearray(encoded_small[5:6])[0] & 0x70, 0)
+        self.ok(bytearray(encoded_large[5:6])[0] & 0x70)
+        self.eq(cache._decode(encoded_small), small)
+        self.eq(cache._decode(encoded_large), large)
+
+    def test_mixed_encodings(self):
+        json_cache = self.make_cache(codec='json', compression='zlib',
+                                     compress_threshold=0)
+        encoded = json_cache._encode(['foo', 'bar'])
+        pickle_cache = self.make_cache(codec='pickle')
+        self.eq(pickle_cache._decode(encoded), ['foo', 'bar'])
+
+        # values stored before a codec was configured are returned as is
+        self.eq(pickle_cache._decode(b'raw value'), b'raw value')
+
+    def test_unmarked_values(self):
+        cache = self.make_cache(codec='pickle')
+
+        # legacy values (and text) starting with a byte >= 0x80
+        legacy = pickle.dumps(['foo'], 2)
+        self.eq(cache._decode(legacy), legacy)
+        text = u'\xe9t\xe9'.encode('utf-8')
+        self.eq(cache._decode(text), text)
+
+        # magic prefix with an unknown format version
+        data = b'\x00CMT\x02\x01' + pickle.dumps(['foo'])
+        self.eq(cache._decode(data), data)
+        self.eq(cache._decode(b'\x00CMT'), b'\x00CMT')
+
+    @test.raises(exc.FrameworkError)
+    def test_unknown_codec_id(self):
+        cache = self.make_cache(codec='pickle')
+        cache._decode(b'\x00CMT\x01\x0f' + pickle.dumps(['foo']))
+
+    @test.raises(exc.FrameworkError)
+    def test_unknown_codec(self):
+        self.make_cache(codec='bogus')
+
+    @test.raises(exc.FrameworkError)
+    def test_unknown_compression(self):
+        self.make_cache(codec='json', compression='bogus')
+
+    def test_meta_codec(self):
+        app = self.make_app(cache_handler=DictCacheHandler(codec='json'))
+        app.setup()
+        self.eq(app.cache._decode(app.cache._encode([1])), [1])
+
+
+@test.attr('core')
+class CacheStatsTestCase(test.CementCoreTestCase):
+
+    def make_cache(self, **settings):
+        defaults = init_defaults('cache.dict_cache_handler')
+        defaults['cache.dict_cache_handler'].update(settings)
+        self.app = self.make_app(cache_handler=DictCacheHandler,
+                                 config_defaults=defaults)
+        self.app.setup()
+        return self.app.cache
+
+    def test_stats_disabled(self):
+        cache = self.make_cache()
+        cache.set('foo', 'bar')
+        self.eq(cache.stats(), None)
+
+    def test_stats(self):
+        cache = self.make_cache(track_stats=True)
+        cache.set('foo', 'bar')
+        self.eq(cache.get('foo'), 'bar')
+        self.eq(cache.get('missing', 'fallback'), 'fallback')
+        self.eq(cache.get('missing'), None)
+        cache.delete('foo')
+        cache.purge()
+
+        stats = cache.stats()
+        self.eq(stats['hits'], 1)
+        self.eq(stats['misses'], 2)
+        self.eq(stats['sets'], 1)
+        self.eq(stats['deletes'], 1)
+        self.eq(stats['purges'], 1)
+        self.eq(stats['bytes_written'], 3)
+        self.eq(stats['bytes_read'], 3)
+        self.eq(stats['evictions'], None)
+        self.eq(stats['hit_ratio'], 1.0 / 3)
+        self.eq(stats['latency']['get']['count'], 3)
+        self.eq(sum([x[1] for x in stats['latency']['get']['histogram']]), 3)
+        self.eq(stats['latency']['get']['histogram'][-1][0], None)
+
+    def test_stats_with_codec(self):
+        cache = self.make_cache(track_stats='true', codec='json')
+        encoded = cache._encode(['foo'])
+        cache._decode(encoded)
+        stats = cache.stats()
+        self.eq(stats['bytes_written'], len(encoded))
+        self.eq(stats['bytes_read'], len(encoded))
+
+    def test_stats_dumped_on_close(self):
+        defaults = init_defaults('cache.dict_cache_handler')
+        defaults['cache.dict_cache_handler']['track_stats'] = True
+        self.app = self.make_app(cache_handler=DictCacheHandler,
+                                 config_defaults=defaults,
+                                 argv=['--debug'])
+        self.app.setup()
+        self.app.cache.set('foo', 'bar')
+        self.app.cache.get('foo')
+        self.app.cache.get('missing')
+        with mock.patch.object(self.app.log, 'debug') as debug:
+            self.app.close()
+
+        messages = [c[0][0] for c in debug.call_args_list]
+        stats = [m for m in messages if m.startswith('cache stats: ')]
+        self.eq(len(stats), 1)
+        counters = dict([x.split('=') for x in
+                         stats[0][len('cache stats: '):].split(', ')])
+        self.eq(counters['hits'], '1')
+        self.eq(counters['misses'], '1')
+        self.eq(counters['sets'], '1')
+        self.eq(counters['hit_ratio'], '0.5')
+        latency = [m for m in messages if m.startswith('cache latency [')]
+        self.eq(len(latency), 2)
+        self.ok(latency[0].startswith('cache latency [get]: count=2 '))
+        self.ok(latency[1].startswith('cache latency [set]: count=1 '))
+
+    def test_stats_not_dumped_without_debug(self):
+        defaults = init_defaults('cache.dict_cache_handler')
+        defaults['cache.dict_cache_handler']['track_stats'] = True
+        self.app = self.make_app(cache_handler=DictCacheHandler,
+                                 config_defaults=defaults)
+        self.app.setup()
+        self.app.cache.get('foo')
+        with mock.patch.object(self.app.log, 'debug') as debug:
+            self.app.close()
+
+        messages = [c[0][0] for c in debug.call_args_list]
+        self.eq([m for m in messages if m.startswith('cache ')], [])
+
+
+@test.attr('core')
+class AsyncCacheTestCase(test.CementCoreTestCase):
+
+    def test_async_handler(self):
+        if sys.version_info < (3, 4):
+            raise test.SkipTest('asyncio is not supported')  # pragma: nocover
+
+        import asyncio
+        app = self.make_app(cache_handler=AsyncDictCacheHandler)
+        app.setup()
+        cache.async_cache_validator(None, app.cache)
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            run = loop.run_until_complete
+            run(app.cache.aset('foo', 'bar'))
+            self.eq(run(app.cache.aget('foo')), 'bar')
+            run(app.cache.adelete('foo'))
+            self.eq(run(app.cache.aget('foo', 'fallback')), 'fallback')
+            run(app.cache.apurge())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+
+    def test_async_validated_on_register(self):
+        with mock.patch.object(cache, 'async_cache_validator') as validator:
+            self.app.handler.register(AsyncDictCacheHandler, force=True)
+            self.eq(validator.call_count, 1)
+            self.app.handler.register(DictCacheHandler, force=True)
+            self.eq(validator.call_count, 1)
+
+    @test.raises(exc.InterfaceError)
+    def test_async_validator(self):
+        app = self.make_app(cache_handler=DictCacheHandler)
+        app.setup()
+        cache.async_cache_validator(None, app.cache)
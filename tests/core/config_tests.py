@@ -1,7 +1,13 @@
 """Tests for cement.core.config."""
 
-from cement.core import exc, config
+import os
+import copy
+import json
+import threading
+import mock
+from cement.core import exc, config, handler
 from cement.utils import test
+from cement.ext.ext_configparser import ConfigParserConfigHandler
 
 CONFIG = """
 [my_section]
@@ -15,6 +21,90 @@ class BogusConfigHandler(config.CementConfigHandler):
         label = 'bogus'
 
 
+class SchemaHandler(config.CementConfigHandler):
+
+    """Any handler can declare a config schema."""
+
+    class Meta:
+        label = 'schema_test'
+        interface = config.IConfig
+        config_section = 'schema_test'
+        config_defaults = dict(port='8080', debug='false')
+        config_schema = dict(port=int, debug=bool)
+
+
+class EnvDefaultsHandler(config.CementConfigHandler):
+
+    class Meta:
+        label = 'env_test'
+        interface = config.IConfig
+        config_section = 'env_test'
+        config_defaults = dict(timeout=10, enabled=False, name='foo')
+        config_schema = dict(port=int)
+
+
+class JSONParseFileHandler(ConfigParserConfigHandler):
+
+    """Overrides _parse_file() but not _read_file()."""
+
+    class Meta:
+        label = 'json_parse_file'
+
+    def _parse_file(self, file_path):
+        with open(file_path, 'r') as f:
+            self.merge(json.load(f))
+        return True
+
+
+class InterfaceOnlyConfigHandler(handler.CementBaseHandler):
+
+    """Implements only the members of the IConfig interface."""
+
+    class Meta:
+        label = 'interface_only'
+        interface = config.IConfig
+
+    def __init__(self, *args, **kw):
+        super(InterfaceOnlyConfigHandler, self).__init__(*args, **kw)
+        self._data = dict()
+        self.parsed = []
+
+    def keys(self, section):
+        return list(self._data[section].keys())
+
+    def get_dict(self):
+        return self._data
+
+    def get_sections(self):
+        return list(self._data.keys())
+
+    def get_section_dict(self, section):
+        return self._data[section]
+
+    def get(self, section, key):
+        return self._data[section][key]
+
+    def set(self, section, key, value):
+        self._data[section][key] = value
+
+    def parse_file(self, file_path):
+        self.parsed.append(file_path)
+        return False
+
+    def merge(self, dict_obj, override=True):
+        for section, section_dict in dict_obj.items():
+            self.add_section(section)
+            for key, value in section_dict.items():
+                if override or key not in self._data[section]:
+                    self._data[section][key] = value
+
+    def add_section(self, section):
+        self._data.setdefault(section, dict())
+
+    def has_section(self, section):
+        return section in self._data
+
+
 class ConfigTestCase(test.CementCoreTestCase):
 
     @test.raises(exc.InterfaceError)
@@ -87,3 +177,406 @@ class ConfigTestCase(test.CementCoreTestCase):
         self.app._meta.config_files = [self.tmp_file]
         self.app.setup()
         self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+
+    def make_cached_app(self):
+        meta = {
+            'config.configparser': dict(
+                parse_cache=True,
+                parse_cache_dir=self.tmp_dir,
+            ),
+        }
+        return self.make_app(config_files=[self.tmp_file],
+                             meta_defaults=meta)
+
+    def test_parse_cache(self):
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+
+        self.app = self.make_cached_app()
+        self.app.setup()
+        self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+        self.eq(len(os.listdir(self.tmp_dir)), 1)
+
+        # unchanged files are loaded from the cache without parsing
+        self.app = self.make_cached_app()
+        with mock.patch.object(ConfigParserConfigHandler,
+                               '_read_file') as read_file:
+            self.app.setup()
+            self.eq(read_file.call_count, 0)
+        self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+
+        # changed files are re-parsed
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG.replace('my_value', 'my_other_value'))
+        f.close()
+        os.utime(self.tmp_file, (0, 0))
+        self.app = self.make_cached_app()
+        self.app.setup()
+        self.eq(self.app.config.get('my_section', 'my_param'),
+                'my_other_value')
+        self.eq(len(os.listdir(self.tmp_dir)), 1)
+
+    def test_parse_cache_defaults_section(self):
+        f = open(self.tmp_file, 'w+')
+        f.write("[DEFAULT]\nfoo = bar\n%s" % CONFIG)
+        f.close()
+
+        self.app = self.make_cached_app()
+        self.app.setup()
+        self.eq(self.app.config.get('my_section', 'foo'), 'bar')
+        self.eq(os.listdir(self.tmp_dir), [])
+
+    def test_parse_cache_corrupt(self):
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+
+        self.app = self.make_cached_app()
+        self.app.setup()
+        cache_file = os.path.join(self.tmp_dir, os.listdir(self.tmp_dir)[0])
+        f = open(cache_file, 'w')
+        f.write('bogus')
+        f.close()
+
+        self.app = self.make_cached_app()
+        self.app.setup()
+        self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+
+    def test_get_typed(self):
+        defaults = dict(test=dict(
+            workers='4',
+            debug='false',
+            hosts='a, b,c',
+            ratio='0.5',
+            name='foo',
+        ))
+        schema = dict(test=dict(
+            workers=int,
+            debug=bool,
+            hosts=list,
+            ratio=dict(type=float, validator=lambda v: 0 <= v <= 1),
+            timeout=dict(type=int, default=30),
+        ))
+        self.app = self.make_app(config_defaults=defaults,
+                                 config_schema=schema)
+        self.app.setup()
+        get = self.app.config.get_typed
+        self.eq(get('test', 'workers'), 4)
+        self.eq(get('test', 'debug'), False)
+        self.eq(get('test', 'hosts'), ['a', 'b', 'c'])
+        self.eq(get('test', 'ratio'), 0.5)
+        self.eq(get('test', 'timeout'), 30)
+
+        # keys without a schema are returned as-is
+        self.eq(get('test', 'name'), 'foo')
+
+        # cached values are invalidated on set/merge
+        self.app.config.set('test', 'workers', '8')
+        self.eq(get('test', 'workers'), 8)
+        self.app.config.merge(dict(test=dict(workers='16', timeout='5')))
+        self.eq(get('test', 'workers'), 16)
+        self.eq(get('test', 'timeout'), 5)
+
+    def test_get_typed_parse_file(self):
+        self.app = self.make_app(
+            config_schema=dict(my_section=dict(my_param=list)))
+        self.app.setup()
+        self.app.config.merge(dict(my_section=dict(my_param='a,b')))
+        self.eq(self.app.config.get_typed('my_section', 'my_param'),
+                ['a', 'b'])
+
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+        self.app.config.parse_file(self.tmp_file)
+        self.eq(self.app.config.get_typed('my_section', 'my_param'),
+                ['my_value'])
+
+    def test_validate_schema(self):
+        defaults = dict(test=dict(workers='four', debug='maybe', port='80'))
+        schema = dict(test=dict(
+            workers=int,
+            debug=bool,
+            port=dict(type=int, validator=lambda v: v > 1024),
+        ))
+        self.app = self.make_app(config_defaults=defaults,
+                                 config_schema=schema)
+        try:
+            self.app.setup()
+        except exc.FrameworkError as e:
+            # all errors are reported at once
+            self.ok(e.msg.find("'workers'") >= 0)
+            self.ok(e.msg.find("'debug'") >= 0)
+            self.ok(e.msg.find("'port'") >= 0)
+        else:
+            self.ok(False)
+
+    def test_interface_only_config_handler(self):
+        defaults = dict()
+        defaults[self.app._meta.label] = dict(port='8080')
+        self.app = self.make_app(config_handler=InterfaceOnlyConfigHandler,
+                                 config_defaults=defaults,
+                                 config_schema={self.app._meta.label:
+                                                dict(port=int)},
+                                 config_dirs=[],
+                                 config_files=[self.tmp_file])
+        self.app.setup()
+        self.eq(self.app.config.parsed, [self.tmp_file])
+        self.eq(self.app.config.get(self.app._meta.label, 'port'), '8080')
+
+        # handlers with a schema are setup without one
+        han = SchemaHandler()
+        han._setup(self.app)
+        self.eq(self.app.config.get('schema_test', 'port'), '8080')
+
+    @test.raises(exc.FrameworkError)
+    def test_handler_config_schema(self):
+        self.app.setup()
+        self.app.config.add_section('schema_test')
+        han = SchemaHandler()
+        han._setup(self.app)
+        self.eq(self.app.config.get_typed('schema_test', 'port'), 8080)
+        self.eq(self.app.config.get_typed('schema_test', 'debug'), False)
+
+        self.app.config.set('schema_test', 'port', 'bogus')
+        han = SchemaHandler()
+        han._setup(self.app)
+
+    def test_section_dict_snapshots(self):
+        self.app.setup()
+        self.app.config.merge(dict(snap=dict(foo='bar')))
+        d1 = self.app.config.get_section_dict('snap')
+        self.ok(d1 is self.app.config.get_section_dict('snap'))
+        self.ok(self.app.config.get_dict() is self.app.config.get_dict())
+        self.eq(self.app.config.get_dict()['snap'], dict(foo='bar'))
+
+        # snapshots are invalidated by any change
+        self.app.config.set('snap', 'foo', 'baz')
+        d2 = self.app.config.get_section_dict('snap')
+        self.eq(d1, dict(foo='bar'))
+        self.eq(d2, dict(foo='baz'))
+        self.eq(self.app.config.get_dict()['snap'], dict(foo='baz'))
+
+        self.app.config.add_section('snap2')
+        self.ok('snap2' in self.app.config.get_dict())
+
+        # copies are mutable
+        d3 = copy.deepcopy(self.app.config.get_dict())
+        d3['snap']['foo'] = 'qux'
+        self.eq(type(d3['snap']), dict)
+        self.eq(self.app.config.get('snap', 'foo'), 'baz')
+
+    @test.raises(TypeError)
+    def test_section_dict_snapshots_read_only(self):
+        self.app.setup()
+        section = self.app.config.get_section_dict(
+            self.app._meta.config_section)
+        section['debug'] = True
+
+    def test_snapshot(self):
+        self.app.setup()
+        self.app.config.merge(dict(snap=dict(foo='bar')))
+        snap = self.app.config.snapshot()
+        self.ok(snap is self.app.config.snapshot())
+        self.eq(snap.get('snap', 'foo'), 'bar')
+        self.eq(snap.keys('snap'), ['foo'])
+        self.ok(snap.has_section('snap'))
+        self.ok('snap' in snap.get_sections())
+        self.eq(snap.get_section_dict('snap'), dict(foo='bar'))
+        self.eq(snap.get_dict()['snap'], dict(foo='bar'))
+
+        # existing snapshots never change
+        self.app.config.set('snap', 'foo', 'baz')
+        self.eq(snap.get('snap', 'foo'), 'bar')
+        self.eq(self.app.config.snapshot().get('snap', 'foo'), 'baz')
+
+        # parsing a file publishes a new snapshot
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+        self.app.config.parse_file(self.tmp_file)
+        snap = self.app.config._published
+        self.eq(snap.get('my_section', 'my_param'), 'my_value')
+        self.ok(snap is self.app.config.snapshot())
+
+    def test_snapshot_consistent_across_threads(self):
+        self.app.setup()
+        keys = ['key%d' % i for i in range(200)]
+        self.app.config.merge(dict(snap=dict([(k, 0) for k in keys])))
+        errors = []
+
+        def writer():
+            for version in range(1, 30):
+                self.app.config.merge(
+                    dict(snap=dict([(k, version) for k in keys])))
+
+        def reader():
+            for i in range(200):
+                values = self.app.config.snapshot().get_section_dict('snap')
+                if len(set(values.values())) != 1:
+                    errors.append(values)
+
+        threads = [threading.Thread(target=writer)]
+        threads += [threading.Thread(target=reader) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.eq(errors, [])
+        self.eq(self.app.config.snapshot().get('snap', 'key0'), 29)
+
+    def test_parse_files(self):
+        self.app.setup()
+        paths = []
+        for i in range(20):
+            path = os.path.join(self.tmp_dir, '%02d.conf' % i)
+            f = open(path, 'w')
+            f.write("[parallel]\nlast = %s\nfile%s = yes\n" % (i, i))
+            f.close()
+            paths.append(path)
+        paths.append(os.path.join(self.tmp_dir, 'bogus.conf'))
+
+        self.app.config.parse_files(paths)
+        self.eq(self.app.config.get('parallel', 'last'), '19')
+        self.eq(len(self.app.config.keys('parallel')), 21)
+
+    def test_parse_file_overridden(self):
+        conf_d = os.path.join(self.tmp_dir, 'conf.d')
+        os.makedirs(conf_d)
+        f = open(os.path.join(conf_d, 'a.conf'), 'w')
+        f.write(json.dumps(dict(my_section=dict(my_param='from_dir',
+                                                other='from_dir'))))
+        f.close()
+        f = open(self.tmp_file, 'w+')
+        f.write(json.dumps(dict(my_section=dict(my_param='my_value'))))
+        f.close()
+
+        for parse_cache in [False, True]:
+            meta = {
+                'config.json_parse_file': dict(
+                    parse_cache=parse_cache,
+                    parse_cache_dir=os.path.join(self.tmp_dir, 'cache'),
+                ),
+            }
+            self.app = self.make_app(config_handler=JSONParseFileHandler,
+                                     config_dirs=[conf_d],
+                                     config_files=[self.tmp_file],
+                                     meta_defaults=meta)
+            self.app.setup()
+            self.eq(self.app.config.get('my_section', 'my_param'),
+                    'my_value')
+            self.eq(self.app.config.get('my_section', 'other'), 'from_dir')
+
+    def test_config_dirs_precedence(self):
+        conf_d = os.path.join(self.tmp_dir, 'conf.d')
+        os.makedirs(conf_d)
+        for name, value in [('b.conf', 'b'), ('a.conf', 'a')]:
+            f = open(os.path.join(conf_d, name), 'w')
+            f.write("[my_section]\nfrom_dir = %s\nmy_param = %s\n" %
+                    (value, value))
+            f.close()
+        f = open(self.tmp_file, 'w+')
+        f.write(CONFIG)
+        f.close()
+
+        self.app = self.make_app(config_dirs=[conf_d],
+                                 config_files=[self.tmp_file])
+        self.app.setup()
+        # conf.d files are parsed in file name order, then config files
+        self.eq(self.app.config.get('my_section', 'from_dir'), 'b')
+        self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+
+    def test_config_env(self):
+        defaults = {
+            'myapp': dict(debug=False, workers=1, ratio=0.5, name='foo'),
+            'cache.redis': dict(hosts=['a']),
+        }
+        env = {
+            'MYAPP_MYAPP__DEBUG': 'true',
+            'MYAPP_MYAPP__WORKERS': '4',
+            'MYAPP_MYAPP__RATIO': 'bogus',
+            'MYAPP_MYAPP__NAME': 'bar',
+            'MYAPP_CACHE_REDIS__HOSTS': 'b,c',
+            'MYAPP_NEW_SECTION__KEY': 'value',
+            'MYAPP_BOGUS': 'ignored',
+            'MYAPP___BOGUS': 'ignored',
+            'OTHER_MYAPP__NAME': 'ignored',
+        }
+        f = open(self.tmp_file, 'w+')
+        f.write("[myapp]\nname = from_file\n")
+        f.close()
+
+        with mock.patch.dict(os.environ, env):
+            self.app = self.make_app('myapp', config_defaults=defaults,
+                                     config_files=[self.tmp_file],
+                                     config_env_prefix='myapp')
+            self.app.setup()
+
+        get = self.app.config.get
+        self.eq(get('myapp', 'debug'), True)
+        self.eq(get('myapp', 'workers'), 4)
+        self.eq(get('myapp', 'ratio'), 'bogus')
+        self.eq(get('myapp', 'name'), 'bar')
+        self.eq(get('cache.redis', 'hosts'), ['b', 'c'])
+        self.eq(get('new_section', 'key'), 'value')
+
+    def test_config_env_schema(self):
+        schema = {'myapp': dict(port=int, workers=int, hosts=list)}
+        env = {
+            'MYAPP_MYAPP__PORT': '8080',
+            'MYAPP_MYAPP__WORKERS': '4',
+            'MYAPP_MYAPP__HOSTS': 'a, b',
+        }
+        f = open(self.tmp_file, 'w+')
+        f.write("[myapp]\nport = 80\n")
+        f.close()
+
+        with mock.patch.dict(os.environ, env):
+            self.app = self.make_app('myapp', config_schema=schema,
+                                     config_files=[self.tmp_file],
+                                     config_env_prefix='myapp')
+            self.app.setup()
+
+        # the file value is a string, and workers is not set by any file
+        self.eq(self.app.config.get('myapp', 'port'), 8080)
+        self.eq(self.app.config.get('myapp', 'workers'), 4)
+        self.eq(self.app.config.get('myapp', 'hosts'), ['a', 'b'])
+
+    def test_config_env_defaults_type(self):
+        defaults = {'myapp': dict(workers=1)}
+        f = open(self.tmp_file, 'w+')
+        f.write("[myapp]\nworkers = 2\n")
+        f.close()
+
+        with mock.patch.dict(os.environ, {'MYAPP_MYAPP__WORKERS': '4'}):
+            self.app = self.make_app('myapp', config_defaults=defaults,
+                                     config_files=[self.tmp_file],
+                                     config_env_prefix='myapp')
+            self.app.setup()
+        self.eq(self.app.config.get('myapp', 'workers'), 4)
+
+    def test_config_env_handler_defaults(self):
+        env = {
+            'MYAPP_ENV_TEST__TIMEOUT': '30',
+            'MYAPP_ENV_TEST__ENABLED': 'yes',
+            'MYAPP_ENV_TEST__NAME': 'bar',
+            'MYAPP_ENV_TEST__PORT': '8080',
+        }
+        with mock.patch.dict(os.environ, env):
+            self.app = self.make_app('myapp', config_env_prefix='myapp')
+            self.app.setup()
+            han = EnvDefaultsHandler()
+            han._setup(self.app)
+
+        get = self.app.config.get
+        self.eq(get('env_test', 'timeout'), 30)
+        self.eq(get('env_test', 'enabled'), True)
+        self.eq(get('env_test', 'name'), 'bar')
+        self.eq(get('env_test', 'port'), 8080)
+
+    def test_config_env_disabled(self):
+        with mock.patch.dict(os.environ, {'MYAPP_MYAPP__FOO': 'bar'}):
+            self.app = self.make_app('myapp')
+            self.app.setup()
+        self.ok('foo' not in self.app.config.keys('myapp'))
@@ -154,6 +154,23 @@ class BadStackType(controller.CementBaseController):
         ]
 
 
+class CountingEmbedded(controller.CementBaseController):
+    setup_count = 0
+
+    class Meta:
+        label = 'counting_embedded'
+        stacked_on = 'nested_controller'
+        stacked_type = 'embedded'
+
+    def _setup(self, app_obj):
+        super(CountingEmbedded, self)._setup(app_obj)
+        CountingEmbedded.setup_count += 1
+
+    @controller.expose()
+    def counting_cmd1(self):
+        return 'Inside CountingEmbedded.counting_cmd1'
+
+
 class ControllerTestCase(test.CementCoreTestCase):
 
     def test_default(self):
@@ -371,3 +388,67 @@ class ControllerTestCase(test.CementCoreTestCase):
             app.controller._help_text
             # self.ok(usage.startswith('%s (sub-commands ...)' % \
             #         self.app._meta.label))
+
+    def test_help_text_aliases_only(self):
+        app = self.make_app(base_controller=TestController)
+        app.handler.register(AliasesOnly)
+        app.setup()
+        contr = AliasesOnly()
+        contr._setup(app)
+        contr._arguments, contr._commands = contr._collect()
+        contr._process_commands()
+
+        # building the help text has no side effects
+        txt = contr._help_text
+        self.eq(contr._help_text, txt)
+        self.ok(txt.find('ao_cmd2 (aliases: ao2)') > -1)
+        self.ok(txt.find('  ao_cmd1\n') > -1)
+        self.eq(contr._dispatch_map['ao_cmd2']['aliases'], ['ao_cmd2', 'ao2'])
+
+    def test_exposed_commands_cached(self):
+        exposed = controller._get_exposed_commands(TestController)
+        self.eq(sorted([c['label'] for c in exposed]),
+                ['default', 'some-command'])
+        self.ok(controller._get_exposed_commands(TestController) is exposed)
+
+        # sub-classes are cached separately
+        class SubController(TestController):
+            @controller.expose()
+            def other_command(self):
+                pass
+
+        sub_exposed = controller._get_exposed_commands(SubController)
+        self.eq(len(sub_exposed), 3)
+        self.eq(len(controller._get_exposed_commands(TestController)), 2)
+
+    def test_collect_does_not_modify_exposed_meta(self):
+        app = self.make_app(base_controller=TestController)
+        app.setup()
+        app.run()
+        self.eq(TestController.some_command.__cement_meta__['controller'],
+                None)
+        cmd = app.controller._dispatch_map['some-command']
+        self.ok(cmd['controller'] is app.controller)
+
+    def test_shared_controllers(self):
+        CountingEmbedded.setup_count = 0
+        app = self.make_app(argv=['nested-controller', 'counting-cmd1'])
+        app.handler.register(TestController)
+        app.handler.register(Embedded)
+        app.handler.register(Nested)
+        app.handler.register(CountingEmbedded)
+        app.setup()
+        res = app.run()
+        self.eq(res, 'Inside CountingEmbedded.counting_cmd1')
+
+        # one instance per controller for the whole dispatch
+        self.eq(CountingEmbedded.setup_count, 1)
+        nested = app.controller._dispatch_map['nested-controller']
+        nested = nested['controller']
+        self.ok(nested._stacked is app.controller._stacked)
+
+        # a new dispatch gets new instances
+        app._meta.argv = ['nested-controller', 'counting-cmd1']
+        app._setup_arg_handler()
+        app.run()
+        self.eq(CountingEmbedded.setup_count, 2)
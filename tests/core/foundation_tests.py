@@ -4,14 +4,22 @@ import os
 import sys
 import json
 import signal
+import mock
 from cement.core import foundation, exc, extension
 from cement.core.handler import CementBaseHandler
 from cement.core.controller import CementBaseController, expose
 from cement.core import output, hook, controller
 from cement.core.interface import Interface
+from cement.ext.ext_argparse import ArgparseController
+from cement.ext.ext_argparse import expose as argparse_expose
 from cement.utils import test
 from cement.utils.misc import init_defaults, rando, minimal_logger
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 APP = rando()[:12]
 
 
@@ -57,6 +65,59 @@ class TestOutputHandler(output.CementOutputHandler):
         return None
 
 
+class BatchController(CementBaseController):
+
+    class Meta:
+        label = 'base'
+        arguments = [
+            (['--foo'], dict(action='store')),
+        ]
+
+    @expose()
+    def cmd1(self):
+        self.app.render(dict(foo=self.app.pargs.foo))
+        return self.app.pargs.foo
+
+    @expose()
+    def fail(self):
+        self.app.exit_code = 3
+        raise Exception('command failed')
+
+
+class ProfileController(ArgparseController):
+
+    class Meta:
+        label = 'base'
+
+    @argparse_expose(arguments=[
+        (['--profile'], dict(action='store_true', dest='cmd_profile')),
+    ])
+    def cmd1(self):
+        return self.app.pargs.cmd_profile
+
+
+class AsyncController(CementBaseController):
+
+    class Meta:
+        label = 'base'
+
+    @expose()
+    def sleep(self):
+        import asyncio
+        return asyncio.sleep(0, result='done')
+
+    @expose()
+    def background(self):
+        import asyncio
+        self.app.task = self.app.loop.create_task(asyncio.sleep(60))
+
+    @expose()
+    def signal(self):
+        import asyncio
+        self.app.loop.call_later(0.01, os.kill, os.getpid(), signal.SIGTERM)
+        return asyncio.sleep(60)
+
+
 class BogusBaseController(controller.CementBaseController):
 
     class Meta:
@@ -542,3 +603,279 @@ class FoundationTestCase(test.CementCoreTestCase):
         app = self.make_app(meta_defaults=META)
         app.setup()
         self.eq(app.log._meta.debug_format, DEBUG_FORMAT)
+
+    def _make_batch_app(self, **kw):
+        app = self.make_app(APP,
+                            base_controller=BatchController,
+                            output_handler='json',
+                            extensions=['json'],
+                            **kw)
+        app.setup()
+        return app
+
+    def _read_batch_results(self, path):
+        with open(path, 'r') as f:
+            return [json.loads(line) for line in f.read().splitlines()]
+
+    def test_run_batch(self):
+        app = self._make_batch_app()
+        out_path = os.path.join(self.tmp_dir, 'results.json')
+        commands = [
+            'cmd1 --foo=bar',
+            '',
+            '# comment',
+            '["cmd1"]',
+            '{"argv": ["fail"]}',
+            ['cmd1', '--foo', 'baz'],
+        ]
+        with open(out_path, 'w') as out:
+            res = app.run_batch(commands, out=out)
+
+        self.eq(len(res), 4)
+        self.eq(res[0]['argv'], ['cmd1', '--foo=bar'])
+        self.eq(res[0]['result'], 'bar')
+        self.eq(json.loads(res[0]['output']), dict(foo='bar'))
+        self.eq(res[1]['result'], None)
+        self.eq(res[2]['exit_code'], 3)
+        self.eq(res[2]['error'], 'command failed')
+        self.eq(res[3]['result'], 'baz')
+        self.eq(self._read_batch_results(out_path), res)
+
+        # per command state is reset, and the app restored afterward
+        self.eq(app.exit_code, 3)
+        self.eq(app.argv, [])
+        self.eq(app.pargs.foo, 'baz')
+
+    def test_run_batch_printed_output(self):
+        app = self._make_batch_app()
+        out = StringIO()
+        saved_stdout = sys.stdout
+        sys.stdout = out
+        try:
+            res = app.run_batch([['--help'], ['cmd1']])
+        finally:
+            sys.stdout = saved_stdout
+
+        self.eq(res[0]['exit_code'], 0)
+        self.ok(res[0]['output'].find('usage:') > -1)
+        self.eq(json.loads(res[1]['output']), dict(foo=None))
+        self.eq([json.loads(line) for line in out.getvalue().splitlines()],
+                res)
+
+    def test_run_batch_argument_error(self):
+        app = self._make_batch_app()
+        with open(os.devnull, 'w') as out:
+            res = app.run_batch([['--bogus']], out=out)
+        self.eq(res[0]['exit_code'], 2)
+        self.eq(app.exit_code, 2)
+
+    def test_batch_option(self):
+        batch_path = os.path.join(self.tmp_dir, 'batch.txt')
+        out_path = os.path.join(self.tmp_dir, 'results.json')
+        with open(batch_path, 'w') as f:
+            f.write('cmd1 --foo=bar\ncmd1 --foo=baz\n')
+
+        app = self._make_batch_app(argv=['--batch', batch_path],
+                                   batch_option=True)
+        with open(out_path, 'w') as out:
+            saved_stdout = sys.stdout
+            sys.stdout = out
+            try:
+                app.run()
+            finally:
+                sys.stdout = saved_stdout
+
+        # command output is captured, so there are only results
+        res = self._read_batch_results(out_path)
+        self.eq([r['result'] for r in res], ['bar', 'baz'])
+        self.eq([json.loads(r['output']) for r in res],
+                [dict(foo='bar'), dict(foo='baz')])
+        self.eq(app.exit_code, 0)
+
+    def test_batch_option_equals(self):
+        batch_path = os.path.join(self.tmp_dir, 'batch.txt')
+        with open(batch_path, 'w') as f:
+            f.write('cmd1 --foo=bar\n')
+
+        app = self._make_batch_app(argv=['--batch=%s' % batch_path],
+                                   batch_option=True)
+        with open(os.devnull, 'w') as out:
+            saved_stdout = sys.stdout
+            sys.stdout = out
+            try:
+                res = app.run()
+            finally:
+                sys.stdout = saved_stdout
+        self.eq([r['result'] for r in res], ['bar'])
+
+    def test_batch_option_not_parsed(self):
+        app = self._make_batch_app(argv=['cmd1', '--', '--batch', 'x'],
+                                   batch_option=True)
+        self.eq(app._get_batch_source(), None)
+
+        app = self._make_batch_app(argv=['--batch', 'x', '--help'],
+                                   batch_option=True)
+        self.eq(app._get_batch_source(), None)
+
+        app = self._make_batch_app(argv=['cmd1', '--foo=--batch'],
+                                   batch_option=True)
+        self.eq(app._get_batch_source(), None)
+
+    def test_run_batch_workers(self):
+        app = self._make_batch_app(batch_workers=2)
+        commands = [['cmd1', '--foo=%s' % i] for i in range(6)]
+        with open(os.devnull, 'w') as out:
+            res = app.run_batch(commands, out=out)
+        self.eq([r['result'] for r in res], [str(i) for i in range(6)])
+
+    @test.raises(exc.FrameworkError)
+    def test_run_batch_missing_file(self):
+        app = self._make_batch_app()
+        app.run_batch(os.path.join(self.tmp_dir, 'missing.txt'))
+
+    @test.raises(exc.FrameworkError)
+    def test_run_batch_invalid_json(self):
+        app = self._make_batch_app()
+        app.run_batch(['["cmd1"'])
+
+    def _make_profile_app(self, argv, **kw):
+        kw.setdefault('base_controller', BatchController)
+        app = self.make_app(APP,
+                            argv=argv,
+                            profile_option=True,
+                            profile_file=os.path.join(self.tmp_dir,
+                                                      'test.prof'),
+                            **kw)
+        app.setup()
+        return app
+
+    def test_profile_disabled(self):
+        app = self._make_profile_app(['cmd1', '--foo=bar'])
+        self.eq(app.run(), 'bar')
+        self.eq(app._profile, None)
+        self.ok(not os.path.exists(os.path.join(self.tmp_dir, 'test.prof')))
+
+    def test_profile_option(self):
+        app = self._make_profile_app(['cmd1', '--profile', '--foo=bar'])
+        self.eq(app.run(), 'bar')
+        self.eq(app._profile, 'cprofile')
+        self.ok(os.path.exists(os.path.join(self.tmp_dir, 'test.prof')))
+
+    def test_profile_render(self):
+        app = self._make_profile_app(['cmd1', '--profile=sampling'],
+                                     profile_summary='render',
+                                     extensions=['json'],
+                                     output_handler='json')
+        app.run()
+        data = app.last_rendered[0]
+        self.eq(data['profile_file'],
+                os.path.join(self.tmp_dir, 'test.prof'))
+        self.ok(isinstance(data['profile'], list))
+
+    def test_profile_meta(self):
+        app = self._make_profile_app(['cmd1'], profile='cprofile',
+                                     profile_summary=None)
+        app.run()
+        self.ok(os.path.exists(os.path.join(self.tmp_dir, 'test.prof')))
+
+    def test_profile_hook(self):
+        from cement.utils.profile import CProfileProfiler
+        profilers = []
+
+        def my_profiler(app, label):
+            if label == 'custom':
+                profilers.append(CProfileProfiler())
+                return profilers[-1]
+
+        app = self._make_profile_app(['cmd1', '--profile=custom'],
+                                     hooks=[('profile', my_profiler)])
+        app.run()
+        self.eq(len(profilers), 1)
+
+    @test.raises(exc.FrameworkError)
+    def test_profile_unknown(self):
+        app = self._make_profile_app(['cmd1', '--profile=bogus'])
+        app.run()
+
+    def test_profile_option_sub_command(self):
+        # a sub-command's own --profile option is not rewritten
+        app = self._make_profile_app(['--profile', 'cmd1', '--profile'],
+                                     base_controller=ProfileController)
+        self.eq(app.run(), True)
+        self.eq(app._profile, 'cprofile')
+
+        app = self._make_profile_app(['cmd1', '--profile'],
+                                     base_controller=ProfileController)
+        self.eq(app.run(), True)
+        self.eq(app._profile, None)
+
+    def test_profile_option_double_dash(self):
+        app = self._make_profile_app([])
+        self.eq(app._rewrite_profile_option(['--profile', 'cmd1', '--',
+                                             '--profile']),
+                ['--profile=cprofile', 'cmd1', '--', '--profile'])
+
+    def test_profile_write_error(self):
+        from cement.utils.profile import CProfileProfiler
+        app = self._make_profile_app(['fail', '--profile'])
+        with mock.patch.object(CProfileProfiler, 'write',
+                               side_effect=IOError('disk full')):
+            with mock.patch.object(app.log, 'warning') as warning:
+                try:
+                    app.run()
+                except Exception as e:
+                    self.eq(str(e), 'command failed')
+                else:
+                    raise AssertionError('command exception was masked')
+                warning.assert_called_once_with(
+                    'unable to report profiler stats: disk full')
+
+                app = self._make_profile_app(['cmd1', '--profile',
+                                              '--foo=bar'])
+                self.eq(app.run(), 'bar')
+
+    def _make_async_app(self, argv):
+        if sys.version_info < (3, 5):
+            raise test.SkipTest('asyncio is not supported')  # pragma: nocover
+        app = self.make_app(APP, argv=argv, base_controller=AsyncController)
+        app.setup()
+        return app
+
+    def test_async_command(self):
+        app = self._make_async_app(['sleep'])
+        self.eq(app._loop, None)
+        self.eq(app.run(), 'done')
+        loop = app.loop
+        self.ok(not loop.is_closed())
+        app.close()
+        self.ok(loop.is_closed())
+        self.eq(app._loop, None)
+
+    def test_async_close_cancels_tasks(self):
+        app = self._make_async_app(['background'])
+        app.run()
+        self.ok(not app.task.done())
+        app.close()
+        self.ok(app.task.cancelled())
+
+    def test_async_signal(self):
+        app = self._make_async_app(['signal'])
+        try:
+            app.run()
+        except exc.CaughtSignal as e:
+            self.eq(e.signum, signal.SIGTERM)
+        else:
+            raise AssertionError('CaughtSignal not raised')
+
+        # the framework signal handler is restored
+        self.eq(signal.getsignal(signal.SIGTERM),
+                foundation.cement_signal_handler)
+        app.close()
+
+    def test_sync_command_no_loop(self):
+        app = self.make_app(APP, argv=['cmd1', '--foo=bar'],
+                            base_controller=BatchController)
+        app.setup()
+        self.eq(app.run(), 'bar')
+        self.eq(app._loop, None)
+        app.close()
@@ -1,5 +1,11 @@
 """Tests for cement.ext.ext_argcomplete."""
 
+import os
+import io
+import mock
+import argcomplete
+from cement.core.foundation import CementApp
+from cement.ext import ext_argcomplete
 from cement.ext.ext_argparse import ArgparseController, expose
 from cement.utils import test
 from cement.utils.misc import rando
@@ -16,6 +22,20 @@ class MyBaseController(ArgparseController):
         pass
 
 
+class MyNestedController(ArgparseController):
+    class Meta:
+        label = 'nested'
+        stacked_type = 'nested'
+        aliases = ['nst']
+        arguments = [
+            (['--color'], dict(choices=['red', 'blue'])),
+        ]
+
+    @expose(arguments=[(['--bar'], dict(action='store_true'))])
+    def cmd2(self):
+        pass
+
+
 class ArgcompleteExtTestCase(test.CementExtTestCase):
 
     def setUp(self):
@@ -34,3 +54,95 @@ class ArgcompleteExtTestCase(test.CementExtTestCase):
         # coverage
         with self.app as app:
             app.run()
+
+
+class ArgcompleteIndexTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(ArgcompleteIndexTestCase, self).setUp()
+        self.index_path = os.path.join(self.tmp_dir, 'completion.json')
+        self.config_file = os.path.join(self.tmp_dir, 'myapp.conf')
+        with open(self.config_file, 'w') as f:
+            f.write('[%s]\nfoo = bar\n' % APP)
+
+        class MyApp(CementApp):
+            class Meta:
+                label = APP
+                argv = []
+                config_files = [self.config_file]
+                config_dirs = []
+                exit_on_close = False
+                extensions = ['argparse', 'argcomplete']
+                handlers = [MyBaseController, MyNestedController]
+                argcomplete_index = self.index_path
+
+        self.app = MyApp()
+        os.environ.pop('_ARGCOMPLETE', None)
+
+    def tearDown(self):
+        super(ArgcompleteIndexTestCase, self).tearDown()
+        for key in ['_ARGCOMPLETE', 'COMP_LINE', 'COMP_POINT']:
+            os.environ.pop(key, None)
+
+    def _complete(self, line):
+        os.environ['_ARGCOMPLETE'] = '1'
+        os.environ['COMP_LINE'] = line
+        os.environ['COMP_POINT'] = str(len(line))
+        out = io.StringIO()
+        exits = []
+
+        # argcomplete writes debug output to fd 9, which pytest uses
+        finder = argcomplete.CompletionFinder
+        with mock.patch.object(finder, '_init_debug_stream'):
+            ext_argcomplete.complete_from_index(self.app, output_stream=out,
+                                                exit_method=exits.append)
+        if not exits:
+            return None
+        return sorted(out.getvalue().split('\013'))
+
+    def test_generate_completion_index(self):
+        with self.app as app:
+            index = ext_argcomplete.generate_completion_index(app)
+        self.ok(os.path.exists(self.index_path))
+        self.eq(index['prog'], APP)
+
+        commands = index['parser']['commands']
+        self.eq(sorted([c['name'] for c in commands]),
+                ['default', 'nested'])
+        nested = [c for c in commands if c['name'] == 'nested'][0]
+        self.eq(nested['aliases'], ['nst'])
+
+        # hidden options are not included
+        for option in index['parser']['options']:
+            self.ok(not option['option_strings'][0].startswith('--dispatch'))
+
+    def test_complete_from_index(self):
+        with self.app as app:
+            ext_argcomplete.generate_completion_index(app)
+
+        res = self._complete('%s ' % APP)
+        self.ok('nested' in res)
+        self.ok('nst' in res)
+        self.ok('--debug' in res)
+
+        res = self._complete('%s nst cmd2 --' % APP)
+        self.ok('--bar' in res)
+
+        res = self._complete('%s nested --color ' % APP)
+        self.eq(res, ['blue', 'red'])
+
+    def test_complete_from_index_missing(self):
+        self.eq(self._complete('%s ' % APP), None)
+
+    def test_stale_completion_index(self):
+        with self.app as app:
+            ext_argcomplete.generate_completion_index(app)
+        index = ext_argcomplete.load_completion_index(self.index_path)
+        self.ok(index is not None)
+        self.ok(self.config_file in index['sources'].keys())
+
+        with open(self.config_file, 'a') as f:
+            f.write('bar = baz\n')
+        index = ext_argcomplete.load_completion_index(self.index_path)
+        self.eq(index, None)
+        self.eq(self._complete('%s ' % APP), None)
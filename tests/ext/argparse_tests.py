@@ -1,15 +1,23 @@
 """Tests for cement.ext.ext_argparse."""
 
+import os
 import sys
 import re
 from argparse import ArgumentError
 from cement.ext.ext_argparse import ArgparseArgumentHandler
 from cement.ext.ext_argparse import ArgparseController, expose
+from cement.ext.ext_argparse import controller_stub
 from cement.ext.ext_argparse import _clean_label, _clean_func
+from cement.ext.ext_argparse import _json_default
 from cement.utils import test
 from cement.utils.misc import rando
 from cement.core.exc import InterfaceError, FrameworkError
 
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 APP = rando()[:12]
 
 if (sys.version_info[0] > 3 and sys.version_info[1] >= 4):
@@ -163,6 +171,13 @@ class Unstacked(ArgparseController):
         ]
 
 
+class StackedOnUnknown(ArgparseController):
+
+    class Meta:
+        label = 'stacked_on_unknown'
+        stacked_on = 'bogus'
+
+
 class BadStackType(ArgparseController):
 
     class Meta:
@@ -233,6 +248,49 @@ class Aliases(ArgparseController):
         return "Inside Aliases.aliases_cmd1"
 
 
+class HelpCacheBase(Base):
+
+    class Meta:
+        label = 'base'
+        help_cache_dir = None
+
+
+class DynamicThird(Third):
+
+    class Meta:
+        label = 'third'
+
+    def _pre_argument_parsing(self):
+        self._parser.add_argument('--dynamic', dest='dynamic')
+
+
+class LazyBase(Base):
+
+    class Meta:
+        label = 'base'
+        lazy_parsers = True
+
+
+STUBBED_MODULE = """
+from cement.ext.ext_argparse import ArgparseController, expose
+
+class Stubbed(ArgparseController):
+    class Meta:
+        label = 'stubbed'
+        stacked_on = 'base'
+        stacked_type = 'nested'
+        description = 'stubbed description'
+        arguments = [
+            (['--stubbed-foo'], dict(dest='stubbed_foo')),
+        ]
+
+    @expose()
+    def stubbed_cmd(self):
+        return "Inside Stubbed.stubbed_cmd : Foo > %s" % \\
+            self.app.pargs.stubbed_foo
+"""
+
+
 class ArgparseExtTestCase(test.CementExtTestCase):
 
     def setUp(self):
@@ -532,6 +590,38 @@ class ArgparseExtTestCase(test.CementExtTestCase):
             self.ok(re.match("(.*)has an unknown stacked type(.*)", e.msg))
             raise
 
+    @test.raises(FrameworkError)
+    def test_stacked_on_unknown_controller(self):
+        self.reset_backend()
+        try:
+            self.app = self.make_app(APP,
+                                     argument_handler=ArgparseArgumentHandler,
+                                     handlers=[
+                                         Base,
+                                         StackedOnUnknown,
+                                     ],
+                                     )
+            with self.app as app:
+                app.run()
+        except FrameworkError as e:
+            self.ok(re.match("(.*)stacked_on_unknown \\(stacked on 'bogus'\\)",
+                             e.msg))
+            raise
+
+    def test_controller_resolution_order(self):
+        # parents are always resolved before the controllers stacked on
+        # them, regardless of registration order (see setUp)
+        with self.app as app:
+            app._meta.argv = ['cmd1']
+            app.run()
+            resolved = [c._meta.label for c in app.controller._controllers]
+            self.eq(resolved[0], 'base')
+            for contr in app.controller._controllers[1:]:
+                self.ok(resolved.index(contr._meta.stacked_on) <
+                        resolved.index(contr._meta.label))
+            self.eq(sorted(resolved),
+                    sorted(app.controller._controllers_map.keys()))
+
     @test.raises(ArgumentError)
     def test_duplicate_arguments(self):
         self.reset_backend()
@@ -619,3 +709,297 @@ class ArgparseExtTestCase(test.CementExtTestCase):
             self.ok(res)
             res = 'some-other-argument' in app.args.unknown_args
             self.ok(res)
+
+    def _make_lazy_app(self, argv):
+        self.reset_backend()
+        return self.make_app(APP,
+                             argument_handler=ArgparseArgumentHandler,
+                             argv=argv,
+                             handlers=[
+                                 Sixth,
+                                 LazyBase,
+                                 Second,
+                                 Third,
+                                 Fourth,
+                                 Fifth,
+                                 Seventh,
+                             ],
+                             )
+
+    def test_lazy_parsers(self):
+        argv = ['--foo=bar', '--foo2', 'bar2', 'third', '--foo4=bar4',
+                'fifth', 'cmd5']
+        with self._make_lazy_app(argv) as app:
+            res = app.run()
+            self.eq(res, "Inside Fifth.cmd5")
+            self.eq(app.pargs.foo, 'bar')
+            self.eq(app.pargs.foo2, 'bar2')
+            self.eq(app.pargs.foo4, 'bar4')
+
+            # sixth is listed (has a parser), but not built
+            self.ok('sixth' in app.controller._sub_parsers.keys())
+            sixth = app.controller._get_parser_parent('sixth')
+            self.ok('cmd6' not in sixth.choices)
+
+    def test_lazy_parsers_base_command(self):
+        with self._make_lazy_app(['cmd2', '--cmd2-foo=bar2']) as app:
+            res = app.run()
+            self.eq(res, "Inside Second.cmd2 : Foo > bar2")
+
+            # nested controllers are listed, but not built
+            self.ok('third' in app.controller._sub_parsers.keys())
+            self.ok('fifth' not in app.controller._sub_parsers.keys())
+
+    def test_lazy_parsers_default(self):
+        if not ARGPARSE_SUPPORTS_DEFAULTS:
+            raise test.SkipTest(
+                'Argparse does not support default commands in Python < 3.4'
+            )
+        with self._make_lazy_app(['third']) as app:
+            res = app.run()
+            self.eq(res, "Inside Third.default")
+            self.ok('sixth' not in app.controller._sub_parsers.keys())
+
+    def test_lazy_parsers_full_tree_fallback(self):
+        # unknown options can't be resolved, so everything is built
+        with self._make_lazy_app(['--bogus', 'cmd1']) as app:
+            try:
+                app.run()
+            except SystemExit:
+                pass
+            sixth = app.controller._get_parser_parent('sixth')
+            self.ok('cmd6' in sixth.choices)
+
+    def _make_stub_app(self, argv, base=LazyBase, **meta):
+        self.reset_backend()
+        module = 'cement_stubbed_%s' % self.rando
+        with open(os.path.join(self.tmp_dir, '%s.py' % module), 'w') as f:
+            f.write(STUBBED_MODULE)
+        sys.path.insert(0, self.tmp_dir)
+        self.addCleanup(sys.path.remove, self.tmp_dir)
+        self.addCleanup(sys.modules.pop, module, None)
+
+        meta.setdefault('stacked_type', 'nested')
+        stub = controller_stub('stubbed', '%s:Stubbed' % module,
+                               help='stubbed help', **meta)
+        app = self.make_app(APP,
+                            argument_handler=ArgparseArgumentHandler,
+                            argv=argv,
+                            handlers=[base, Second, stub],
+                            )
+        return app, module
+
+    def test_controller_stub_not_imported(self):
+        app, module = self._make_stub_app(['cmd2'])
+        with app:
+            res = app.run()
+            self.eq(res, "Inside Second.cmd2")
+            self.ok(module not in sys.modules)
+            choices = app.controller._get_parser_parent('base').choices
+            self.ok('stubbed' in choices)
+
+    def test_controller_stub_help(self):
+        app, module = self._make_stub_app(['--help'])
+        with app:
+            try:
+                app.run()
+            except SystemExit:
+                pass
+            self.ok(module not in sys.modules)
+
+    def test_controller_stub_imported(self):
+        argv = ['stubbed', '--stubbed-foo=bar', 'stubbed-cmd']
+        app, module = self._make_stub_app(argv)
+        with app:
+            res = app.run()
+            self.eq(res, "Inside Stubbed.stubbed_cmd : Foo > bar")
+            self.ok(module in sys.modules)
+
+            # the real controller replaces the stub
+            contr = app.controller._controllers_map['stubbed']
+            self.eq(contr.__class__.__name__, 'Stubbed')
+            self.eq(contr._parser.description, 'stubbed description')
+            handler = app.handler.get('controller', 'stubbed')
+            self.eq(handler, contr.__class__)
+
+    def test_controller_stub_full_tree(self):
+        argv = ['stubbed', 'stubbed-cmd']
+        app, module = self._make_stub_app(argv, base=Base)
+        with app:
+            res = app.run()
+            self.eq(res, "Inside Stubbed.stubbed_cmd : Foo > None")
+
+    @test.raises(FrameworkError)
+    def test_controller_stub_mismatch(self):
+        argv = ['stubbed', 'stubbed-cmd']
+        app, module = self._make_stub_app(argv, stacked_type='embedded')
+        try:
+            with app:
+                app.run()
+        except FrameworkError as e:
+            self.ok(e.msg.find('does not match') > -1)
+            raise
+
+    @test.raises(FrameworkError)
+    def test_controller_stub_bad_import_path(self):
+        self.reset_backend()
+        stub = controller_stub('stubbed', 'cement_bogus_module:Bogus',
+                               stacked_type='nested')
+        app = self.make_app(APP,
+                            argument_handler=ArgparseArgumentHandler,
+                            argv=['stubbed'],
+                            handlers=[LazyBase, stub],
+                            )
+        with app:
+            app.run()
+
+    def test_profile(self):
+        self.reset_backend()
+        profile_file = os.path.join(self.tmp_dir, 'test.prof')
+        app = self.make_app(APP,
+                            argument_handler=ArgparseArgumentHandler,
+                            argv=['--profile', 'cmd2', '--cmd2-foo=bar2'],
+                            handlers=[Base, Second],
+                            profile_option=True,
+                            profile_file=profile_file,
+                            )
+        with app:
+            res = app.run()
+            self.eq(res, "Inside Second.cmd2 : Foo > bar2")
+            self.eq(app._profile, 'cprofile')
+            self.ok(os.path.exists(profile_file))
+
+    def test_async_command(self):
+        if sys.version_info < (3, 5):
+            raise test.SkipTest('asyncio is not supported')  # pragma: nocover
+
+        class Async(ArgparseController):
+
+            class Meta:
+                label = 'async'
+                stacked_on = 'base'
+                stacked_type = 'embedded'
+
+            @expose()
+            def acmd(self):
+                import asyncio
+                return asyncio.sleep(0, result='Inside Async.acmd')
+
+        self.reset_backend()
+        app = self.make_app(APP,
+                            argument_handler=ArgparseArgumentHandler,
+                            argv=['acmd'],
+                            handlers=[Base, Async],
+                            )
+        with app:
+            self.eq(app.run(), 'Inside Async.acmd')
+            self.ok(app._loop is not None)
+        self.eq(app._loop, None)
+
+    def _run_help(self, argv, cache_dir, handlers=None, hooks=[]):
+        # returns the app, and the help output
+        if handlers is None:
+            handlers = [Second, Third]
+        HelpCacheBase.Meta.help_cache_dir = cache_dir
+        self.reset_backend()
+        app = self.make_app(APP,
+                            argument_handler=ArgparseArgumentHandler,
+                            argv=argv,
+                            handlers=[HelpCacheBase] + handlers,
+                            hooks=hooks,
+                            )
+        saved_stdout = sys.stdout
+        sys.stdout = out = StringIO()
+        try:
+            with app:
+                app.run()
+        except SystemExit as e:
+            self.eq(e.code, 0)
+        else:
+            raise AssertionError('SystemExit not raised')  # pragma: nocover
+        finally:
+            sys.stdout = saved_stdout
+            HelpCacheBase.Meta.help_cache_dir = None
+        return app, out.getvalue()
+
+    def test_help_cache(self):
+        cache_dir = os.path.join(self.tmp_dir, 'help')
+        app, out = self._run_help(['third', '--help'], cache_dir)
+        self.ok(out.find('usage:') > -1)
+        self.ok(out.find('cmd3') > -1)
+
+        files = os.listdir(cache_dir)
+        self.eq(len(files), 1)
+        path = os.path.join(cache_dir, files[0])
+        with open(path, 'r') as f:
+            self.eq(f.read(), out)
+
+        # cached help is printed without building any parsers
+        with open(path, 'w') as f:
+            f.write('cached help')
+        app, out = self._run_help(['third', '--help'], cache_dir)
+        self.eq(out, 'cached help')
+        self.eq(app.controller._sub_parsers, {})
+
+    def test_help_cache_invalidated(self):
+        cache_dir = os.path.join(self.tmp_dir, 'help')
+        self._run_help(['--help'], cache_dir)
+        self._run_help(['-h'], cache_dir)
+        self.eq(len(os.listdir(cache_dir)), 2)
+
+        # changing the controller tree changes the key, and the stale help
+        # of the command line is removed
+        stale = set(os.listdir(cache_dir))
+        app, out = self._run_help(['--help'], cache_dir,
+                                  handlers=[Second])
+        files = set(os.listdir(cache_dir))
+        self.eq(len(files), 2)
+        self.eq(len(files - stale), 1)
+        self.ok(out.find('third') == -1)
+
+    def test_help_cache_dynamic_parsers(self):
+        cache_dir = os.path.join(self.tmp_dir, 'help')
+
+        for i in range(2):
+            def add_argument(app):
+                app.args.add_argument('--hooked-%s' % i)
+
+            app, out = self._run_help(['--help'], cache_dir,
+                                      hooks=[('pre_argument_parsing',
+                                              add_argument)])
+            self.ok(out.find('--hooked-%s' % i) > -1)
+
+        for i in range(2):
+            app, out = self._run_help(['third', '--help'], cache_dir,
+                                      handlers=[Second, DynamicThird])
+            self.ok(out.find('--dynamic') > -1)
+
+        self.ok(not os.path.exists(cache_dir))
+
+    def test_help_cache_json_default(self):
+        class Thing(object):
+            pass
+
+        self.eq(_json_default(Thing),
+                '%s.Thing' % __name__)
+        self.eq(_json_default(Thing()), _json_default(Thing()))
+        self.ok(_json_default(Thing()).find(' at 0x') == -1)
+        self.eq(_json_default(set(['b', 'a'])), ['"a"', '"b"'])
+
+    def test_help_cache_not_written_on_error(self):
+        cache_dir = os.path.join(self.tmp_dir, 'help')
+        HelpCacheBase.Meta.help_cache_dir = cache_dir
+        self.reset_backend()
+        app = self.make_app(APP,
+                            argument_handler=ArgparseArgumentHandler,
+                            argv=['--foo', '--help'],
+                            handlers=[HelpCacheBase, Second],
+                            )
+        try:
+            with app:
+                app.run()
+        except SystemExit as e:
+            self.eq(e.code, 2)
+        finally:
+            HelpCacheBase.Meta.help_cache_dir = None
+        self.ok(not os.path.exists(cache_dir))
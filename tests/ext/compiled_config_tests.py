@@ -0,0 +1,142 @@
+"""Tests for cement.ext.ext_compiled_config."""
+
+import os
+import json
+import marshal
+from cement.core import config, exc
+from cement.utils import test
+from cement.ext import ext_compiled_config
+from cement.ext.ext_compiled_config import compile_config, \
+    read_compiled_file, write_compiled_file
+
+CONFIG = """
+[my_section]
+my_param = my_value
+my_number = 1234
+
+[my_other_section]
+foo = bar
+"""
+
+
+class CompiledConfigExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(CompiledConfigExtTestCase, self).setUp()
+        self.source = os.path.join(self.tmp_dir, 'myapp.conf')
+        with open(self.source, 'w') as f:
+            f.write(CONFIG)
+
+    def test_compile_config(self):
+        dest = compile_config(self.source)
+        self.eq(dest, os.path.join(self.tmp_dir, 'myapp.cfgc'))
+
+        data = read_compiled_file(dest)
+        self.eq(data['my_section']['my_param'], 'my_value')
+        self.eq(data['my_other_section']['foo'], 'bar')
+
+    def test_compile_config_json(self):
+        source = os.path.join(self.tmp_dir, 'myapp.json')
+        with open(source, 'w') as f:
+            json.dump(dict(my_section=dict(my_number=1234)), f)
+        dest = compile_config(source, os.path.join(self.tmp_dir, 'x.cfgc'))
+        self.eq(read_compiled_file(dest)['my_section']['my_number'], 1234)
+
+    def test_compile_config_with_handler(self):
+        from cement.ext.ext_configparser import ConfigParserConfigHandler
+        dest = compile_config(self.source,
+                              handler=ConfigParserConfigHandler)
+        data = read_compiled_file(dest)
+        self.eq(data['my_section']['my_number'], '1234')
+
+    @test.raises(exc.FrameworkError)
+    def test_compile_config_missing_source(self):
+        compile_config(os.path.join(self.tmp_dir, 'missing.conf'))
+
+    @test.raises(exc.FrameworkError)
+    def test_unknown_codec(self):
+        compile_config(self.source, codec='bogus')
+
+    def test_marshal_version_mismatch(self):
+        dest = compile_config(self.source)
+        with open(dest, 'rb') as f:
+            raw = bytearray(f.read())
+        raw[len(ext_compiled_config.MAGIC) + 2] = (marshal.version + 1) % 256
+        with open(dest, 'wb') as f:
+            f.write(bytes(raw))
+
+        try:
+            read_compiled_file(dest)
+        except exc.FrameworkError as e:
+            self.ok(e.msg.find('please recompile') > -1)
+        else:
+            raise AssertionError('FrameworkError not raised')
+
+    @test.raises(exc.FrameworkError)
+    def test_not_compiled(self):
+        read_compiled_file(self.source)
+
+    def test_msgpack_codec(self):
+        try:
+            import msgpack  # NOQA
+        except ImportError:
+            raise test.SkipTest('msgpack is not installed')
+        dest = compile_config(self.source, codec='msgpack')
+        data = read_compiled_file(dest)
+        self.eq(data['my_section']['my_param'], 'my_value')
+
+    def test_compiled_config_handler(self):
+        dest = compile_config(self.source)
+        self.app = self.make_app('myapp',
+                                 extensions=['compiled_config'],
+                                 config_handler='compiled',
+                                 config_files=[dest],
+                                 )
+        self.app.setup()
+        self.eq(self.app.config.get('my_section', 'my_param'), 'my_value')
+        self.eq(self.app.config.get('my_other_section', 'foo'), 'bar')
+
+    def test_compiled_config_handler_write_file(self):
+        self.app = self.make_app('myapp',
+                                 extensions=['compiled_config'],
+                                 config_handler='compiled',
+                                 )
+        self.app.setup()
+        self.app.config.add_section('my_section')
+        self.app.config.set('my_section', 'my_param', 'my_value')
+
+        dest = os.path.join(self.tmp_dir, 'written.cfgc')
+        self.app.config.write_file(dest)
+        data = read_compiled_file(dest)
+        self.eq(data['my_section']['my_param'], 'my_value')
+
+    def test_compiled_file_with_text_handler(self):
+        # compiled files are read by any handler once the extension is loaded
+        dest = os.path.join(self.tmp_dir, 'override.cfgc')
+        write_compiled_file(dest, dict(my_section=dict(my_param='compiled')))
+        self.app = self.make_app('myapp',
+                                 extensions=['compiled_config'],
+                                 config_files=[self.source, dest],
+                                 )
+        self.app.setup()
+        self.eq(self.app.config.get('my_section', 'my_param'), 'compiled')
+        self.eq(self.app.config.get('my_section', 'my_number'), '1234')
+
+    def test_file_reader_is_per_app(self):
+        dest = os.path.join(self.tmp_dir, 'override.cfgc')
+        self.app = self.make_app('myapp', extensions=['compiled_config'])
+        self.app.setup()
+        self.ok(self.app.config._get_file_reader(dest) is not None)
+
+        # loading the extension in one app does not affect other apps
+        app = self.make_app('myapp')
+        app.setup()
+        self.eq(app._meta.config_file_readers, None)
+        self.eq(app.config._get_file_reader(dest), None)
+
+    def test_register_file_reader_after_setup(self):
+        self.app.setup()
+        config.register_file_reader(self.app, '.json', json.load)
+        self.eq(self.app.config._get_file_reader('/path/to/x.json'),
+                json.load)
+        self.eq(self.app._meta.config_file_readers, {'.json': json.load})
@@ -60,3 +60,37 @@ class ConfigObjExtTestCase(test.CementTestCase):
 
         self.eq(self.app.config.get_section_dict('my_section'),
                 {'my_param': 'my_value'})
+
+    def test_item_assignment_invalidates_snapshots(self):
+        self.app.setup()
+        self.app.config.add_schema(dict(my_section=dict(my_param=str)))
+        self.eq(self.app.config.get_typed('my_section', 'my_param'),
+                'my_value')
+        self.eq(self.app.config.get_section_dict('my_section'),
+                dict(my_param='my_value'))
+
+        self.app.config['my_section']['my_param'] = 'new_value'
+        self.eq(self.app.config.get_section_dict('my_section'),
+                dict(my_param='new_value'))
+        self.eq(self.app.config.get_dict()['my_section'],
+                dict(my_param='new_value'))
+        self.eq(self.app.config.get_typed('my_section', 'my_param'),
+                'new_value')
+
+        self.app.config['my_section'].update(dict(other='value'))
+        self.eq(self.app.config.get_section_dict('my_section')['other'],
+                'value')
+
+        del self.app.config['my_section']['other']
+        self.ok('other' not in self.app.config.get_section_dict('my_section'))
+
+        self.app.config['new_section'] = dict(foo='bar')
+        self.eq(self.app.config.get_dict()['new_section'], dict(foo='bar'))
+        self.app.config['new_section']['foo'] = 'baz'
+        self.eq(self.app.config.get_dict()['new_section'], dict(foo='baz'))
+
+        del self.app.config['new_section']
+        self.ok('new_section' not in self.app.config.get_dict())
+
+        self.app.config['my_section'].clear()
+        self.eq(self.app.config.get_section_dict('my_section'), dict())
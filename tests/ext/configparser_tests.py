@@ -1,7 +1,13 @@
 
+import sys
 from cement.utils import test
 from cement.utils.misc import rando
 
+if sys.version_info[0] < 3:
+    from ConfigParser import NoOptionError  # pragma: no cover
+else:
+    from configparser import NoOptionError  # pragma: no cover
+
 APP = rando()[:12]
 
 CONFIG = """
@@ -55,3 +61,39 @@ class ConfigParserConfigHandlerTestCase(test.CementExtTestCase):
         self.app.args.add_argument('--my_param', action='store')
         self.app.run()
         self.eq(self.app.config.get('my_section', 'my_param'), 'not_my_value')
+
+    def test_remove_invalidates_snapshots(self):
+        self.app.setup()
+        self.app.config.add_schema(dict(my_section=dict(my_param=str)))
+        self.eq(self.app.config.get_typed('my_section', 'my_param'),
+                'my_value')
+        self.eq(self.app.config.get_section_dict('my_section'),
+                dict(my_param='my_value'))
+
+        self.ok(self.app.config.remove_option('my_section', 'my_param'))
+        self.eq(self.app.config.get_section_dict('my_section'), dict())
+        self.eq(self.app.config.get_dict()['my_section'], dict())
+
+        self.ok(self.app.config.remove_section('my_section'))
+        self.ok('my_section' not in self.app.config.get_dict())
+
+    @test.raises(NoOptionError)
+    def test_remove_invalidates_typed_values(self):
+        self.app.setup()
+        self.app.config.add_schema(dict(my_section=dict(my_param=str)))
+        self.eq(self.app.config.get_typed('my_section', 'my_param'),
+                'my_value')
+        self.app.config.remove_option('my_section', 'my_param')
+        self.app.config.get_typed('my_section', 'my_param')
+
+    def test_read_invalidates_snapshots(self):
+        self.app.setup()
+        self.eq(self.app.config.get_section_dict('my_section'),
+                dict(my_param='my_value'))
+
+        f = open(self.tmp_file, 'w')
+        f.write(CONFIG.replace('my_value', 'new_value'))
+        f.close()
+        self.app.config.read(self.tmp_file)
+        self.eq(self.app.config.get_section_dict('my_section'),
+                dict(my_param='new_value'))
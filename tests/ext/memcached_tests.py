@@ -1,7 +1,10 @@
 """Tests for cement.ext.ext_memcached."""
 
+import mock
+from contextlib import contextmanager
 from time import sleep
 from random import random
+from cement.core import exc
 from cement.utils import test
 from cement.utils.misc import init_defaults
 
@@ -72,3 +75,116 @@ class MemcachedExtTestCase(test.CementTestCase):
         self.app.cache.set(self.key, 1003, time=2)
         sleep(3)
         self.eq(self.app.cache.get(self.key), None)
+
+
+class MemcachedLockTestCase(test.CementTestCase):
+
+    """Tests that run against a mocked ``pylibmc`` client."""
+
+    def setUp(self):
+        super(MemcachedLockTestCase, self).setUp()
+        self.app = self.make_app('tests',
+                                 extensions=['memcached'],
+                                 cache_handler='memcached',
+                                 )
+        self.app.setup()
+        self.mc = mock.Mock()
+
+        @contextmanager
+        def client():
+            yield self.mc
+
+        self.app.cache._client = client
+
+    def test_memcached_release_own_lock(self):
+        self.mc.get.return_value = 'my-token'
+        self.app.cache._release_lock('lock-key', 'my-token')
+        self.mc.delete.assert_called_once_with('lock-key')
+
+    def test_memcached_release_expired_lock(self):
+        # the lock expired and was acquired by someone else
+        self.mc.get.return_value = 'other-token'
+        self.app.cache._release_lock('lock-key', 'my-token')
+        self.eq(self.mc.delete.call_count, 0)
+
+
+class MemcachedPoolTestCase(test.CementTestCase):
+
+    """Client pool tests against mocked ``pylibmc`` clients."""
+
+    def setUp(self):
+        super(MemcachedPoolTestCase, self).setUp()
+        self.clients = []
+        self.patcher = mock.patch('cement.ext.ext_memcached.pylibmc.Client',
+                                  side_effect=self.make_client)
+        self.patcher.start()
+
+    def tearDown(self):
+        super(MemcachedPoolTestCase, self).tearDown()
+        self.patcher.stop()
+
+    def make_client(self, hosts):
+        client = mock.Mock(behaviors=dict())
+        client.clone.side_effect = lambda: self.make_client(hosts)
+        self.clients.append(client)
+        return client
+
+    def make_pool_app(self, **settings):
+        defaults = init_defaults('tests', 'cache.memcached')
+        defaults['cache.memcached'].update(settings)
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=['memcached'],
+                            cache_handler='memcached',
+                            )
+        app.setup()
+        return app
+
+    def test_memcached_behaviors(self):
+        app = self.make_pool_app(tcp_keepalive=True, socket_timeout=2)
+        self.eq(app.cache.mc.behaviors, dict(tcp_keepalive=True,
+                                             connect_timeout=2000,
+                                             send_timeout=2000000,
+                                             receive_timeout=2000000))
+
+    def test_memcached_default_behaviors(self):
+        app = self.make_pool_app()
+        self.eq(app.cache.mc.behaviors, dict())
+        self.eq(app.cache.pool, None)
+
+    def test_memcached_thread_mapped_pool(self):
+        app = self.make_pool_app(pool_mode='thread_mapped')
+        master = app.cache.mc
+        app.cache.set('foo', 1003)
+        app.cache.set('bar', 1004)
+
+        # one client is cloned for this thread, and reused
+        self.eq(len(self.clients), 2)
+        client = self.clients[1]
+        self.eq(client.set.call_count, 2)
+        self.eq(master.set.call_count, 0)
+
+        app.close()
+        self.eq(len(app.cache.pool), 0)
+        client.disconnect_all.assert_called_once_with()
+        master.disconnect_all.assert_called_once_with()
+
+    def test_memcached_client_pool(self):
+        app = self.make_pool_app(pool_mode='client_pool', pool_size=2)
+        master = app.cache.mc
+        self.eq(len(self.clients), 3)
+        self.eq(app.cache.pool.qsize(), 2)
+
+        app.cache.set('foo', 1004)
+        self.eq(app.cache.pool.qsize(), 2)
+        self.eq(sum([c.set.call_count for c in self.clients[1:]]), 1)
+        self.eq(master.set.call_count, 0)
+
+        app.close()
+        self.ok(app.cache.pool.empty())
+        for client in self.clients:
+            client.disconnect_all.assert_called_once_with()
+
+    @test.raises(exc.FrameworkError)
+    def test_memcached_bad_pool_mode(self):
+        self.make_pool_app(pool_mode='bogus')
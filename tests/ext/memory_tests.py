@@ -0,0 +1,78 @@
+"""Tests for cement.ext.ext_memory."""
+
+import sys
+from time import sleep
+from cement.core import cache
+from cement.utils import test
+from cement.utils.misc import init_defaults
+
+
+class MemoryExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(MemoryExtTestCase, self).setUp()
+        self.key = "cement-tests-random-key-%s" % self.rando
+        defaults = init_defaults('tests', 'cache.memory')
+        defaults['cache.memory']['max_entries'] = 3
+        self.app = self.make_app('tests',
+                                 config_defaults=defaults,
+                                 extensions=['memory'],
+                                 cache_handler='memory',
+                                 )
+        self.app.setup()
+
+    def test_memory_interface(self):
+        cache.async_cache_validator(None, self.app.cache)
+
+    def test_memory_set(self):
+        self.app.cache.set(self.key, 1001)
+        self.eq(self.app.cache.get(self.key), 1001)
+
+    def test_memory_get(self):
+        self.eq(self.app.cache.get(self.key), None)
+        self.eq(self.app.cache.get(self.key, 1234), 1234)
+
+    def test_memory_delete(self):
+        self.app.cache.set(self.key, 1001)
+        self.app.cache.delete(self.key)
+        self.eq(self.app.cache.get(self.key), None)
+
+    def test_memory_purge(self):
+        self.app.cache.set(self.key, 1002)
+        self.app.cache.purge()
+        self.eq(self.app.cache.get(self.key), None)
+
+    def test_memory_expire(self):
+        self.app.cache.set(self.key, 1003, time=1)
+        sleep(1.1)
+        self.eq(self.app.cache.get(self.key), None)
+
+    def test_memory_max_entries(self):
+        for i in range(3):
+            self.app.cache.set('key%s' % i, i)
+
+        # touch key0 so that key1 is the least recently used
+        self.app.cache.get('key0')
+        self.app.cache.set('key3', 3)
+        self.eq(self.app.cache.get('key1'), None)
+        self.eq(self.app.cache.get('key0'), 0)
+        self.eq(self.app.cache._backend_stats()['evictions'], 1)
+
+    def test_memory_async(self):
+        if sys.version_info < (3, 4):
+            raise test.SkipTest('asyncio is not supported')  # pragma: nocover
+
+        import asyncio
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            run = loop.run_until_complete
+            run(self.app.cache.aset(self.key, 1004))
+            self.eq(run(self.app.cache.aget(self.key)), 1004)
+            run(self.app.cache.adelete(self.key))
+            self.eq(run(self.app.cache.aget(self.key, 'fallback')),
+                    'fallback')
+            run(self.app.cache.apurge())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
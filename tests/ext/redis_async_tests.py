@@ -0,0 +1,166 @@
+"""Tests for cement.ext.ext_redis_async."""
+
+import sys
+import threading
+from time import sleep
+from random import random
+from cement.core import cache
+from cement.utils import test
+from cement.utils.misc import init_defaults
+
+if sys.version_info < (3, 7):
+    raise test.SkipTest('redis.asyncio requires Python 3.7+')  # noqa
+
+import asyncio
+import mock
+
+try:
+    import fakeredis
+except ImportError:                                      # pragma: nocover
+    raise test.SkipTest('fakeredis is not installed')    # pragma: nocover
+
+
+class RedisAsyncExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(RedisAsyncExtTestCase, self).setUp()
+        self.key = "cement-tests-random-key-%s" % random()
+        self.server = fakeredis.FakeServer()
+        defaults = init_defaults('tests', 'cache.redis')
+        defaults['cache.redis']['host'] = '127.0.0.1'
+        defaults['cache.redis']['port'] = 6379
+        defaults['cache.redis']['db'] = 0
+        defaults['cache.redis']['max_connections'] = 4
+        self.app = self.make_app('tests',
+                                 config_defaults=defaults,
+                                 extensions=['redis_async'],
+                                 cache_handler='redis_async',
+                                 )
+        self.app.setup()
+
+        # stand-in for a local redis server shared by both clients
+        self.app.cache.r = fakeredis.FakeStrictRedis(server=self.server)
+        self.patcher = mock.patch(
+            'cement.ext.ext_redis_async.aioredis.Redis',
+            lambda **kw: fakeredis.FakeAsyncRedis(server=self.server),
+        )
+        self.patcher.start()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        super(RedisAsyncExtTestCase, self).tearDown()
+        self.patcher.stop()
+        self.loop.close()
+
+    def run_async(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_redis_async_interface(self):
+        cache.async_cache_validator(None, self.app.cache)
+
+    def test_redis_async_set_get(self):
+        self.run_async(self.app.cache.aset(self.key, 1001))
+        self.eq(int(self.run_async(self.app.cache.aget(self.key))), 1001)
+
+        # shares the same server as the synchronous client
+        self.eq(int(self.app.cache.get(self.key)), 1001)
+
+    def test_redis_async_get_fallback(self):
+        self.eq(self.run_async(self.app.cache.aget(self.key)), None)
+        self.eq(self.run_async(self.app.cache.aget(self.key, 1234)), 1234)
+
+    def test_redis_async_delete(self):
+        self.app.cache.set(self.key, 1002)
+        self.run_async(self.app.cache.adelete(self.key))
+        self.eq(self.app.cache.get(self.key), None)
+
+    def test_redis_async_purge(self):
+        self.run_async(self.app.cache.aset(self.key, 1003))
+        self.run_async(self.app.cache.apurge())
+        self.eq(self.run_async(self.app.cache.aget(self.key)), None)
+
+    def test_redis_async_expire(self):
+        self.run_async(self.app.cache.aset(self.key, 1004, time=10))
+        self.ok(0 < self.app.cache.r.ttl(self.key) <= 10)
+
+    def test_redis_async_codec(self):
+        self.app.cache._codec = cache.CODECS['json']
+        self.run_async(self.app.cache.aset(self.key, dict(foo='bar')))
+        self.eq(self.run_async(self.app.cache.aget(self.key)),
+                dict(foo='bar'))
+        self.eq(self.app.cache.get(self.key), dict(foo='bar'))
+
+    def test_redis_async_pool(self):
+        self.run_async(self.app.cache.aget(self.key))
+        self.eq(self.app.cache.async_pool.max_connections, 4)
+        self.run_async(self.app.cache.aclose())
+        self.eq(self.app.cache.ar, None)
+
+    def test_redis_async_close(self):
+        self.run_async(self.app.cache.aget(self.key))
+        self.app.close()
+        self.eq(self.app.cache.ar, None)
+
+    def _track_disconnect(self, pool):
+        # record the event loop that the pool is disconnected on
+        loops = []
+
+        async def disconnect():
+            loops.append(asyncio.get_event_loop())
+
+        pool.disconnect = disconnect
+        return loops
+
+    def test_redis_async_pool_released_on_new_loop(self):
+        self.run_async(self.app.cache.aget(self.key))
+        pool = self.app.cache.async_pool
+        loops = self._track_disconnect(pool)
+
+        # the pool is disconnected on the (stopped) loop that created it
+        first_loop = self.loop
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.run_async(self.app.cache.aget(self.key))
+        finally:
+            first_loop.close()
+        self.ok(self.app.cache.async_pool is not pool)
+        self.eq(loops, [first_loop])
+
+    def test_redis_async_pool_loop_closed(self):
+        self.run_async(self.app.cache.aget(self.key))
+        pool = self.app.cache.async_pool
+        loops = self._track_disconnect(pool)
+
+        # nothing to disconnect with once the loop is closed
+        self.loop.close()
+        self.loop = asyncio.new_event_loop()
+        self.run_async(self.app.cache.aget(self.key))
+        self.ok(self.app.cache.async_pool is not pool)
+        self.eq(loops, [])
+
+    def test_redis_async_pool_loop_running(self):
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever)
+        thread.start()
+        try:
+            future = asyncio.run_coroutine_threadsafe(
+                self.app.cache.aget(self.key), loop)
+            future.result(5)
+            loops = self._track_disconnect(self.app.cache.async_pool)
+            self.app.cache.close()
+            for i in range(50):
+                if loops:
+                    break
+                sleep(0.1)
+            self.eq(loops, [loop])
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    def test_redis_async_close_releases_pool(self):
+        self.run_async(self.app.cache.aget(self.key))
+        loops = self._track_disconnect(self.app.cache.async_pool)
+        self.app.cache.close()
+        self.eq(loops, [self.loop])
+        self.eq(self.app.cache.async_pool, None)
@@ -1,10 +1,18 @@
 """Tests for cement.ext.ext_redis."""
 
+import mock
+import redis
 from time import sleep
 from random import random
+from cement.core import cache
 from cement.utils import test
 from cement.utils.misc import init_defaults
 
+try:
+    import fakeredis
+except ImportError:                                      # pragma: nocover
+    fakeredis = None                                     # pragma: nocover
+
 
 class RedisExtTestCase(test.CementTestCase):
 
@@ -50,3 +58,164 @@ class RedisExtTestCase(test.CementTestCase):
         self.app.cache.set(self.key, 1003, time=2)
         sleep(3)
         self.eq(self.app.cache.get(self.key), None)
+
+
+class RedisPoolExtTestCase(test.CementExtTestCase):
+
+    """Connection pool tests against a fake redis server."""
+
+    def setUp(self):
+        super(RedisPoolExtTestCase, self).setUp()
+        if fakeredis is None:
+            raise test.SkipTest('fakeredis is not installed')
+
+        # pool connections talk to an in-memory server rather than a local
+        # redis server
+        server = fakeredis.FakeServer()
+        connection_pool = redis.ConnectionPool
+        connection_class = getattr(fakeredis, 'FakeRedisConnection',
+                                   fakeredis.FakeConnection)
+
+        def fake_pool(**kw):
+            return connection_pool(connection_class=connection_class,
+                                   server=server, **kw)
+
+        self.patcher = mock.patch.object(redis, 'ConnectionPool', fake_pool)
+        self.patcher.start()
+
+    def tearDown(self):
+        super(RedisPoolExtTestCase, self).tearDown()
+        self.patcher.stop()
+
+    def make_pool_app(self, **settings):
+        defaults = init_defaults('tests', 'cache.redis')
+        defaults['cache.redis'].update(settings)
+        app = self.make_app('tests',
+                            config_defaults=defaults,
+                            extensions=['redis'],
+                            cache_handler='redis',
+                            )
+        app.setup()
+        return app
+
+    def test_redis_connection_pool(self):
+        app = self.make_pool_app(max_connections='5',
+                                 socket_timeout='2.5',
+                                 socket_connect_timeout='1',
+                                 socket_keepalive='true')
+        pool = app.cache.r.connection_pool
+        self.ok(pool is app.cache.pool)
+        self.eq(pool.max_connections, 5)
+        self.eq(pool.connection_kwargs['socket_timeout'], 2.5)
+        self.eq(pool.connection_kwargs['socket_connect_timeout'], 1.0)
+        self.eq(pool.connection_kwargs['socket_keepalive'], True)
+
+        app.cache.set('foo', 1004)
+        self.eq(int(app.cache.get('foo')), 1004)
+        app.close()
+
+    def test_redis_connection_pool_defaults(self):
+        app = self.make_pool_app()
+        pool = app.cache.pool
+        self.eq(pool.connection_kwargs['host'], '127.0.0.1')
+        self.eq(pool.connection_kwargs['socket_timeout'], None)
+        self.eq(pool.connection_kwargs['socket_keepalive'], False)
+        app.close()
+
+    def test_redis_connection_pool_max_connections(self):
+        app = self.make_pool_app(max_connections='1')
+        pool = app.cache.pool
+        conn = pool.get_connection('GET')
+        try:
+            # the only connection is in use
+            with self.assertRaises(redis.ConnectionError):
+                pool.get_connection('GET')
+        finally:
+            pool.release(conn)
+        app.cache.set('foo', 1)
+        self.eq(int(app.cache.get('foo')), 1)
+        app.close()
+
+    def test_redis_close_disconnects_pool(self):
+        app = self.make_pool_app()
+        app.cache.set('foo', 1)
+        with mock.patch.object(app.cache.pool, 'disconnect') as disconnect:
+            app.close()
+        disconnect.assert_called_once_with()
+
+
+class RedisMemoizeExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(RedisMemoizeExtTestCase, self).setUp()
+        if fakeredis is None:
+            raise test.SkipTest('fakeredis is not installed')
+
+        self.app = self.make_app('tests',
+                                 extensions=['redis'],
+                                 cache_handler='redis',
+                                 )
+        self.app.setup()
+
+        # stand-in for a local redis server (the release script is not
+        # supported without lua)
+        self.app.cache.r = fakeredis.FakeStrictRedis()
+        self.patcher = mock.patch.object(
+            self.app.cache, '_release_lock',
+            lambda key, token: self.app.cache.r.delete(key),
+        )
+        self.patcher.start()
+        self.calls = []
+
+    def tearDown(self):
+        super(RedisMemoizeExtTestCase, self).tearDown()
+        self.patcher.stop()
+
+    def memoized(self, value):
+        @self.app.cache.memoize(ttl=60)
+        def func(x):
+            self.calls.append(x)
+            return value
+        return func
+
+    def test_memoize_int(self):
+        func = self.memoized(42)
+        self.eq(func(21), 42)
+        self.eq(func(21), 42)
+        self.ok(isinstance(func(21), int))
+        self.eq(self.calls, [21])
+
+    def test_memoize_dict(self):
+        func = self.memoized(dict(foo=['bar', 1]))
+        self.eq(func(1), dict(foo=['bar', 1]))
+        self.eq(func(1), dict(foo=['bar', 1]))
+        self.eq(self.calls, [1])
+
+    def test_memoize_none(self):
+        func = self.memoized(None)
+        self.eq(func(1), None)
+        self.eq(func(1), None)
+        self.eq(self.calls, [1, 1])
+        self.eq(self.app.cache.r.keys('*'), [])
+
+    def test_memoize_stale_ttl(self):
+        @self.app.cache.memoize(ttl=60, stale_ttl=60)
+        def func(x):
+            self.calls.append(x)
+            return [x]
+
+        self.eq(func(1), [1])
+        self.eq(func(1), [1])
+        self.eq(self.calls, [1])
+
+    def test_memoize_with_codec(self):
+        self.app.cache._codec = cache.CODECS['json']
+        func = self.memoized(dict(foo='bar'))
+        self.eq(func(1), dict(foo='bar'))
+        self.eq(func(1), dict(foo='bar'))
+        self.eq(self.calls, [1])
+
+    def test_plain_values(self):
+        # values set without memoize are still returned as text
+        self.app.cache.set('foo', 'bar')
+        self.eq(self.app.cache.get('foo'), 'bar')
@@ -31,10 +31,17 @@ enable_plugin = false
 """
 
 
-def bogus_hook_func(app):
+def bogus_hook_func(app, *args):
     pass
 
 
+class FakeEvent(object):
+
+    def __init__(self, pathname):
+        self.pathname = pathname
+        self.maskname = 'IN_CLOSE_WRITE'
+
+
 class ReloadConfigExtTestCase(test.CementExtTestCase):
 
     def setUp(self):
@@ -48,9 +55,13 @@ class ReloadConfigExtTestCase(test.CementExtTestCase):
         f.write(PLUGIN_CONFIG1)
         f.close()
 
+        self.conf_d = os.path.join(self.tmp_dir, 'conf.d')
+        os.makedirs(self.conf_d)
+
         self.app = self.make_app(APP,
                                  extensions=['reload_config'],
                                  config_files=[self.tmp_file],
+                                 config_dirs=[self.conf_d],
                                  plugin_config_dirs=[self.tmp_dir],
                                  )
 
@@ -90,3 +101,67 @@ class ReloadConfigExtTestCase(test.CementExtTestCase):
             ext_reload_config.signal_handler(self.app, signal.SIGINT, None)
         finally:
             self.app.close()
+
+    def test_config_diff(self):
+        before = dict(a=dict(foo=1, bar=2), b=dict(baz=3))
+        after = dict(a=dict(foo=1, bar=4), b=dict(baz=3), c=dict(qux=5))
+        self.eq(ext_reload_config.config_diff(before, after),
+                dict(a=dict(bar=(2, 4)), c=dict(qux=(None, 5))))
+
+    def test_debounce(self):
+        self.app.setup()
+        diffs = []
+
+        def post_reload(app):
+            diffs.append(app.config_diff)
+
+        self.app.hook.register('post_reload_config', post_reload)
+        conf_file = os.path.join(self.conf_d, 'extra.conf')
+        f = open(conf_file, 'w')
+        f.write("[%s]\nbaz = qux\n" % APP)
+        f.close()
+        f = open(self.tmp_file, 'w')
+        f.write(CONFIG2)
+        f.close()
+
+        eh = ext_reload_config.ConfigEventHandler(
+            self.app, [self.tmp_file], watched_config_dirs=[self.conf_d],
+            debounce=0.2)
+
+        # a burst of events results in a single reload
+        for i in range(5):
+            eh.process_default(FakeEvent(self.tmp_file))
+        eh.process_default(FakeEvent(conf_file))
+
+        # not watched
+        eh.process_default(FakeEvent(os.path.join(self.conf_d, 'bogus')))
+
+        sleep(0.5)
+        self.eq(len(diffs), 1)
+        self.eq(diffs[0][APP], dict(foo=('bar1', 'bar2'),
+                                    baz=(None, 'qux')))
+        self.eq(self.app.config.get(APP, 'foo'), 'bar2')
+
+    def test_no_debounce(self):
+        self.app.setup()
+        eh = ext_reload_config.ConfigEventHandler(self.app, [self.tmp_file])
+        f = open(self.tmp_file, 'w')
+        f.write(CONFIG2)
+        f.close()
+        eh.process_default(FakeEvent(self.tmp_file))
+        self.eq(self.app.config.get(APP, 'foo'), 'bar2')
+
+    def test_config_dir_precedence(self):
+        self.app.setup()
+        eh = ext_reload_config.ConfigEventHandler(
+            self.app, [self.tmp_file], watched_config_dirs=[self.conf_d])
+
+        # the config file still takes precedence over conf.d
+        conf_file = os.path.join(self.conf_d, 'extra.conf')
+        f = open(conf_file, 'w')
+        f.write("[%s]\nfoo = from_dir\nbaz = qux\n" % APP)
+        f.close()
+        eh.process_default(FakeEvent(conf_file))
+        self.eq(self.app.config.get(APP, 'foo'), 'bar1')
+        self.eq(self.app.config.get(APP, 'baz'), 'qux')
+        self.eq(self.app.config_diff[APP], dict(baz=(None, 'qux')))
@@ -0,0 +1,147 @@
+"""Tests for cement.ext.ext_shell."""
+
+import os
+import signal
+import mock
+from cement.core.exc import CaughtSignal
+from cement.ext.ext_argparse import ArgparseController, expose
+from cement.ext.ext_shell import ShellController
+from cement.utils import test
+from cement.utils.misc import init_defaults, rando
+
+APP = rando()[:12]
+
+
+class Base(ArgparseController):
+
+    class Meta:
+        label = 'base'
+
+    @expose(arguments=[(['--name'], dict(default='world'))])
+    def hello(self):
+        self.app.calls.append(('hello', self.app.pargs.name))
+
+    @expose()
+    def fail(self):
+        raise Exception('command failed')
+
+    @expose(hide=True)
+    def hidden(self):
+        pass
+
+
+class Nested(ArgparseController):
+
+    class Meta:
+        label = 'nested'
+        stacked_on = 'base'
+        stacked_type = 'nested'
+        arguments = [
+            (['--color'], dict(action='store')),
+        ]
+
+    @expose()
+    def cmd2(self):
+        self.app.calls.append(('cmd2', self.app.pargs.color))
+
+
+class ShellExtTestCase(test.CementExtTestCase):
+
+    def setUp(self):
+        super(ShellExtTestCase, self).setUp()
+        self.defaults = init_defaults(APP, 'shell')
+        self.defaults['shell']['history_file'] = os.path.join(self.tmp_dir,
+                                                              'history')
+
+    def _run_shell(self, lines, handlers=[Base, Nested]):
+        self.app = self.make_app(APP,
+                                 argv=['shell'],
+                                 config_defaults=self.defaults,
+                                 extensions=['shell'],
+                                 handlers=handlers,
+                                 )
+        self.app.setup()
+        self.app.calls = []
+        with mock.patch.object(ShellController, '_read_line',
+                               side_effect=lines):
+            self.app.run()
+        return self.app.calls
+
+    def test_shell(self):
+        calls = self._run_shell([
+            'hello',
+            '',
+            'hello --name=john',
+            'nested --color=blue cmd2',
+            'exit',
+        ])
+        self.eq(calls, [('hello', 'world'),
+                        ('hello', 'john'),
+                        ('cmd2', 'blue')])
+        self.eq(self.app.argv, ['shell'])
+        self.ok(os.path.exists(os.path.join(self.tmp_dir, 'history')))
+
+    def test_shell_errors(self):
+        calls = self._run_shell([
+            'bogus',
+            'fail',
+            '"unbalanced',
+            'shell',
+            KeyboardInterrupt(),
+            'hello',
+            EOFError(),
+        ])
+        self.eq(calls, [('hello', 'world')])
+
+    def test_shell_parsers_built_once(self):
+        class CountingBase(Base):
+
+            class Meta:
+                label = 'base'
+
+            def _setup_parsers(self, *args, **kw):
+                self.app.calls.append('setup_parsers')
+                super(CountingBase, self)._setup_parsers(*args, **kw)
+
+        calls = self._run_shell(['hello', 'nested cmd2', 'exit'],
+                                handlers=[CountingBase, Nested])
+        self.eq(calls, ['setup_parsers',
+                        ('hello', 'world'),
+                        ('cmd2', None)])
+
+    def test_shell_lazy_parsers(self):
+        class LazyBase(Base):
+
+            class Meta:
+                label = 'base'
+                lazy_parsers = True
+
+        calls = self._run_shell(['nested cmd2', 'exit'],
+                                handlers=[LazyBase, Nested])
+        self.eq(calls, [('cmd2', None)])
+
+    def test_shell_sigint(self):
+        calls = self._run_shell([
+            CaughtSignal(signal.SIGINT, None),
+            'hello',
+            'quit',
+        ])
+        self.eq(calls, [('hello', 'world')])
+
+    @test.raises(CaughtSignal)
+    def test_shell_sigterm(self):
+        self._run_shell([CaughtSignal(signal.SIGTERM, None)])
+
+    def test_completions(self):
+        self._run_shell(['exit'])
+        shell = self.app.controller._controllers_map['shell']
+
+        self.eq(shell._get_completions('', 'he'), ['hello'])
+        self.eq(shell._get_completions('', 'hi'), ['hidden'])
+        self.eq(shell._get_completions('', 'x'), [])
+        self.eq(shell._get_completions('', 'ex'), ['exit'])
+        self.eq(shell._get_completions('hello ', '--'),
+                ['--help', '--name'])
+        self.eq(shell._get_completions('nested --color blue ', 'c'),
+                ['cmd2'])
+        self.eq(shell._get_completions('nested ', '--c'), ['--color'])
@@ -1,7 +1,10 @@
 """Tests for cement.ext.ext_yaml."""
 
 import yaml
+import mock
 from cement.utils import test
+from cement.utils.misc import init_defaults
+from cement.ext import ext_yaml
 from cement.utils.misc import rando
 
 APP = rando()[:12]
@@ -79,3 +82,82 @@ class YamlExtTestCase(test.CementTestCase):
         app.setup()
         app.run()
         app.render(dict(foo='bar'))
+
+    def test_default_loader_and_dumper(self):
+        self.app.setup()
+        if yaml.__with_libyaml__:
+            self.eq(self.app.config._loader, yaml.CSafeLoader)
+            self.eq(self.app.output._dumper, yaml.CSafeDumper)
+        else:
+            self.eq(self.app.config._loader, yaml.SafeLoader)
+            self.eq(self.app.output._dumper, yaml.SafeDumper)
+
+    def test_loader_and_dumper_by_name(self):
+        meta = init_defaults('config.yaml', 'output.yaml')
+        meta['config.yaml']['loader'] = 'FullLoader'
+        meta['output.yaml']['dumper'] = yaml.Dumper
+        self.app = self.make_app('tests',
+                                 extensions=['yaml'],
+                                 config_handler='yaml',
+                                 output_handler='yaml',
+                                 config_files=[self.tmp_file],
+                                 meta_defaults=meta,
+                                 argv=['-o', 'yaml'])
+        self.app.setup()
+        self.eq(self.app.config._loader, yaml.FullLoader)
+        self.eq(self.app.output._dumper, yaml.Dumper)
+        self.eq(self.app.config.get('section', 'key1'), 'ok1')
+
+    def test_get_yaml_class(self):
+        self.eq(ext_yaml.get_yaml_class(None, yaml.SafeLoader),
+                yaml.SafeLoader)
+        self.eq(ext_yaml.get_yaml_class('SafeDumper', None), yaml.SafeDumper)
+        self.eq(ext_yaml.get_yaml_class(u'SafeDumper', None),
+                yaml.SafeDumper)
+        self.eq(ext_yaml.get_yaml_class(yaml.Loader, None), yaml.Loader)
+
+        # C implementations fall back without libyaml
+        with mock.patch.dict(yaml.__dict__):
+            yaml.__dict__.pop('CSafeLoader', None)
+            self.eq(ext_yaml.get_yaml_class('CSafeLoader', None),
+                    yaml.SafeLoader)
+
+    def test_multi_document(self):
+        self.app.setup()
+        self.app.run()
+        docs = (dict(num=i) for i in range(3))
+        res = self.app.render(docs, multi_document=True)
+        self.eq(list(yaml.safe_load_all(res)),
+                [dict(num=0), dict(num=1), dict(num=2)])
+
+    def test_multi_document_stream(self):
+        self.app.setup()
+        self.app.run()
+        f = open(self.tmp_file, 'w')
+        docs = (dict(num=i) for i in range(3))
+        res = self.app.output.render(docs, multi_document=True, stream=f)
+        f.close()
+        self.eq(res, None)
+        f = open(self.tmp_file, 'r')
+        self.eq(len(list(yaml.safe_load_all(f))), 3)
+        f.close()
+
+    def test_libyaml_matches_pure_python(self):
+        if not yaml.__with_libyaml__:
+            raise test.SkipTest('PyYaml is not built with libyaml')
+
+        data = dict()
+        for i in range(200):
+            data['section%d' % i] = dict(
+                ('key%d' % j, ['value%d' % j, j, True]) for j in range(20))
+        text = yaml.dump(data, Dumper=yaml.CSafeDumper)
+
+        def load_dump(loader, dumper):
+            loaded = yaml.load(text, Loader=loader)
+            return (loaded, yaml.dump(loaded, Dumper=dumper))
+
+        c_loaded, c_dumped = load_dump(yaml.CSafeLoader, yaml.CSafeDumper)
+        py_loaded, py_dumped = load_dump(yaml.SafeLoader, yaml.SafeDumper)
+        self.eq(c_loaded, data)
+        self.eq(c_loaded, py_loaded)
+        self.eq(c_dumped, py_dumped)
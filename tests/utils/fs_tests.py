@@ -32,3 +32,16 @@ class FsUtilsTestCase(test.CementCoreTestCase):
 
         res = fs.backup('someboguspath')
         self.eq(res, None)
+
+    def test_list_files(self):
+        for name in ['b.conf', 'a.conf', '.hidden.conf', 'c.txt']:
+            open(os.path.join(self.tmp_dir, name), 'w').close()
+        os.makedirs(os.path.join(self.tmp_dir, 'd.conf'))
+
+        files = fs.list_files(self.tmp_dir, '.conf')
+        self.eq([os.path.basename(f) for f in files],
+                ['.hidden.conf', 'a.conf', 'b.conf'])
+        files = fs.list_files(self.tmp_dir, '.conf', hidden=False)
+        self.eq([os.path.basename(f) for f in files], ['a.conf', 'b.conf'])
+        self.eq(len(fs.list_files(self.tmp_dir)), 4)
+        self.eq(fs.list_files(os.path.join(self.tmp_dir, 'bogus')), [])
@@ -1,6 +1,7 @@
 """Tests for cement.utils.misc."""
 
 import sys
+import time
 from cement.utils import test, misc
 
 APP = misc.rando()[:12]
@@ -84,3 +85,22 @@ class BackendTestCase(test.CementCoreTestCase):
             self.eq(e.args[0],
                     "Argument `text` must be one of [str, unicode].")
             raise
+
+    def test_parallel_map(self):
+        def slow_square(i):
+            # later items finish first
+            time.sleep((10 - i) * 0.001)
+            return i * i
+
+        self.eq(misc.parallel_map(slow_square, range(10)),
+                [i * i for i in range(10)])
+        self.eq(misc.parallel_map(slow_square, [3]), [9])
+        self.eq(misc.parallel_map(slow_square, []), [])
+
+    @test.raises(ValueError)
+    def test_parallel_map_raises(self):
+        def func(i):
+            if i == 3:
+                raise ValueError('bad item')
+            return i
+        misc.parallel_map(func, range(5), max_workers=2)
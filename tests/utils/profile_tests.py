@@ -0,0 +1,52 @@
+"""Tests for cement.utils.profile"""
+
+import os
+import pstats
+from cement.utils import profile, test
+
+
+def busy(count):
+    total = 0
+    for i in range(count):
+        total += sum(range(100))
+    return total
+
+
+class ProfileUtilsTestCase(test.CementCoreTestCase):
+
+    def test_cprofile(self):
+        profiler = profile.CProfileProfiler()
+        profiler.start()
+        busy(100)
+        profiler.stop()
+
+        file_path = os.path.join(self.tmp_dir, 'test.prof')
+        profiler.write(file_path)
+        stats = pstats.Stats(file_path)
+        self.ok(len(stats.stats) > 0)
+
+        rows = profiler.summary(3)
+        self.eq(len(rows), 3)
+        self.ok(rows[0]['cumulative_time'] >= rows[1]['cumulative_time'])
+        funcs = [row['function'] for row in profiler.summary(100)]
+        self.ok(len([f for f in funcs if f.endswith('(busy)')]) == 1)
+
+    def test_sampling(self):
+        profiler = profile.SamplingProfiler(interval=0.0005)
+        profiler.start()
+        busy(20000)
+        profiler.stop()
+
+        file_path = os.path.join(self.tmp_dir, 'test.prof')
+        profiler.write(file_path)
+        with open(file_path, 'r') as f:
+            lines = f.read().splitlines()
+        self.ok(len(lines) > 0)
+        self.ok(lines[0].rsplit(' ', 1)[1].isdigit())
+
+        rows = profiler.summary(5)
+        self.ok(len(rows) > 0)
+        self.ok(rows[0]['cumulative_time'] >= rows[-1]['cumulative_time'])
+        self.eq(rows[0]['calls'], None)
+        funcs = [row['function'] for row in profiler.summary(100)]
+        self.ok(len([f for f in funcs if f.endswith('(busy)')]) == 1)